@@ -46,3 +46,21 @@ function! coq#complete_help(arg_lead, cmd_line, cursor_pos) abort
   return s:filter_completions(a:arg_lead, insert(l:topics, '--web'))
 endfunction
 
+function! coq#complete_trace(arg_lead, cmd_line, cursor_pos) abort
+  let l:args = [
+        \ 'start',
+        \ 'stop',
+        \ ]
+
+  return s:filter_completions(a:arg_lead, l:args)
+endfunction
+
+function! coq#complete_profile(arg_lead, cmd_line, cursor_pos) abort
+  let l:args = [
+        \ 'start',
+        \ 'stop',
+        \ '--rate',
+        \ ]
+
+  return s:filter_completions(a:arg_lead, l:args)
+endfunction
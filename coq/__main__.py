@@ -176,7 +176,7 @@ elif command == "run":
         print(e, msg, sep=linesep, end="", file=stderr)
         exit(1)
     else:
-        with ThreadPoolExecutor() as th:
+        with ThreadPoolExecutor(thread_name_prefix="coq-pool") as th:
             arun(init(args.socket, ppid=args.ppid, th=th))
 
 else:
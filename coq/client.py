@@ -25,6 +25,7 @@ from .registry import atomic, autocmd, rpc
 from .server.registrants.options import set_options
 from .server.rt_types import Stack, ValidationError
 from .server.runtime import stack
+from .shared.garbage import settle
 
 assert ____ or True
 
@@ -94,5 +95,10 @@ async def init(socket: ServerAddr, ppid: int, th: ThreadPoolExecutor) -> None:
                         mapping=stk.settings.keymap,
                         fast_close=stk.settings.display.pum.fast_close,
                     )
+                    settle(
+                        stk.settings.limits.gc_thresholds,
+                        on_idle=stk.settings.limits.gc_on_idle,
+                        freeze=stk.settings.limits.gc_freeze,
+                    )
 
         await gather(wrap_future(die), cont())
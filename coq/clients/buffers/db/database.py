@@ -5,7 +5,6 @@ from random import shuffle
 from sqlite3 import Connection, OperationalError
 from sqlite3.dbapi2 import Cursor
 from typing import AbstractSet, Iterator, Mapping, Optional, Sequence, Tuple
-from uuid import uuid4
 
 from pynvim_pp.lib import recode
 
@@ -13,7 +12,8 @@ from ....consts import BUFFER_DB, DEBUG
 from ....databases.types import DB
 from ....shared.parse import coalesce
 from ....shared.settings import MatchOptions
-from ....shared.sql import BIGGEST_INT, init_db, like_esc
+from ....shared.sql import BIGGEST_INT, connect, init_db, like_esc
+from ....shared.uids import new_uid
 from .sql import sql
 
 
@@ -62,7 +62,7 @@ def _setlines(
 ) -> None:
     def m0() -> Iterator[Tuple[int, str, bytes]]:
         for line_num, line in enumerate(lines, start=lo):
-            line_id = uuid4().bytes
+            line_id = new_uid().bytes
             yield line_num, recode(line), line_id
 
     line_info = [*m0()]
@@ -112,12 +112,12 @@ def _setlines(
     if not count:
         cursor.execute(
             sql("insert", "line"),
-            {"rowid": uuid4().bytes, "line": "", "buffer_id": buf_id, "line_num": 0},
+            {"rowid": new_uid().bytes, "line": "", "buffer_id": buf_id, "line_num": 0},
         )
 
 
 def _init() -> Connection:
-    conn = Connection(BUFFER_DB, isolation_level=None)
+    conn = connect(BUFFER_DB)
     init_db(conn)
     conn.executescript(sql("create", "pragma"))
     conn.executescript(sql("create", "tables"))
@@ -98,6 +98,9 @@ class Worker(BaseWorker[BuffersClient, None]):
         with self._interrupt():
             self._db.interrupt()
 
+    def usage(self) -> Mapping[str, int]:
+        return {"SQLite": self._db.usage()}
+
     async def _poll(self) -> None:
         while True:
 
@@ -1,15 +1,28 @@
 from contextlib import closing, suppress
+from itertools import count
 from sqlite3 import Connection, OperationalError
-from typing import Iterable, Iterator, Mapping, Tuple
+from typing import (
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    MutableSet,
+    Sequence,
+    Tuple,
+)
 
 from ....databases.types import DB
 from ....shared.settings import MatchOptions
-from ....shared.sql import BIGGEST_INT, init_db, like_esc
+from ....shared.sql import BIGGEST_INT, connect, init_db, like_esc
 from .sql import sql
 
+# (buf_id, row)
+Slot = Tuple[int, int]
+
 
 def _init() -> Connection:
-    conn = Connection(":memory:", isolation_level=None)
+    conn = connect(":memory:")
     init_db(conn)
     conn.executescript(sql("create", "pragma"))
     conn.executescript(sql("create", "tables"))
@@ -17,41 +30,94 @@ def _init() -> Connection:
 
 
 class Database(DB):
+    """
+    Each slot's words are tagged with its generation
+
+    Dropping a slot only retires its generation, the rows go in `prune()`
+    """
+
     def __init__(self) -> None:
         self._conn = _init()
+        self._gens: MutableMapping[Slot, int] = {}
+        self._stale: MutableSet[int] = set()
+        self._next_gen = count()
+
+    def insert(self, slot: Slot, keys: Iterable[Tuple[bytes, str]]) -> None:
+        if (gen := self._gens.get(slot)) is None:
+            gen = self._gens[slot] = next(self._next_gen)
 
-    def insert(self, keys: Iterable[Tuple[bytes, str]]) -> None:
         def m1() -> Iterator[Mapping]:
             for key, word in keys:
-                yield {"key": key, "word": word}
+                yield {"gen": gen, "key": key, "word": word}
 
         with suppress(OperationalError):
             with self._conn, closing(self._conn.cursor()) as cursor:
                 with suppress(UnicodeEncodeError):
                     cursor.executemany(sql("insert", "word"), m1())
 
-    def select(
-        self, clear: bool, opts: MatchOptions, word: str, sym: str, limitless: int
-    ) -> Iterator[Tuple[bytes, str]]:
+    def drop(self, slot: Slot) -> None:
+        if (gen := self._gens.pop(slot, None)) is not None:
+            self._stale.add(gen)
+
+    def prune(self, limit: int) -> int:
+        """
+        Up to `limit` rows of retired generations -> rows deleted
+        """
+
+        deleted = 0
+        done: MutableSequence[int] = []
         with suppress(OperationalError):
-            if clear:
-                with self._conn, closing(self._conn.cursor()) as cursor:
-                    cursor.execute(sql("delete", "words"))
-            else:
-                with self._conn, closing(self._conn.cursor()) as cursor:
-                    limit = BIGGEST_INT if limitless else opts.max_results
+            with self._conn, closing(self._conn.cursor()) as cursor:
+                for gen in tuple(self._stale):
+                    if deleted >= limit:
+                        break
                     cursor.execute(
-                        sql("select", "words"),
-                        {
-                            "exact": opts.exact_matches,
-                            "cut_off": opts.fuzzy_cutoff,
-                            "look_ahead": opts.look_ahead,
-                            "limit": limit,
-                            "word": word,
-                            "sym": sym,
-                            "like_word": like_esc(word[: opts.exact_matches]),
-                            "like_sym": like_esc(sym[: opts.exact_matches]),
-                        },
+                        sql("delete", "generation"),
+                        {"gen": gen, "limit": limit - deleted},
                     )
-                    for row in cursor:
-                        yield row["key"], row["word"]
+                    deleted += cursor.rowcount
+                    if deleted < limit:
+                        done.append(gen)
+            self._stale.difference_update(done)
+        return deleted
+
+    def discard(self, keys: Sequence[bytes]) -> None:
+        if not keys:
+            return
+        with suppress(OperationalError):
+            with self._conn, closing(self._conn.cursor()) as cursor:
+                cursor.executemany(
+                    sql("delete", "key"), ({"key": key} for key in keys)
+                )
+
+    def clear(self) -> None:
+        with suppress(OperationalError):
+            with self._conn, closing(self._conn.cursor()) as cursor:
+                cursor.execute(sql("delete", "words"))
+            self._gens.clear()
+            self._stale.clear()
+
+    def select(
+        self, slot: Slot, opts: MatchOptions, word: str, sym: str, limitless: int
+    ) -> Iterator[Tuple[bytes, str]]:
+        if (gen := self._gens.get(slot)) is None:
+            return
+        with suppress(OperationalError):
+            with self._conn, closing(self._conn.cursor()) as cursor:
+                limit = BIGGEST_INT if limitless else opts.max_results
+                cursor.execute(
+                    sql("select", "words"),
+                    {
+                        "gen": gen,
+                        "exact": opts.exact_matches,
+                        "cut_off": opts.fuzzy_cutoff,
+                        "look_ahead": opts.look_ahead,
+                        "limit": limit,
+                        "word": word,
+                        "sym": sym,
+                        "like_word": like_esc(word[: opts.exact_matches]),
+                        "like_sym": like_esc(sym[: opts.exact_matches]),
+                    },
+                )
+                for row in cursor:
+                    yield row["key"], row["word"]
@@ -1,12 +1,16 @@
 BEGIN;
 
 
+-- `gen` is the generation of the cache context a word belongs to
+-- Contexts are invalidated by moving on to a new `gen`, old rows are pruned on idle
 CREATE TABLE IF NOT EXISTS words (
-  key   BLOB NOT NULL,
-  word  TEXT NOT NULL,
-  lword TEXT NOT NULL,
+  key   BLOB    NOT NULL,
+  gen   INTEGER NOT NULL,
+  word  TEXT    NOT NULL,
+  lword TEXT    NOT NULL,
   UNIQUE (key, word)
 );
+CREATE INDEX IF NOT EXISTS words_gen   ON words (gen);
 CREATE INDEX IF NOT EXISTS words_lword ON words (lword);
 
 
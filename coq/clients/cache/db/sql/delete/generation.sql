@@ -0,0 +1,10 @@
+DELETE FROM words
+WHERE
+  rowid IN (
+    SELECT
+      rowid
+    FROM words
+    WHERE
+      gen = :gen
+    LIMIT :limit
+  )
@@ -0,0 +1,3 @@
+DELETE FROM words
+WHERE
+  key = :key
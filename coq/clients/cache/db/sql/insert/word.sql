@@ -1,2 +1,2 @@
-INSERT OR REPLACE INTO words (key,  word,  lword)
-VALUES                       (:key, :word, LOWER(:word))
+INSERT OR REPLACE INTO words (key,  gen,  word,  lword)
+VALUES                       (:key, :gen, :word, LOWER(:word))
@@ -3,6 +3,8 @@ SELECT
   word
 FROM words
 WHERE
+  gen = :gen
+  AND
   word <> ''
   AND
   (
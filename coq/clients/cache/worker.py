@@ -1,32 +1,42 @@
-from dataclasses import dataclass, replace
-from itertools import chain
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from itertools import repeat
 from typing import (
     AbstractSet,
+    Callable,
     Iterable,
     Iterator,
     Mapping,
     MutableMapping,
+    MutableSequence,
     MutableSet,
     Optional,
     Tuple,
+    cast,
 )
-from uuid import UUID, uuid4
+from uuid import UUID
 
+from ...consts import CACHE_SLICE
 from ...shared.fuzzy import multi_set_ratio
+from ...shared.memory import sizeof
 from ...shared.parse import coalesce
-from ...shared.repeat import sanitize
+from ...shared.repeat import relative
 from ...shared.runtime import Supervisor
 from ...shared.settings import MatchOptions
+from ...shared.slots import evolve
+from ...shared.timeslice import TimeSlicer
 from ...shared.timeit import timeit
 from ...shared.types import (
     BaseRangeEdit,
     Completion,
     Context,
-    Cursors,
     Interruptible,
     SnippetEdit,
 )
-from .db.database import Database
+from .db.database import Database, Slot
+
+# Cache contexts kept around, for returning to a recently completed row
+_SLOTS = 6
 
 
 @dataclass(frozen=True)
@@ -63,55 +73,172 @@ def _overlap(row: int, edit: BaseRangeEdit) -> bool:
 
 
 def sanitize_cached(
-    inline_shift: bool, cursor: Cursors, comp: Completion, sort_by: Optional[str]
+    inline_shift: bool, row: int, comp: Completion, sort_by: Optional[str]
 ) -> Optional[Completion]:
-    if edit := sanitize(inline_shift, cursor, edit=comp.primary_edit):
-        row, *_ = cursor
-        cached = replace(
+    """
+    Depends only on the row, range edits are `materialise`d onto the cursor later
+    """
+
+    if edit := relative(inline_shift, row=row, edit=comp.primary_edit):
+        cached = evolve(
             comp,
             primary_edit=edit,
             secondary_edits=tuple(
                 edit for edit in comp.secondary_edits if not _overlap(row, edit=edit)
             ),
             sort_by=sort_by or comp.sort_by,
+            relative=isinstance(edit, BaseRangeEdit),
         )
         return cached
     else:
         return None
 
 
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evicted: int
+    entries: int
+    size: int
+
+
+@dataclass
+class _Slot:
+    ctx: _CacheCtx
+    clients: MutableSet[str] = field(default_factory=set)
+    keys: MutableSet[bytes] = field(default_factory=set)
+
+
+@dataclass
+class _Entry:
+    slot: Slot
+    comp: Completion
+    size: int
+    # (inline_shift, sort_by) -> `sanitize_cached`, the slot's row is fixed
+    memo: Optional[Tuple[Tuple[bool, str], Optional[Completion]]] = None
+
+
 class CacheWorker(Interruptible):
+    """
+    One cache context per (buf, row), the most recent `_SLOTS` are kept
+
+    Entries are evicted least recently used first, once over either budget
+    """
+
     def __init__(self, supervisor: Supervisor) -> None:
         self._supervisor = supervisor
         self._db = Database()
-        self._cache_ctx = _CacheCtx(
-            change_id=uuid4(),
-            commit_id=uuid4(),
-            buf_id=-1,
-            row=-1,
-            col=-1,
-            syms_before="",
-            words_before="",
-            ws_before=""
-        )
-        self._clients: MutableSet[str] = set()
-        self._cached: MutableMapping[bytes, Completion] = {}
+        self._slots: MutableMapping[Slot, _Slot] = OrderedDict()
+        self._current: Slot = (-1, -1)
+        self._cached: MutableMapping[bytes, _Entry] = OrderedDict()
+        self._size = 0
+        self._hits = self._misses = self._evicted = 0
+        self._slicer = TimeSlicer(CACHE_SLICE)
 
     def interrupt(self) -> None:
         self._db.interrupt()
 
+    def usage(self) -> Mapping[str, int]:
+        """
+        Entries are sized as they come and go, nothing is walked here
+        """
+
+        return {"SQLite": self._db.usage(), "Python": self._size}
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evicted=self._evicted,
+            entries=len(self._cached),
+            size=self._size,
+        )
+
+    async def prune(self, busy: Callable[[], bool]) -> None:
+        """
+        In time sliced rounds, whatever is left goes on the next idle
+        """
+
+        async for chunk in self._slicer.slices(repeat(None), busy=busy):
+            if not self._db.prune(limit=len(chunk)):
+                break
+
+    def evict(self) -> None:
+        self._slots.clear()
+        self._cached.clear()
+        self._size = 0
+        self._db.clear()
+
+    def _forget(self, keys: Iterable[bytes]) -> MutableSequence[bytes]:
+        gone: MutableSequence[bytes] = []
+        for key in keys:
+            if entry := self._cached.pop(key, None):
+                self._size -= entry.size
+                if slot := self._slots.get(entry.slot):
+                    slot.keys.discard(key)
+                gone.append(key)
+        return gone
+
+    def _drop(self, slot_id: Slot) -> None:
+        if slot := self._slots.pop(slot_id, None):
+            self._forget(tuple(slot.keys))
+            self._db.drop(slot_id)
+
+    def _shrink(self) -> MutableSequence[bytes]:
+        limits = self._supervisor.limits
+        evicted: MutableSequence[bytes] = []
+        while self._cached and (
+            len(self._cached) > limits.cache_max_items
+            or self._size > limits.cache_max_bytes
+        ):
+            key = next(iter(self._cached))
+            evicted.extend(self._forget((key,)))
+        self._evicted += len(evicted)
+        return evicted
+
     def set_cache(
         self,
         items: Mapping[Optional[str], Iterable[Completion]],
         skip_db: bool,
     ) -> None:
+        """
+        Each entry is sized on its own, one large `doc` would skew a sample
+        """
+
+        slot_id = self._current
+        if (slot := self._slots.get(slot_id)) is None:
+            return
+
         new_comps = {
-            comp.uid.bytes: comp for comp in chain.from_iterable(items.values())
+            comp.uid.bytes: comp for comps in items.values() for comp in comps
         }
+        moved = self._forget(
+            key
+            for key in new_comps
+            if (entry := self._cached.get(key)) and entry.slot != slot_id
+        )
+
+        for client in items:
+            if client:
+                slot.clients.add(client)
+        for key, comp in new_comps.items():
+            if entry := self._cached.get(key):
+                self._size -= entry.size
+            size = sizeof(comp)
+            self._cached[key] = _Entry(slot=slot_id, comp=comp, size=size)
+            cast(OrderedDict, self._cached).move_to_end(key)
+            self._size += size
+            slot.keys.add(key)
+
+        # one round of deletes, before rows for the survivors go in
+        self._db.discard((*moved, *self._shrink()))
 
         def cont() -> Iterator[Tuple[bytes, str]]:
             for key, val in new_comps.items():
-                if self._supervisor.comp.smart:
+                if key not in self._cached:
+                    continue
+                elif self._supervisor.comp.smart:
                     for word in coalesce(
                         self._supervisor.match.unifying_chars,
                         include_syms=True,
@@ -123,19 +250,14 @@ class CacheWorker(Interruptible):
                     yield key, val.sort_by
 
         if not skip_db:
-            self._db.insert(cont())
-
-        for client in items:
-            if client:
-                self._clients.add(client)
-        self._cached.update(new_comps)
+            self._db.insert(slot_id, keys=cont())
 
     def apply_cache(
         self, context: Context, always: bool, inline_shift: bool
     ) -> Tuple[bool, AbstractSet[str], Iterator[Completion]]:
-        cache_ctx = self._cache_ctx
         row, col = context.position
-        self._cache_ctx = _CacheCtx(
+        slot_id = (context.buf_id, row)
+        cache_ctx = _CacheCtx(
             change_id=context.change_id,
             commit_id=context.commit_id,
             buf_id=context.buf_id,
@@ -143,40 +265,64 @@ class CacheWorker(Interruptible):
             col=col,
             syms_before=context.syms_before,
             words_before=context.words_before,
-            ws_before=context.ws_before
+            ws_before=context.ws_before,
         )
 
-        use_cache = _use_cache(
-            self._supervisor.match, cache=cache_ctx, ctx=context
-        ) and bool(self._cached)
-        cached_clients = {*self._clients}
+        slot = self._slots.get(slot_id)
+        use_cache = (
+            slot is not None
+            and bool(slot.keys)
+            and _use_cache(self._supervisor.match, cache=slot.ctx, ctx=context)
+        )
+        cached_clients = {*slot.clients} if slot else set()
 
-        if not use_cache:
-            self._clients.clear()
-            self._cached.clear()
+        if slot and use_cache:
+            self._hits += 1
+            slot.ctx = cache_ctx
+            cast(OrderedDict, self._slots).move_to_end(slot_id)
+        else:
+            self._misses += 1
+            self._drop(slot_id)
+            slot = self._slots[slot_id] = _Slot(ctx=cache_ctx)
+            while len(self._slots) > _SLOTS:
+                self._drop(next(iter(self._slots)))
+        self._current = slot_id
 
         selected = (
-            ((key, val.sort_by) for key, val in self._cached.items())
-            if always
-            else self._db.select(
-                not use_cache,
-                opts=self._supervisor.match,
-                word=context.words,
-                sym=context.syms,
-                limitless=context.manual,
+            (
+                (
+                    (key, entry.comp.sort_by)
+                    for key in tuple(slot.keys)
+                    if (entry := self._cached.get(key))
+                )
+                if always
+                else self._db.select(
+                    slot_id,
+                    opts=self._supervisor.match,
+                    word=context.words,
+                    sym=context.syms,
+                    limitless=context.manual,
+                )
             )
+            if use_cache
+            else iter(())
         )
 
+        def sanitized(entry: _Entry, sort_by: str) -> Optional[Completion]:
+            if entry.memo and entry.memo[0] == (inline_shift, sort_by):
+                _, cached = entry.memo
+            else:
+                cached = sanitize_cached(
+                    inline_shift, row=row, comp=entry.comp, sort_by=sort_by
+                )
+                entry.memo = (inline_shift, sort_by), cached
+            return cached
+
         def get() -> Iterator[Completion]:
             with timeit("CACHE -- GET"):
                 for key, sort_by in selected:
-                    if (comp := self._cached.get(key)) and (
-                        cached := sanitize_cached(
-                            inline_shift,
-                            cursor=context.cursor,
-                            comp=comp,
-                            sort_by=sort_by,
-                        )
+                    if (entry := self._cached.get(key)) and (
+                        cached := sanitized(entry, sort_by=sort_by)
                     ):
                         if (
                             context.words.startswith(sort_by)
@@ -188,6 +334,7 @@ class CacheWorker(Interruptible):
                             or cached.always_on_top
                         ):
                             continue
+                        cast(OrderedDict, self._cached).move_to_end(key)
                         yield cached
 
         return use_cache, cached_clients, get()
@@ -1,12 +1,11 @@
 from asyncio import Condition, as_completed
-from typing import AsyncIterator, Optional
+from typing import AsyncIterator, Mapping, Optional
 
 from pynvim_pp.logging import suppress_and_log
 from std2 import anext
 from std2.aitertools import to_async
-from std2.itertools import batched
 
-from ...consts import CACHE_CHUNK
+from ...consts import CACHE_SLICE
 from ...lsp.requests.completion import comp_lsp_inline
 from ...lsp.types import LSPcomp
 from ...shared.executor import AsyncExecutor
@@ -14,8 +13,9 @@ from ...shared.runtime import Supervisor
 from ...shared.runtime import Worker as BaseWorker
 from ...shared.settings import LSPInlineClient
 from ...shared.timeit import timeit
+from ...shared.timeslice import TimeSlicer
 from ...shared.types import Completion, Context
-from ..cache.worker import CacheWorker
+from ..cache.worker import CacheStats, CacheWorker
 
 
 class Worker(BaseWorker[LSPInlineClient, None]):
@@ -36,12 +36,25 @@ class Worker(BaseWorker[LSPInlineClient, None]):
         )
         self._cache = CacheWorker(supervisor)
         self._working = Condition()
+        self._slicer = TimeSlicer(CACHE_SLICE)
         self._ex.run(self._poll())
 
     def interrupt(self) -> None:
         with self._interrupt():
             self._cache.interrupt()
 
+    def usage(self) -> Mapping[str, int]:
+        return self._cache.usage()
+
+    def cache_stats(self) -> CacheStats:
+        return self._cache.stats()
+
+    async def tidy(self) -> None:
+        await self._cache.prune(busy=self._work_lock.locked)
+
+    def evict(self) -> None:
+        self._cache.evict()
+
     async def _request(self, context: Context) -> AsyncIterator[LSPcomp]:
         rows = comp_lsp_inline(
             short_name=self._options.short_name,
@@ -63,7 +76,9 @@ class Worker(BaseWorker[LSPInlineClient, None]):
                 if context := self._supervisor.current_context:
                     with suppress_and_log(), timeit("LSP INLINE PULL"):
                         async for comps in self._request(context):
-                            for chunked in batched(comps.items, n=CACHE_CHUNK):
+                            async for chunked in self._slicer.slices(
+                                comps.items, busy=self._work_lock.locked
+                            ):
                                 self._cache.set_cache(
                                     {comps.client: chunked}, skip_db=True
                                 )
@@ -1,54 +1,214 @@
 from bisect import bisect
-from collections import defaultdict
-from datetime import timedelta
-from math import exp, floor, gamma, inf, log
-from random import random, uniform
-from typing import AbstractSet, MutableSet, Optional, Sequence
+from contextlib import suppress
+from json import JSONDecodeError, dumps, loads
+from math import exp, inf
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import (
+    AbstractSet,
+    Any,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    Optional,
+    Sequence,
+)
 
-from std2.itertools import pairwise
+from ...shared.types import UTF8
 
+# Arms, each waits for this quantile of the slowest client's response time
+_QUANTILES = (0.5, 0.75, 0.9, 0.95, 0.99)
+# Reward given up for waiting the whole timeout, vs hearing back from every client
+_WAIT_COST = 0.5
+_DECAY = 0.99
+# Clients no longer asked are dropped, once decayed below one response's worth
+_EXPIRE = 1.0
+# Seconds, log spaced from 1ms to ~10s
+_BINS = (0.0, *(exp(0.2 * i) / 1000 for i in range(47)), inf)
 
-def _logit(x: float) -> float:
-    return log(x / (1 - x))
 
+class _Dist:
+    """
+    Decayed histogram of response times
+    """
 
-def _bins(k: float, n: int) -> Sequence[float]:
-    return tuple((exp(k * i) - 1) * 1000 for i in range(n)) + (inf,)
-
+    def __init__(self, weights: Sequence[float] = ()) -> None:
+        self.weights: MutableSequence[float] = (
+            [*weights] if len(weights) == len(_BINS) - 1 else [0.0] * (len(_BINS) - 1)
+        )
 
-class _Dist:
-    def __init__(self) -> None:
-        self._bins = _bins(k=0.03, n=6)
-        self._decay = 0.99
-        self._cdf = [0.0 for _ in pairwise(self._bins)]
-        self._sum = 0.0
+    def decay(self) -> None:
+        for idx, weight in enumerate(self.weights):
+            self.weights[idx] = weight * _DECAY
 
     def update(self, x: float) -> None:
-        binned, inc = False, 0.0
-        for i, (lo, hi) in enumerate(pairwise(self._bins)):
-            binned |= lo <= x < hi
-            inc += binned
-            self._cdf[i] = self._cdf[i] * self._decay + binned
-        self._cdf[-1] = self._cdf[-1] * self._decay + inc
-
-    def inv_cdf(self, p: float) -> float:
+        self.decay()
+        self.weights[bisect(_BINS, x) - 1] += 1
+
+    def censor(self, x: float) -> None:
+        """
+        No response within `x`, spread over what is already known to be slower
+
+        With nothing known past `x`, assume the slowest
+        """
+
+        self.decay()
+        lo = bisect(_BINS, x) - 1
+        if tail := sum(self.weights[lo:]):
+            for idx in range(lo, len(self.weights)):
+                self.weights[idx] += self.weights[idx] / tail
+        else:
+            self.weights[-1] += 1
+
+    def cdf(self, x: float) -> float:
+        if not (total := sum(self.weights)):
+            return 0.0
+        else:
+            idx = bisect(_BINS, x) - 1
+            lo, hi = _BINS[idx], _BINS[idx + 1]
+            part = 0.0 if hi == inf else (x - lo) / (hi - lo)
+            return (sum(self.weights[:idx]) + self.weights[idx] * part) / total
+
+    def quantile(self, p: float) -> float:
         assert 0 <= p <= 1
 
-        i = round((len(self._cdf) - 1) * p)
-        print(self._cdf[i + 1])
-        frac = (p - self._cdf[i]) / (self._cdf[i + 1] - self._cdf[i])
-        return self._bins[i] + frac * (self._bins[i + 1] - self._bins[i])
+        target, acc = p * sum(self.weights), 0.0
+        for idx, weight in enumerate(self.weights):
+            if weight and acc + weight >= target:
+                lo, hi = _BINS[idx], _BINS[idx + 1]
+                return lo if hi == inf else lo + (target - acc) / weight * (hi - lo)
+            acc += weight
+        return inf
 
 
 class MultiArmedBandit:
-    def __init__(self) -> None:
-        self._probability_floor = 0.05
-        self._clients: MutableSet[str] = set()
+    """
+    Learns how long to wait on LSP servers before settling for partial results
 
-    def _elapsed(self, client: str) -> float:
-        return inf
+    Arms wait for a response time quantile of the slowest client, per filetype.
+    They are rewarded by the share of clients heard back from, less the time waited.
+
+    Response times are seen in full, so every arm is scored on every request
+
+    Clients yet to answer when a request ends are kept as censored, slower
+    than what was waited. Only the clients of the latest request are waited on,
+    those no longer asked decay away
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self._path, self._dirty = path, False
+        # filetype -> client -> response times
+        self._dists: MutableMapping[str, MutableMapping[str, _Dist]] = {}
+        # filetype -> reward per arm
+        self._rewards: MutableMapping[str, MutableSequence[float]] = {}
+        # filetype -> clients of the latest request, unknown until one is seen
+        self._recent: MutableMapping[str, AbstractSet[str]] = {}
+
+        if path:
+            with suppress(
+                OSError,
+                JSONDecodeError,
+                AttributeError,
+                KeyError,
+                TypeError,
+                ValueError,
+            ):
+                self._load(loads(path.read_text(encoding=UTF8)))
+
+    def _load(self, json: Mapping[str, Any]) -> None:
+        """
+        All or nothing, partially read state is thrown away
+        """
+
+        dists = {
+            str(filetype): {
+                str(client): _Dist(tuple(map(float, weights)))
+                for client, weights in clients.items()
+            }
+            for filetype, clients in json["dists"].items()
+        }
+        rewards = {
+            str(filetype): [*map(float, rewards)]
+            for filetype, rewards in json["rewards"].items()
+            if len(rewards) == len(_QUANTILES)
+        }
+        self._dists, self._rewards = dists, rewards
+
+    def dump(self) -> None:
+        if self._path and self._dirty:
+            json = {
+                "dists": {
+                    filetype: {client: dist.weights for client, dist in dists.items()}
+                    for filetype, dists in self._dists.items()
+                },
+                "rewards": self._rewards,
+            }
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            with NamedTemporaryFile(
+                dir=self._path.parent, mode="w", encoding=UTF8, delete=False
+            ) as fd:
+                fd.write(dumps(json, check_circular=False))
+            Path(fd.name).replace(self._path)
+            self._dirty = False
+
+    def _wait(self, filetype: str, quantile: float, timeout: float) -> float:
+        dists = self._dists.get(filetype, {})
+        recent = self._recent.get(filetype, dists.keys())
+        if quantiles := [dists[c].quantile(quantile) for c in recent if c in dists]:
+            return min(timeout, max(quantiles))
+        else:
+            return timeout
+
+    def wait(self, filetype: str, timeout: float) -> float:
+        if rewards := self._rewards.get(filetype):
+            _, quantile = max(zip(rewards, _QUANTILES))
+            return self._wait(filetype, quantile=quantile, timeout=timeout)
+        else:
+            return timeout
 
     def update(
-        self, clients: AbstractSet[str], client: Optional[str], elapsed: timedelta
+        self,
+        filetype: str,
+        timeout: float,
+        observed: float,
+        asked: AbstractSet[str],
+        elapsed: Mapping[str, float],
     ) -> None:
-        self._clients |= clients
+        """
+        `observed` -> seconds listened for, whole or cut short
+
+        `asked` -> clients the request went to, those missing from `elapsed`
+        did not answer within `observed`
+        """
+
+        asked = {*asked, *elapsed} or self._recent.get(filetype, set())
+        if not asked or timeout <= 0:
+            return
+
+        self._recent[filetype] = asked
+        dists = self._dists.setdefault(filetype, {})
+        censored = tuple(dists[c] for c in asked - elapsed.keys() if c in dists)
+        rewards = self._rewards.setdefault(filetype, [0.0] * len(_QUANTILES))
+        for idx, quantile in enumerate(_QUANTILES):
+            wait = self._wait(filetype, quantile=quantile, timeout=timeout)
+            heard = sum(t <= wait for t in elapsed.values())
+            if wait > observed:
+                # odds of having answered by `wait`, given not by `observed`
+                for dist in censored:
+                    if (tail := 1 - dist.cdf(observed)) > 0:
+                        heard += (dist.cdf(wait) - dist.cdf(observed)) / tail
+            reward = heard / len(asked) - _WAIT_COST * wait / timeout
+            rewards[idx] = rewards[idx] * _DECAY + reward * (1 - _DECAY)
+
+        for client, dist in tuple(dists.items()):
+            if client not in asked:
+                dist.decay()
+                if sum(dist.weights) < _EXPIRE:
+                    dists.pop(client)
+        for client in asked:
+            dist = dists.setdefault(client, _Dist())
+            if (t := elapsed.get(client)) is not None:
+                dist.update(t)
+            else:
+                dist.censor(observed)
+        self._dirty = True
@@ -1,9 +1,11 @@
-from asyncio import Condition, as_completed, sleep
+from asyncio import Condition, as_completed
 from dataclasses import dataclass, field
 from enum import Enum, auto
+from time import monotonic
 from typing import (
     AsyncIterator,
     Iterator,
+    Mapping,
     MutableMapping,
     MutableSequence,
     MutableSet,
@@ -13,11 +15,11 @@ from typing import (
 
 from pynvim_pp.logging import suppress_and_log
 from std2 import anext
-from std2.itertools import batched
 
-from ...consts import CACHE_CHUNK
+from ...consts import CACHE_SLICE
 from ...lsp.requests.completion import comp_lsp
 from ...lsp.types import LSPcomp
+from ...shared.aio import with_timeout
 from ...shared.context import cword_before
 from ...shared.executor import AsyncExecutor
 from ...shared.fuzzy import multi_set_ratio
@@ -27,8 +29,9 @@ from ...shared.runtime import Worker as BaseWorker
 from ...shared.settings import LSPClient, MatchOptions
 from ...shared.sql import BIGGEST_INT
 from ...shared.timeit import timeit
+from ...shared.timeslice import TimeSlicer
 from ...shared.types import Completion, Context, SnippetEdit
-from ..cache.worker import CacheWorker, sanitize_cached
+from ..cache.worker import CacheStats, CacheWorker, sanitize_cached
 from .mul_bandit import MultiArmedBandit
 
 
@@ -75,6 +78,12 @@ class _LocalCache:
     )
 
 
+@dataclass(frozen=True)
+class _Replies:
+    asked: MutableSet[str] = field(default_factory=set)
+    elapsed: MutableMapping[str, float] = field(default_factory=dict)
+
+
 class Worker(BaseWorker[LSPClient, None]):
     def __init__(
         self,
@@ -95,24 +104,47 @@ class Worker(BaseWorker[LSPClient, None]):
         self._local_cached = _LocalCache()
         self._working = Condition()
         self._max_results = self._supervisor.match.max_results
-        self._stats = MultiArmedBandit()
+        self._stats = MultiArmedBandit(
+            supervisor.vars_dir / "lsp" / f"{options.short_name}.json"
+        )
+        self._slicer = TimeSlicer(CACHE_SLICE)
         self._ex.run(self._poll())
 
     def interrupt(self) -> None:
         with self._interrupt():
             self._cache.interrupt()
 
-    async def _request(self, context: Context) -> AsyncIterator[LSPcomp]:
+    def usage(self) -> Mapping[str, int]:
+        return self._cache.usage()
+
+    def cache_stats(self) -> CacheStats:
+        return self._cache.stats()
+
+    async def tidy(self) -> None:
+        await self._cache.prune(busy=self._work_lock.locked)
+        self._stats.dump()
+
+    def evict(self) -> None:
+        self._cache.evict()
+        self._local_cached.pre.clear()
+        self._local_cached.post.clear()
+
+    async def _request(
+        self, context: Context, replies: _Replies
+    ) -> AsyncIterator[LSPcomp]:
         rows = comp_lsp(
             short_name=self._options.short_name,
             always_on_top=self._options.always_on_top,
             weight_adjust=self._options.weight_adjust,
             context=context,
             chunk=self._max_results,
-            clients=set()
+            clients=set(),
+            prefilter=self._options.prefilter,
         )
-        async for row, peers, elapsed in rows:
-            self._stats.update(peers, client=row.client, elapsed=elapsed)
+        async for row, peers, delta in rows:
+            replies.asked.update(peers)
+            if row.client:
+                replies.elapsed.setdefault(row.client, delta.total_seconds())
             yield row
 
     async def _poll(self) -> None:
@@ -122,29 +154,31 @@ class Worker(BaseWorker[LSPClient, None]):
 
             async def cont() -> None:
                 with suppress_and_log(), timeit("LSP CACHE"):
-                    if not self._work_lock.locked():
+                    busy = self._work_lock.locked
+                    if not busy():
                         self._cache.set_cache(self._local_cached.post, skip_db=False)
                         acc = tuple(self._local_cached.pre.items())
                         for client, comps in acc:
-                            await sleep(0)
-                            if not self._work_lock.locked():
-                                for chunked in batched(comps, n=CACHE_CHUNK):
+                            async for chunked in self._slicer.slices(comps, busy=busy):
+                                self._cache.set_cache({client: chunked}, skip_db=False)
+                        if context := self._supervisor.current_context:
+                            # refills the cache, not timed against the wait
+                            replies = _Replies()
+                            async for lsp_comps in self._request(
+                                context, replies=replies
+                            ):
+                                async for chunked in self._slicer.slices(
+                                    lsp_comps.items, busy=busy
+                                ):
                                     self._cache.set_cache(
-                                        {client: chunked}, skip_db=False
+                                        {lsp_comps.client: chunked}, skip_db=False
                                     )
-                        if context := self._supervisor.current_context:
-                            async for lsp_comps in self._request(context):
-                                for chunked in batched(lsp_comps.items, n=CACHE_CHUNK):
-                                    if not self._work_lock.locked():
-                                        self._cache.set_cache(
-                                            {lsp_comps.client: chunked}, skip_db=False
-                                        )
-                                        await sleep(0)
 
             await self._with_interrupt(cont())
 
     async def _work(self, context: Context, timeout: float) -> AsyncIterator[Completion]:
         inline_shift = False
+        row, _ = context.position
         limit = (
             BIGGEST_INT
             if context.manual
@@ -152,6 +186,14 @@ class Worker(BaseWorker[LSPClient, None]):
         )
 
         async with self._work_lock, self._working:
+            replies = _Replies()
+            wait = (
+                timeout
+                if context.manual
+                else self._stats.wait(context.filetype, timeout=timeout)
+            )
+            start = monotonic()
+            deadline = start + wait
             try:
                 use_cache, cached_clients, cached = self._cache.apply_cache(
                     context, always=False, inline_shift=inline_shift
@@ -160,7 +202,7 @@ class Worker(BaseWorker[LSPClient, None]):
                     self._local_cached.pre.clear()
                     self._local_cached.post.clear()
 
-                lsp_stream = self._request(context)
+                lsp_stream = self._request(context, replies=replies)
 
                 async def db() -> Tuple[_Src, LSPcomp]:
                     return _Src.from_db, LSPcomp(
@@ -168,7 +210,9 @@ class Worker(BaseWorker[LSPClient, None]):
                     )
 
                 async def lsp() -> Optional[Tuple[_Src, LSPcomp]]:
-                    if comps := await anext(lsp_stream, None):
+                    if comps := await with_timeout(
+                        max(0, deadline - monotonic()), anext(lsp_stream, None)
+                    ):
                         return _Src.from_query, comps
                     else:
                         return None
@@ -184,7 +228,7 @@ class Worker(BaseWorker[LSPClient, None]):
                             if (
                                 cached := sanitize_cached(
                                     inline_shift=inline_shift,
-                                    cursor=context.cursor,
+                                    row=row,
                                     comp=item,
                                     sort_by=None,
                                 )
@@ -198,8 +242,8 @@ class Worker(BaseWorker[LSPClient, None]):
                         if comps := await co:
                             yield comps
 
-                    async for lsp_comps in lsp_stream:
-                        yield _Src.from_query, lsp_comps
+                    while comps := await lsp():
+                        yield comps
 
                 seen: MutableSet[str] = set()
                 async for src, lsp_comps in stream():
@@ -229,3 +273,11 @@ class Worker(BaseWorker[LSPClient, None]):
                                 yield comp
             finally:
                 self._working.notify_all()
+                # cut short or not, those yet to answer count as slower than waited
+                self._stats.update(
+                    context.filetype,
+                    timeout=timeout,
+                    observed=min(monotonic(), deadline) - start,
+                    asked=replies.asked,
+                    elapsed=replies.elapsed,
+                )
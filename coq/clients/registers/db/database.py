@@ -7,7 +7,7 @@ from ....consts import REGISTER_DB
 from ....databases.types import DB
 from ....shared.parse import coalesce, tokenize
 from ....shared.settings import MatchOptions
-from ....shared.sql import init_db, like_esc
+from ....shared.sql import connect, init_db, like_esc
 from .sql import sql
 
 
@@ -20,7 +20,7 @@ class RegWord:
 
 
 def _init() -> Connection:
-    conn = Connection(REGISTER_DB, isolation_level=None)
+    conn = connect(REGISTER_DB)
     init_db(conn)
     conn.executescript(sql("create", "pragma"))
     conn.executescript(sql("create", "tables"))
@@ -50,6 +50,9 @@ class Worker(BaseWorker[RegistersClient, None]):
         with self._interrupt():
             self._db.interrupt()
 
+    def usage(self) -> Mapping[str, int]:
+        return {"SQLite": self._db.usage()}
+
     async def _poll(self) -> None:
         while True:
 
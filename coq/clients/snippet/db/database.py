@@ -7,7 +7,7 @@ from uuid import uuid4
 
 from ....databases.types import DB
 from ....shared.settings import MatchOptions
-from ....shared.sql import BIGGEST_INT, init_db, like_esc
+from ....shared.sql import BIGGEST_INT, connect, init_db, like_esc
 from ....snippets.types import LoadedSnips
 from .sql import sql
 
@@ -25,7 +25,7 @@ class _Snip(TypedDict):
 def _init(db_dir: Path) -> Connection:
     db = (db_dir / _SCHEMA).with_suffix(".sqlite3")
     db.parent.mkdir(parents=True, exist_ok=True)
-    conn = Connection(db, isolation_level=None)
+    conn = connect(db)
     init_db(conn)
     conn.executescript(sql("create", "pragma"))
     conn.executescript(sql("create", "tables"))
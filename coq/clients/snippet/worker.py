@@ -33,6 +33,9 @@ class Worker(BaseWorker[SnippetClient, Path]):
         with self._interrupt():
             self._db.interrupt()
 
+    def usage(self) -> Mapping[str, int]:
+        return {"SQLite": self._db.usage()}
+
     async def db_mtimes(self) -> Mapping[PurePath, float]:
         async def cont() -> Mapping[PurePath, float]:
             with self._interrupt_lock:
@@ -9,7 +9,7 @@ from pynvim_pp.lib import encode
 
 from ....databases.types import DB
 from ....shared.settings import MatchOptions
-from ....shared.sql import init_db, like_esc
+from ....shared.sql import connect, init_db, like_esc
 from ....tags.types import Tag, Tags
 from .sql import sql
 
@@ -34,7 +34,7 @@ def _init(db_dir: Path, cwd: PurePath) -> Connection:
     name = f"{md5(encode(ncwd)).hexdigest()}-{_SCHEMA}"
     db = (db_dir / name).with_suffix(".sqlite3")
     db.parent.mkdir(parents=True, exist_ok=True)
-    conn = Connection(str(db), isolation_level=None)
+    conn = connect(str(db))
     init_db(conn)
     conn.executescript(sql("create", "pragma"))
     conn.executescript(sql("create", "tables"))
@@ -5,9 +5,10 @@ from typing import AbstractSet, Iterator, Mapping, MutableMapping, Optional
 
 from ....consts import TMUX_DB
 from ....databases.types import DB
+from ....shared.memory import sizeof
 from ....shared.parse import tokenize
 from ....shared.settings import MatchOptions
-from ....shared.sql import init_db, like_esc
+from ....shared.sql import connect, init_db, like_esc
 from ....tmux.parse import Pane
 from .sql import sql
 
@@ -23,7 +24,7 @@ class TmuxWord:
 
 
 def _init() -> Connection:
-    conn = Connection(TMUX_DB, isolation_level=None)
+    conn = connect(TMUX_DB)
     init_db(conn)
     conn.executescript(sql("create", "pragma"))
     conn.executescript(sql("create", "tables"))
@@ -98,6 +99,23 @@ class TMDB(DB):
                     cursor.executemany(sql("insert", "word"), m3())
                 cursor.execute("PRAGMA optimize", ())
 
+    def text_usage(self) -> int:
+        """
+        Pane text kept to skip re-tokenizing panes that did not change
+        """
+
+        return sizeof(self._cache)
+
+    def evict(self) -> None:
+        """
+        Pane text goes too, else unchanged panes are never read back in
+        """
+
+        self._cache.clear()
+        with suppress(OperationalError):
+            with self._conn, closing(self._conn.cursor()) as cursor:
+                cursor.execute(sql("delete", "panes"))
+
     def select(
         self, opts: MatchOptions, word: str, sym: str, limit: int
     ) -> Iterator[TmuxWord]:
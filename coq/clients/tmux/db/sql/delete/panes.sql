@@ -0,0 +1 @@
+DELETE FROM panes
@@ -1,7 +1,7 @@
 from asyncio import Lock
 from os import linesep
 from pathlib import Path
-from typing import AsyncIterator, Iterator
+from typing import AsyncIterator, Iterator, Mapping
 
 from pynvim_pp.logging import suppress_and_log
 
@@ -55,6 +55,12 @@ class Worker(BaseWorker[TmuxClient, Path]):
         with self._interrupt():
             self._db.interrupt()
 
+    def usage(self) -> Mapping[str, int]:
+        return {"SQLite": self._db.usage(), "Python": self._db.text_usage()}
+
+    def evict(self) -> None:
+        self._db.evict()
+
     async def _poll(self) -> None:
         while True:
 
@@ -5,13 +5,13 @@ from typing import Iterable, Iterator, Mapping
 from ....consts import TREESITTER_DB
 from ....databases.types import DB
 from ....shared.settings import MatchOptions
-from ....shared.sql import init_db, like_esc
+from ....shared.sql import connect, init_db, like_esc
 from ....treesitter.types import Payload, SimplePayload
 from .sql import sql
 
 
 def _init() -> Connection:
-    conn = Connection(TREESITTER_DB, isolation_level=None)
+    conn = connect(TREESITTER_DB)
     init_db(conn)
     conn.executescript(sql("create", "pragma"))
     conn.executescript(sql("create", "tables"))
@@ -123,6 +123,9 @@ class Worker(BaseWorker[TSClient, None]):
         with self._interrupt():
             self._db.interrupt()
 
+    def usage(self) -> Mapping[str, int]:
+        return {"SQLite": self._db.usage()}
+
     async def _poll(self) -> None:
         while True:
             async with self._idle:
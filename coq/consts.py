@@ -3,7 +3,8 @@ from os.path import normpath
 from pathlib import Path
 
 GIL_SWITCH = 1 / (10**3)
-CACHE_CHUNK = 9
+# Seconds, of filling caches between yielding to the event loop
+CACHE_SLICE = 3 / (10**3)
 
 IS_WIN = name == "nt"
 
@@ -46,6 +47,7 @@ TREESITTER_DB = normpath(TMP_DIR / "treesitter.sqlite3") if DEBUG_DB else ":memo
 INSERT_DB = normpath(TMP_DIR / "inserts.sqlite3") if DEBUG_DB else ":memory:"
 TMUX_DB = normpath(TMP_DIR / "tmux.sqlite3") if DEBUG_DB else ":memory:"
 REGISTER_DB = normpath(TMP_DIR / "register.sqlite3") if DEBUG_DB else ":memory:"
+SLOW_SQL_LOG = TMP_DIR / "slow_sql.log"
 
 
 _URI_BASE = "https://github.com/ms-jpq/coq_nvim/tree/coq/docs/"
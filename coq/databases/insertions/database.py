@@ -1,18 +1,45 @@
+from asyncio import get_running_loop
+from atexit import register
 from contextlib import closing, suppress
-from dataclasses import dataclass
-from sqlite3 import Connection, OperationalError
-from typing import Iterator, Mapping
+from dataclasses import dataclass, field
+from itertools import groupby
+from sqlite3 import Connection, DatabaseError, OperationalError
+from threading import Lock
+from time import time
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    MutableSet,
+    Sequence,
+    Tuple,
+)
+
+from pynvim_pp.logging import log
 
 from ...consts import INSERT_DB
-from ...shared.sql import init_db
+from ...shared.lru import LRU
+from ...shared.sketch import Sketch
+from ...shared.sql import connect, init_db
 from ..types import DB
 from .sql import sql
 
+# Rows buffered before a flush is forced, regardless of idling
+_FLUSH_AT = 999
+# Rows kept while flushes keep failing, the oldest go first
+_MAX_PENDING = 9999
+# Instances still expecting a stat / insertion
+_INSTANCES = 999
+
 
 @dataclass(frozen=True)
 class Statistics:
     source: str
     interrupted: int
+    exceeded: int
     inserted: int
 
     avg_duration: float
@@ -21,92 +48,281 @@ class Statistics:
     q95_duration: float
     q99_duration: float
 
+    avg_cpu: float
+    q50_cpu: float
+    q95_cpu: float
+    q99_cpu: float
+
     avg_items: float
     q50_items: int
     q99_items: int
 
 
+@dataclass
+class _Summary:
+    interrupted: int = 0
+    exceeded: int = 0
+    inserted: int = 0
+    duration: Sketch = field(default_factory=Sketch)
+    cpu: Sketch = field(default_factory=Sketch)
+    items: Sketch = field(default_factory=Sketch)
+
+
+def _dump(source: str, summary: _Summary) -> Mapping[str, Any]:
+    return {
+        "source_id": source,
+        "interrupted": summary.interrupted,
+        "exceeded": summary.exceeded,
+        "inserted": summary.inserted,
+        "duration": bytes(summary.duration),
+        "cpu": bytes(summary.cpu),
+        "items": bytes(summary.items),
+    }
+
+
+def _transient(e: OperationalError) -> bool:
+    """
+    Interrupted, or locked by another connection, worth retrying
+    """
+
+    msg = str(e)
+    return msg == "interrupted" or "locked" in msg or "busy" in msg
+
+
 def _init() -> Connection:
-    conn = Connection(INSERT_DB, isolation_level=None)
+    conn = connect(INSERT_DB)
     init_db(conn)
     conn.executescript(sql("create", "pragma"))
+    with closing(conn.cursor()) as cursor:
+        cursor.execute(sql("select", "legacy"), ())
+        legacy = bool(cursor.fetchall())
+    if legacy:
+        conn.executescript(sql("migrate", "v1"))
     conn.executescript(sql("create", "tables"))
     return conn
 
 
 class IDB(DB):
-    def __init__(self) -> None:
+    """
+    Writes are buffered, and land in one transaction on `flush()`
+
+    Enqueueing is thread safe, flushing happens on the event loop
+
+    Per source statistics are kept as running sketches, `stats()` never scans
+
+    Raw rows are only kept for `retention` seconds, see `compact()`
+    """
+
+    def __init__(
+        self, retention: float, clock: Callable[[], float] = time
+    ) -> None:
+        self._retention, self._clock = retention, clock
+        self._loop = get_running_loop()
         self._conn = _init()
+        self._lock = Lock()
+        self._pending: MutableSequence[Tuple[str, Mapping[str, Any]]] = []
+        # rows enqueued since the last flush, only these schedule another
+        self._fresh = 0
+        self._dropping = False
+        self._sources: MutableMapping[bytes, str] = LRU(size=_INSTANCES)
+        self._summaries: MutableMapping[str, _Summary] = {}
+        self._dirty: MutableSet[str] = set()
+        self._load()
+        register(self.flush)
 
-    def new_source(self, source: str) -> None:
-        # MUST OK
+    def _load(self) -> None:
         with self._conn, closing(self._conn.cursor()) as cursor:
-            cursor.execute(sql("insert", "source"), {"name": source})
+            cursor.execute(sql("select", "sources"), ())
+            for row in cursor.fetchall():
+                self._summaries[row["name"]] = _Summary()
+
+            cursor.execute(sql("select", "source_stats"), ())
+            if rows := cursor.fetchall():
+                for row in rows:
+                    summary = self._summaries[row["source"]]
+                    summary.interrupted = row["interrupted"]
+                    summary.exceeded = row["exceeded"]
+                    summary.inserted = row["inserted"]
+                    summary.duration.load(row["duration"])
+                    summary.cpu.load(row["cpu"])
+                    summary.items.load(row["items"])
+            else:
+                # one off, for databases from before sketches
+                cursor.execute(sql("select", "instance_stats"), ())
+                for row in cursor:
+                    summary = self._summaries[row["source"]]
+                    summary.interrupted += row["interrupted"]
+                    if row["duration"] is not None:
+                        summary.duration.add(row["duration"])
+                    summary.items.add(row["items"])
+
+                cursor.execute(sql("select", "stat_inserted"), ())
+                for row in cursor:
+                    self._summaries[row["source"]].inserted = row["inserted"]
+                self._dirty.update(self._summaries)
+
+    def _enqueue(self, stmt: str, params: Mapping[str, Any]) -> None:
+        with self._lock:
+            self._pending.append((stmt, params))
+            self._fresh += 1
+            if full := self._fresh >= _FLUSH_AT:
+                self._fresh = 0
+        if full:
+            self._loop.call_soon_threadsafe(self.flush)
+
+    def _replay(self, pending: Sequence[Tuple[str, Mapping[str, Any]]]) -> int:
+        done = 0
+        with closing(self._conn.cursor()) as cursor:
+            for stmt, params in pending:
+                try:
+                    cursor.execute(stmt, params)
+                except OperationalError as e:
+                    if _transient(e):
+                        break
+                    else:
+                        log.warning("%s", e)
+                except DatabaseError as e:
+                    log.warning("%s", e)
+                done += 1
+        return done
+
+    def flush(self) -> None:
+        with self._lock:
+            self._fresh = 0
+            pending = [*self._pending]
+            dirty, self._dirty = self._dirty, set()
+            summaries = [
+                (sql("insert", "source_stat"), _dump(source, self._summaries[source]))
+                for source in dirty
+            ]
+        if not (rows := [*pending, *summaries]):
+            return
+
+        try:
+            with self._conn, closing(self._conn.cursor()) as cursor:
+                cursor.execute("BEGIN")
+                for stmt, group in groupby(rows, key=lambda p: p[0]):
+                    cursor.executemany(stmt, (params for _, params in group))
+        except OperationalError as e:
+            # interrupted / locked, rows stay queued for the next flush
+            # anything else will not go away, replay drops the bad rows
+            done = 0 if _transient(e) else self._replay(rows)
+        except DatabaseError:
+            # one bad row aborts the transaction, replay to keep the rest
+            done = self._replay(rows)
+        else:
+            done = len(rows)
+
+        with self._lock:
+            del self._pending[: min(done, len(pending))]
+            if done < len(rows):
+                self._dirty.update(dirty)
+            if (over := len(self._pending) - _MAX_PENDING) > 0:
+                del self._pending[:over]
+                warn, self._dropping = not self._dropping, True
+            else:
+                warn = False
+                if done == len(rows):
+                    self._dropping = False
+
+        if warn:
+            log.warning("%s", "Insertions DB unwritable, dropping the oldest rows")
+
+    def compact(self) -> None:
+        """
+        Sketches already summarize everything, older raw rows can go
+
+        `inserted` rows go along with their instances
+        """
+
+        self.flush()
+        cutoff = self._clock() - self._retention
+        with suppress(OperationalError):
+            with self._conn, closing(self._conn.cursor()) as cursor:
+                cursor.execute("BEGIN")
+                cursor.execute(sql("delete", "batches"), {"cutoff": cutoff})
+                cursor.execute(sql("delete", "inserted"), ())
+
+    def new_source(self, source: str) -> None:
+        with self._lock:
+            self._summaries.setdefault(source, _Summary())
+        self._enqueue(sql("insert", "source"), {"name": source})
 
     def new_batch(self, batch_id: bytes) -> None:
-        # MUST OK
-        with self._conn, closing(self._conn.cursor()) as cursor:
-            cursor.execute(sql("insert", "batch"), {"rowid": batch_id})
+        self._enqueue(
+            sql("insert", "batch"), {"rowid": batch_id, "created": self._clock()}
+        )
 
     def new_instance(self, instance: bytes, source: str, batch_id: bytes) -> None:
-        # MUST OK
-        with self._conn, closing(self._conn.cursor()) as cursor:
-            cursor.execute(
-                sql("insert", "instance"),
-                {"rowid": instance, "source_id": source, "batch_id": batch_id},
-            )
+        with self._lock:
+            self._sources[instance] = source
+        self._enqueue(
+            sql("insert", "instance"),
+            {"rowid": instance, "source_id": source, "batch_id": batch_id},
+        )
 
     def new_stat(
-        self, instance: bytes, interrupted: bool, duration: float, items: int
+        self,
+        instance: bytes,
+        interrupted: bool,
+        exceeded: bool,
+        duration: float,
+        cpu: float,
+        items: int,
     ) -> None:
-        # MUST OK
-        with self._conn, closing(self._conn.cursor()) as cursor:
-            cursor.execute(
-                sql("insert", "instance_stat"),
-                {
-                    "instance_id": instance,
-                    "interrupted": interrupted,
-                    "duration": duration,
-                    "items": items,
-                },
-            )
-
-    def insertion_order(self, n_rows: int) -> Mapping[str, int]:
-        # can interrupt
-        with suppress(OperationalError):
-            with self._conn, closing(self._conn.cursor()) as cursor:
-                cursor.execute(sql("select", "inserted"), {"limit": n_rows})
-                order = {
-                    row["sort_by"]: row["insert_order"] for row in cursor.fetchall()
-                }
-                return order
-        return {}
+        with self._lock:
+            if source := self._sources.get(instance):
+                summary = self._summaries[source]
+                summary.interrupted += interrupted
+                summary.exceeded += exceeded
+                summary.duration.add(duration)
+                summary.cpu.add(cpu)
+                summary.items.add(items)
+                self._dirty.add(source)
+        self._enqueue(
+            sql("insert", "instance_stat"),
+            {
+                "instance_id": instance,
+                "interrupted": interrupted,
+                "exceeded": exceeded,
+                "duration": duration,
+                "cpu": cpu,
+                "items": items,
+            },
+        )
 
     def inserted(self, instance_id: bytes, sort_by: str) -> None:
-        # MUST OK
-        with self._conn, closing(self._conn.cursor()) as cursor:
-            cursor.execute(
-                sql("insert", "inserted"),
-                {"instance_id": instance_id, "sort_by": sort_by},
-            )
+        with self._lock:
+            if source := self._sources.get(instance_id):
+                self._summaries[source].inserted += 1
+                self._dirty.add(source)
+        self._enqueue(
+            sql("insert", "inserted"),
+            {"instance_id": instance_id, "sort_by": sort_by},
+        )
 
     def stats(self) -> Iterator[Statistics]:
-        # MUST OK
-        with self._conn, closing(self._conn.cursor()) as cursor:
-            cursor.execute(sql("select", "summaries"), ())
-
-            for row in cursor:
+        stats: MutableSequence[Statistics] = []
+        with self._lock:
+            for source, summary in self._summaries.items():
+                duration, cpu, items = summary.duration, summary.cpu, summary.items
                 stat = Statistics(
-                    source=row["source"],
-                    interrupted=row["interrupted"],
-                    inserted=row["inserted"],
-                    avg_duration=row["avg_duration"],
-                    avg_items=row["avg_items"],
-                    q10_duration=row["q10_duration"],
-                    q50_duration=row["q50_duration"],
-                    q95_duration=row["q95_duration"],
-                    q99_duration=row["q99_duration"],
-                    q50_items=row["q50_items"],
-                    q99_items=row["q99_items"],
+                    source=source,
+                    interrupted=summary.interrupted,
+                    exceeded=summary.exceeded,
+                    inserted=summary.inserted,
+                    avg_duration=duration.avg,
+                    avg_items=items.avg,
+                    q10_duration=duration.quantile(0.1),
+                    q50_duration=duration.quantile(0.5),
+                    q95_duration=duration.quantile(0.95),
+                    q99_duration=duration.quantile(0.99),
+                    avg_cpu=cpu.avg,
+                    q50_cpu=cpu.quantile(0.5),
+                    q95_cpu=cpu.quantile(0.95),
+                    q99_cpu=cpu.quantile(0.99),
+                    q50_items=round(items.quantile(0.5)),
+                    q99_items=round(items.quantile(0.99)),
                 )
-                yield stat
+                stats.append(stat)
+        yield from stats
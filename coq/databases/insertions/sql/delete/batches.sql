@@ -0,0 +1,3 @@
+DELETE FROM batches
+WHERE
+  created < :cutoff
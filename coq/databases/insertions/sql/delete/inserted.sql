@@ -0,0 +1,3 @@
+DELETE FROM inserted
+WHERE
+  instance_id IS NULL
@@ -0,0 +1,2 @@
+INSERT OR REPLACE INTO source_stats ( source_id,  interrupted,  exceeded,  inserted,  duration,  cpu,  items)
+VALUES                              (:source_id, :interrupted, :exceeded, :inserted, :duration, :cpu, :items)
@@ -0,0 +1,34 @@
+-- Databases from before `user_version` was set
+BEGIN;
+
+
+-- Recreated by `create/tables.sql`
+DROP VIEW IF EXISTS stats_view;
+DROP VIEW IF EXISTS stats_summaries_view;
+DROP VIEW IF EXISTS items_quantiles_view;
+DROP VIEW IF EXISTS duration_quantiles_view;
+DROP VIEW IF EXISTS quantiles_view;
+DROP VIEW IF EXISTS stats_inserted_view;
+DROP VIEW IF EXISTS instance_stats_view;
+
+
+-- Rows from before `created` fall out of retention on the next compaction
+ALTER TABLE batches        ADD COLUMN created  REAL    NOT NULL DEFAULT 0;
+ALTER TABLE instance_stats ADD COLUMN exceeded INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE instance_stats ADD COLUMN cpu      REAL    NOT NULL DEFAULT 0;
+
+
+-- `instance_id` turns nullable, which needs a new table
+CREATE TABLE inserted_v1 (
+  rowid       INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+  instance_id BLOB             REFERENCES instances (rowid) ON UPDATE CASCADE ON DELETE SET NULL,
+  sort_by     TEXT    NOT NULL
+);
+INSERT INTO inserted_v1 (rowid, instance_id, sort_by)
+SELECT rowid, instance_id, sort_by
+FROM inserted;
+DROP TABLE inserted;
+ALTER TABLE inserted_v1 RENAME TO inserted;
+
+
+END;
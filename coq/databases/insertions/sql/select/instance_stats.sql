@@ -0,0 +1,6 @@
+SELECT
+  source,
+  interrupted,
+  duration,
+  items
+FROM instance_stats_view
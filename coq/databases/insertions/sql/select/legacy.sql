@@ -0,0 +1,7 @@
+SELECT
+  1
+FROM sqlite_master
+WHERE
+  type = 'table'
+  AND name = 'batches'
+  AND (SELECT user_version FROM pragma_user_version) < 1
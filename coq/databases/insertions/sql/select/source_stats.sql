@@ -0,0 +1,9 @@
+SELECT
+  source_id AS source,
+  interrupted,
+  exceeded,
+  inserted,
+  duration,
+  cpu,
+  items
+FROM source_stats
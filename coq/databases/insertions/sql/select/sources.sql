@@ -0,0 +1,3 @@
+SELECT
+  name
+FROM sources
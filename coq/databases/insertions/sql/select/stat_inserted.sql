@@ -1,3 +1,3 @@
 SELECT
   *
-FROM stat_inserted_view
+FROM stats_inserted_view
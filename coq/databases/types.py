@@ -1,4 +1,5 @@
-from sqlite3 import Connection
+from contextlib import closing, suppress
+from sqlite3 import Connection, OperationalError
 from typing import cast
 
 from ..shared.types import Interruptible
@@ -9,3 +10,16 @@ class DB(Interruptible):
 
     def interrupt(self) -> None:
         self._conn.interrupt()
+
+    def usage(self) -> int:
+        """
+        Bytes held in SQLite pages, less the free list
+        """
+
+        with suppress(OperationalError):
+            with closing(self._conn.cursor()) as cursor:
+                (size,), *_ = cursor.execute("PRAGMA page_size").fetchall()
+                (pages,), *_ = cursor.execute("PRAGMA page_count").fetchall()
+                (free,), *_ = cursor.execute("PRAGMA freelist_count").fetchall()
+                return (pages - free) * size
+        return 0
@@ -7,7 +7,9 @@ from typing import (
     Optional,
     Sequence,
     Type,
+    TypeVar,
     Union,
+    cast,
 )
 
 from pynvim_pp.logging import log
@@ -45,9 +47,16 @@ from .types import (
     StringValue,
     TextEdit,
     TextEditNonStandard,
+    _CompletionItemLabelDetails,
+    _InsertReplaceRange,
+    _Position,
+    _Range,
 )
 
 
+_T = TypeVar("_T")
+
+
 def _falsy(thing: Any) -> bool:
     return thing is None or thing is False or thing == 0 or thing == "" or thing == b""
 
@@ -61,6 +70,134 @@ _inline_item_parser = _new_parser(
 )
 
 
+class _Irregular(Exception): ...
+
+
+def _req(ty: Type[_T], thing: Any) -> _T:
+    if type(thing) is ty:
+        return cast(_T, thing)
+    else:
+        raise _Irregular()
+
+
+def _opt(ty: Type[_T], thing: Any) -> Optional[_T]:
+    return None if thing is None else _req(ty, thing)
+
+
+def _position(thing: Any) -> _Position:
+    if (
+        isinstance(thing, dict)
+        and type(line := thing.get("line")) is int
+        and type(character := thing.get("character")) is int
+    ):
+        return _Position(line=line, character=character)
+    else:
+        raise _Irregular()
+
+
+def _range(thing: Any) -> _Range:
+    if isinstance(thing, dict):
+        start, end = _position(thing.get("start")), _position(thing.get("end"))
+        return _Range(start=start, end=end)
+    else:
+        raise _Irregular()
+
+
+def _plain_edit(thing: Any) -> TextEdit:
+    if isinstance(thing, dict):
+        return TextEdit(
+            newText=_req(str, thing.get("newText")), range=_range(thing.get("range"))
+        )
+    else:
+        raise _Irregular()
+
+
+def _text_edit(thing: Any) -> Union[TextEditNonStandard, TextEdit, InsertReplaceEdit]:
+    if not isinstance(thing, dict):
+        raise _Irregular()
+    elif isinstance(new_text := thing.get("newText"), str):
+        if "range" in thing:
+            return _plain_edit(thing)
+        else:
+            return InsertReplaceEdit(
+                newText=new_text,
+                insert=_range(thing.get("insert")),
+                replace=_range(thing.get("replace")),
+            )
+    elif isinstance(new_text := thing.get("new_text"), str):
+        rg = _range(thing)
+        return TextEditNonStandard(new_text=new_text, start=rg.start, end=rg.end)
+    else:
+        raise _Irregular()
+
+
+def _shallow(item: Mapping) -> Optional[CompletionItem]:
+    """
+    Hand rolled decoding of the usual item shape, as unpacked from msgpack
+
+    `None` for anything unusual, to go through the full decoder instead
+
+    Leaves out what is unused until accepted, `command` stays raw in `ExternLSP`,
+    only its shape is checked
+    """
+
+    try:
+        label = _req(str, item.get("label"))
+
+        label_details: Optional[_CompletionItemLabelDetails] = None
+        if (details := item.get("labelDetails")) is None:
+            pass
+        elif isinstance(details, dict):
+            label_details = _CompletionItemLabelDetails(
+                detail=_opt(str, details.get("detail")),
+                description=_opt(str, details.get("description")),
+            )
+        else:
+            raise _Irregular()
+
+        if isinstance(doc := item.get("documentation"), dict):
+            documentation: Union[str, MarkupContent, None] = MarkupContent(
+                kind=_req(str, doc.get("kind")), value=_req(str, doc.get("value"))
+            )
+        else:
+            documentation = _opt(str, doc)
+
+        additional_edits: Optional[Sequence[TextEdit]] = None
+        if (additional := item.get("additionalTextEdits")) is None:
+            pass
+        elif isinstance(additional, (list, tuple)):
+            additional_edits = tuple(map(_plain_edit, additional))
+        else:
+            raise _Irregular()
+
+        if (command := item.get("command")) is None:
+            pass
+        elif isinstance(command, dict):
+            _req(str, command.get("title"))
+            _req(str, command.get("command"))
+        else:
+            raise _Irregular()
+
+        text_edit = item.get("textEdit")
+
+        return CompletionItem(
+            label=label,
+            labelDetails=label_details,
+            kind=_opt(int, item.get("kind")),
+            detail=_opt(str, item.get("detail")),
+            documentation=documentation,
+            preselect=_opt(bool, item.get("preselect")),
+            filterText=_opt(str, item.get("filterText")),
+            insertText=_opt(str, item.get("insertText")),
+            insertTextFormat=_opt(int, item.get("insertTextFormat")),
+            insertTextMode=_opt(int, item.get("insertTextMode")),
+            textEdit=None if text_edit is None else _text_edit(text_edit),
+            additionalTextEdits=additional_edits,
+        )
+    except _Irregular:
+        return None
+
+
 def _with_defaults(defaults: ItemDefaults, item: Any) -> Any:
     if not isinstance(item, MutableMapping):
         pass
@@ -235,7 +372,11 @@ def parse_item(
     if not item:
         return None
     else:
-        go, parsed = _item_parser(item)
+        if isinstance(item, dict) and (shallow := _shallow(item)):
+            go, parsed = True, shallow
+        else:
+            go, parsed = _item_parser(item)
+
         if not go:
             log.warning("%s -> %s", client, parsed)
             return None
@@ -265,7 +406,7 @@ def parse_item(
             kind = protocol.CompletionItemKind.get(item.get("kind"), "")
             doc = _doc(parsed)
             extern = extern_type(
-                inline=False, client=client, item=item, command=parsed.command
+                inline=False, client=client, item=item, command=item.get("command")
             )
 
             comp = Completion(
@@ -317,7 +458,7 @@ def parse_inline_item(
             line, *_ = p_edit.new_text.splitlines()
             sort_by = parsed.filterText or line
             extern = extern_type(
-                inline=True, client=client, item=item, command=parsed.command
+                inline=True, client=client, item=item, command=item.get("command")
             )
             label = line.strip()
             kind = isinstance(p_edit, SnippetEdit) and "Snippet" or "Text"
@@ -1,16 +1,25 @@
+from pynvim_pp.logging import log
+from std2.pickle.decoder import new_decoder
 from std2.pickle.encoder import new_encoder
+from std2.pickle.types import DecodeError
 
 from ...shared.types import ExternLSP, ExternLUA
 from ..types import Command
 from .request import async_request
 
+_DECODER = new_decoder[Command](Command, strict=False)
 _ENCODER = new_encoder[Command](Command)
 
 
 async def cmd(extern: ExternLSP) -> None:
     if extern.command:
         name = "lsp_third_party_cmd" if isinstance(extern, ExternLUA) else "lsp_command"
-        command = _ENCODER(extern.command)
+        # kept raw until accepted
+        try:
+            command = _ENCODER(_DECODER(extern.command))
+        except DecodeError as e:
+            log.warning("%s", e)
+            return
 
         clients = {extern.client} if extern.client else set()
         async for _ in async_request(name, None, clients, command):
@@ -1,6 +1,7 @@
 from datetime import timedelta
 from typing import AbstractSet, AsyncIterator, Optional, Tuple, cast
 
+from ...shared.parse import lower
 from ...shared.types import Context, ExternLSP, ExternLUA
 from ..parse import parse, parse_inline
 from ..protocol import protocol
@@ -17,10 +18,17 @@ async def comp_lsp(
     context: Context,
     chunk: int,
     clients: AbstractSet[str],
+    prefilter: bool,
 ) -> AsyncIterator[_Rsp]:
     pc = await protocol()
+    # `string.lower` in lua is ASCII only
+    spec = (
+        {"prefix": lower(context.words_before), "cap": chunk}
+        if prefilter and context.words_before.isascii()
+        else None
+    )
 
-    async for client in async_request("lsp_comp", chunk, clients, context.cursor):
+    async for client in async_request("lsp_comp", chunk, clients, context.cursor, spec):
         resp = cast(CompletionResponse, client.message)
         parsed = parse(
             pc,
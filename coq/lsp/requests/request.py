@@ -86,22 +86,27 @@ def _events(_: str) -> Tuple[AbstractEventLoop, ALock, Event]:
 async def _lsp_pull(
     n: int, name: str, client: Optional[str], uid: int
 ) -> AsyncIterator[Sequence[Any]]:
+    """
+    Pages can come up short, prefiltered items are sent ahead on their own
+
+    An empty page ends the pull, it would only be asked for again
+    """
+
     lo = 1
-    hi = n
     while True:
-        part: Sequence[Any] = await Nvim.api.exec_lua(
+        part, more = await Nvim.api.exec_lua(
             tuple,
             f"return {NAMESPACE}.lsp_pull(...)",
-            (client, name, uid, lo, hi),
+            (client, name, uid, lo, lo + n - 1),
         )
-        lo = hi + 1
-        hi = hi + n
-        length = hi - lo + 1
-
         assert isinstance(part, Sequence)
+        if not part:
+            break
+        lo += len(part)
+
         yield part
         await sleep(0)
-        if len(part) < length:
+        if not more:
             break
 
 
@@ -10,17 +10,20 @@ from typing import (
     Union,
 )
 
+from ..shared.slots import slotted
 from ..shared.types import Completion
 
 # https://microsoft.github.io/language-server-protocol/specification
 
 
+@slotted
 @dataclass(frozen=True)
 class _CompletionItemLabelDetails:
     detail: Optional[str] = None
     description: Optional[str] = None
 
 
+@slotted
 @dataclass(frozen=True)
 class _Position:
     line: int
@@ -32,6 +35,7 @@ class _TextEdit:
     newText: str
 
 
+@slotted
 @dataclass(frozen=True)
 class _Range:
     start: _Position
@@ -44,11 +48,13 @@ class _InsertReplaceRange:
     replace: _Range
 
 
+@slotted
 @dataclass(frozen=True)
 class TextEdit(_TextEdit):
     range: _Range
 
 
+@slotted
 @dataclass(frozen=True)
 class TextEditNonStandard(_Range):
     new_text: str
@@ -61,6 +67,7 @@ class InsertReplaceEdit(_TextEdit, _InsertReplaceRange): ...
 _CompletionItemKind = int
 
 
+@slotted
 @dataclass(frozen=True)
 class MarkupContent:
     kind: Union[Literal["plaintext", "markdown"], str]
@@ -79,6 +86,7 @@ class Command:
     arguments: Optional[Any] = None
 
 
+@slotted
 @dataclass(frozen=True)
 class CompletionItem:
     label: str
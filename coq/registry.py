@@ -4,6 +4,8 @@ from pynvim_pp.atomic import Atomic
 from pynvim_pp.autocmd import AutoCMD
 from pynvim_pp.handler import RPC
 
+from .shared.batch import AutoBatch
+
 NAMESPACE = "COQ"
 
 
@@ -13,4 +15,5 @@ def _name_gen(fn: Callable[..., Awaitable[Any]]) -> str:
 
 autocmd = AutoCMD()
 atomic = Atomic()
+batch = AutoBatch()
 rpc = RPC(NAMESPACE, name_gen=_name_gen)
@@ -657,7 +657,7 @@ async def edit(
         )
 
         if not synthetic:
-            stack.idb.inserted(metric.instance.bytes, sort_by=metric.comp.sort_by)
+            stack.reviewer.inserted(metric.instance, sort_by=metric.comp.sort_by)
 
         m_shift = await apply(buf=buf, instructions=parsed.instructions)
         if inserted:
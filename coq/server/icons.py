@@ -1,34 +1,46 @@
-from dataclasses import replace
+from typing import Optional
 
 from std2.types import never
 
 from ..shared.settings import IconMode, Icons
+from ..shared.slots import evolve
 from ..shared.types import Completion
 
 
+def _icon(icons: Icons, completion: Completion) -> Optional[str]:
+    if not completion.icon_match or icons.mode is IconMode.none:
+        return None
+    else:
+        alias = icons.aliases.get(completion.icon_match) or completion.icon_match
+        return icons.mappings.get(alias) or None
+
+
+def has_kind(icons: Icons, completion: Completion) -> bool:
+    """
+    `bool(iconify(icons, completion).kind)`, without building the new kind
+    """
+
+    return completion.kind != "" or _icon(icons, completion=completion) is not None
+
+
 def iconify(icons: Icons, completion: Completion) -> Completion:
-    if not completion.icon_match:
+    if not (kind := _icon(icons, completion=completion)):
         return completion
+
+    elif icons.mode is IconMode.short:
+        return evolve(completion, kind=kind + (icons.spacing - 1) * " ")
+
+    elif icons.mode is IconMode.long:
+        spc = max(1, icons.spacing) * " "
+        new_kind = (
+            f"{kind}{spc}{completion.kind}"
+            if completion.kind
+            else kind + (icons.spacing - 1) * " "
+        )
+        return evolve(completion, kind=new_kind)
+
+    elif icons.mode is IconMode.none:
+        return completion
+
     else:
-        alias = icons.aliases.get(completion.icon_match) or completion.icon_match
-        kind = icons.mappings.get(alias)
-        if not kind:
-            return completion
-        else:
-            if icons.mode is IconMode.none:
-                return completion
-
-            elif icons.mode is IconMode.short:
-                return replace(completion, kind=kind + (icons.spacing - 1) * " ")
-
-            elif icons.mode is IconMode.long:
-                spc = max(1, icons.spacing) * " "
-                new_kind = (
-                    f"{kind}{spc}{completion.kind}"
-                    if completion.kind
-                    else kind + (icons.spacing - 1) * " "
-                )
-                return replace(completion, kind=new_kind)
-
-            else:
-                never(icons.mode)
+        never(icons.mode)
@@ -0,0 +1,108 @@
+from collections import Counter
+from types import MappingProxyType
+from typing import AbstractSet, Mapping, MutableMapping, MutableSequence, Sequence
+
+from ..shared.parse import coalesce
+
+
+class Proximity:
+    """
+    Word counts over the lines around the cursor
+
+    Kept row by row: buffer edits are applied as they come in, and as the window
+    moves only rows that enter / leave it are (un)tokenized
+    """
+
+    def __init__(self, unifying_chars: AbstractSet[str]) -> None:
+        self._unifying_chars = unifying_chars
+        self._buf_id = -1
+        # buffer row of `self._rows[0]`
+        self._lo = 0
+        self._rows: MutableSequence[str] = []
+        self._lines: Counter[str] = Counter()
+        self._tokens: MutableMapping[str, Counter[str]] = {}
+        self._words: Counter[str] = Counter()
+        self._view = MappingProxyType(self._words)
+
+    def _add(self, line: str) -> None:
+        if (tokens := self._tokens.get(line)) is None:
+            words = coalesce(
+                self._unifying_chars, include_syms=True, backwards=None, chars=line
+            )
+            tokens = self._tokens[line] = Counter(words)
+        self._lines[line] += 1
+        self._words.update(tokens)
+
+    def _remove(self, line: str) -> None:
+        if (n := self._lines[line] - 1) > 0:
+            self._lines[line] = n
+            tokens = self._tokens[line]
+        else:
+            self._lines.pop(line)
+            tokens = self._tokens.pop(line)
+        for word, count in tokens.items():
+            if (left := self._words[word] - count) > 0:
+                self._words[word] = left
+            else:
+                self._words.pop(word, None)
+
+    def _splice(self, lo: int, hi: int, lines: Sequence[str]) -> None:
+        """
+        `self._rows[lo:hi] = lines`
+        """
+
+        for line in self._rows[lo:hi]:
+            self._remove(line)
+        for line in lines:
+            self._add(line)
+        self._rows[lo:hi] = lines
+
+    def changed(self, buf_id: int, lo: int, hi: int, lines: Sequence[str]) -> None:
+        """
+        Buffer rows `lo:hi` replaced by `lines`, as in `nvim_buf_lines_event`
+        """
+
+        if buf_id != self._buf_id:
+            return
+
+        w_lo, w_hi = self._lo, self._lo + len(self._rows)
+        if hi <= w_lo:
+            self._lo += len(lines) - (hi - lo)
+        elif lo >= w_hi:
+            pass
+        else:
+            self._splice(max(lo - w_lo, 0), min(hi, w_hi) - w_lo, lines=lines)
+            self._lo = min(lo, w_lo)
+
+    def update(
+        self, buf_id: int, lo: int, lines: Sequence[str], verify: bool
+    ) -> Mapping[str, int]:
+        """
+        The window now starts at row `lo`
+
+        Rows kept from before are trusted to be up to date with `changed()`,
+        unless `verify`
+
+        -> a read only view, it changes along with the window
+        """
+
+        if buf_id != self._buf_id:
+            self._buf_id = buf_id
+            self._splice(0, len(self._rows), lines=())
+
+        hi, w_lo, w_hi = lo + len(lines), self._lo, self._lo + len(self._rows)
+        if hi <= w_lo or lo >= w_hi:
+            self._splice(0, len(self._rows), lines=lines)
+        else:
+            # tail first, so rows stay indexed from `w_lo`
+            tail = min(hi, w_hi)
+            self._splice(tail - w_lo, len(self._rows), lines=lines[tail - lo :])
+            head = max(lo, w_lo)
+            self._splice(0, head - w_lo, lines=lines[: head - lo])
+            if verify:
+                for idx, line in enumerate(lines):
+                    if self._rows[idx] != line:
+                        self._splice(idx, idx + 1, lines=(line,))
+
+        self._lo = lo
+        return self._view
@@ -0,0 +1,78 @@
+from contextlib import suppress
+from json import JSONDecodeError, dumps, loads
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Any, Mapping, MutableMapping, Optional
+
+from ..shared.types import UTF8
+
+
+class Recency:
+    """
+    Exponentially decaying insertion counts, bounded to `capacity` words
+
+    Instead of decaying every entry on insert, each new insert is worth
+    `growth ** tick`. Only the ratios matter for ranking, so scores get
+    rescaled once they grow too large
+
+    Persisted to `path` on `dump()`
+    """
+
+    def __init__(
+        self, capacity: int, half_life: float, path: Optional[Path] = None
+    ) -> None:
+        self._capacity, self._path = capacity, path
+        self._growth = 2 ** (1 / half_life)
+        self._bump = 1.0
+        self._scores: MutableMapping[str, float] = {}
+        self._snapshot: Mapping[str, float] = {}
+        self._dirty = False
+
+        if path:
+            with suppress(
+                OSError, JSONDecodeError, AttributeError, TypeError, ValueError
+            ):
+                self._load(loads(path.read_text(encoding=UTF8)))
+
+    def _load(self, json: Mapping[str, Any]) -> None:
+        scores = {str(word): float(score) for word, score in json.items()}
+        hottest = sorted(scores, key=scores.__getitem__)[-self._capacity :]
+        self._scores = {word: scores[word] for word in hottest}
+        self._snapshot = {**self._scores}
+
+    def _rescale(self) -> None:
+        bump = self._bump
+        for word, score in self._scores.items():
+            self._scores[word] = score / bump
+        self._bump = 1.0
+
+    def inserted(self, sort_by: str) -> None:
+        self._bump *= self._growth
+        if self._bump > 1e99:
+            self._rescale()
+
+        self._scores[sort_by] = self._scores.get(sort_by, 0) + self._bump
+        if len(self._scores) > self._capacity:
+            coldest = min(self._scores, key=self._scores.__getitem__)
+            self._scores.pop(coldest)
+        self._snapshot = {**self._scores}
+        self._dirty = True
+
+    def dump(self) -> None:
+        if self._path and self._dirty:
+            self._rescale()
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            with NamedTemporaryFile(
+                dir=self._path.parent, mode="w", encoding=UTF8, delete=False
+            ) as fd:
+                fd.write(dumps(self._scores, check_circular=False))
+            Path(fd.name).replace(self._path)
+            self._dirty = False
+
+    @property
+    def scores(self) -> Mapping[str, float]:
+        """
+        A copy, read from worker threads
+        """
+
+        return self._snapshot
@@ -3,7 +3,6 @@ from asyncio.tasks import create_task
 from contextlib import suppress
 from time import monotonic
 from typing import Mapping, Optional, Sequence, Tuple, cast
-from uuid import uuid4
 
 from pynvim_pp.atomic import Atomic
 from pynvim_pp.buffer import Buffer
@@ -18,6 +17,7 @@ from ...clients.buffers.worker import Worker as BufWorker
 from ...registry import NAMESPACE, atomic, autocmd, rpc
 from ...shared.timeit import timeit
 from ...shared.types import ChangeEvent
+from ...shared.uids import new_uid
 from ..rt_types import Stack
 from ..state import state
 from .omnifunc import comp_func
@@ -27,7 +27,7 @@ _die = Cancellation()
 
 @rpc()
 async def _buf_enter(stack: Stack) -> None:
-    state(commit_id=uuid4())
+    state(commit_id=new_uid())
     win = await Window.get_current()
     buf = await win.get_buf()
     listed = await buf.opts.get(bool, "buflisted")
@@ -75,13 +75,15 @@ async def _status() -> Tuple[str, str]:
 @rpc(name="nvim_buf_lines_event")
 async def _lines_event(
     stack: Stack,
-    _: Buffer,
+    buf: Buffer,
     change_tick: Optional[int],
     lo: int,
     hi: int,
     lines: Sequence[str],
     pending: bool,
 ) -> None:
+    stack.reviewer.changed(buf.number, lo=lo, hi=hi, lines=lines)
+
     if change_tick is not None:
         t0 = monotonic()
 
@@ -93,7 +95,7 @@ async def _lines_event(
                         _status(), stack.supervisor.interrupt()
                     )
 
-                    s = state(change_id=uuid4())
+                    s = state(change_id=new_uid())
 
                     if (
                         stack.settings.completion.always
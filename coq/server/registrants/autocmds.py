@@ -16,7 +16,8 @@ from ...clients.tags.worker import Worker as TagsWorker
 from ...clients.tmux.worker import Worker as TmuxWorker
 from ...clients.tree_sitter.worker import Worker as TSWorker
 from ...lang import LANG
-from ...registry import NAMESPACE, atomic, autocmd, rpc
+from ...registry import NAMESPACE, atomic, autocmd, batch, rpc
+from ...shared.garbage import catch_up
 from ..context import context
 from ..rt_types import Stack
 from ..state import state
@@ -54,8 +55,11 @@ async def _ft_changed(stack: Stack) -> None:
     for worker in stack.workers:
         if isinstance(worker, BufWorker):
             buf = await Buffer.get_current()
-            ft = await buf.filetype()
-            filename = await buf.get_name() or ""
+            ft, name = await gather(
+                batch.get_option_value(str, "filetype", {"buf": buf.number}),
+                batch.buf_get_name(str, buf),
+            )
+            filename = name or ""
             create_task(worker.buf_update(buf.number, filetype=ft, filename=filename))
             break
 
@@ -105,6 +109,9 @@ async def _when_idle(stack: Stack) -> None:
     @_die
     async def cont() -> None:
         await sleep(stack.settings.limits.idle_timeout)
+        stack.idb.compact()
+        stack.reviewer.dump()
+        catch_up()
         with suppress(NvimError):
             buf = await Buffer.get_current()
             buf_type = await buf.opts.get(str, "buftype")
@@ -130,6 +137,16 @@ async def _when_idle(stack: Stack) -> None:
 _ = autocmd("CursorHold", "CursorHoldI") << f"lua {NAMESPACE}.{_when_idle.method}()"
 
 
+# blocking, or nvim can exit before the flush lands
+@rpc(blocking=True)
+async def _on_leave(stack: Stack) -> None:
+    stack.idb.flush()
+    stack.reviewer.dump()
+
+
+_ = autocmd("VimLeavePre") << f"lua {NAMESPACE}.{_on_leave.method}()"
+
+
 @rpc()
 async def _on_yank(stack: Stack, regsize: int, operator: str, regname: str) -> None:
     if operator == "y":
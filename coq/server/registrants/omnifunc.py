@@ -1,5 +1,4 @@
 from asyncio import create_task, gather, sleep
-from dataclasses import replace
 from time import monotonic
 from typing import AbstractSet, Any, Literal, Mapping, Optional, Sequence, Union
 from uuid import UUID, uuid4
@@ -17,7 +16,10 @@ from ...lsp.requests.command import cmd
 from ...lsp.requests.resolve import resolve
 from ...registry import NAMESPACE, autocmd, rpc
 from ...shared.aio import with_timeout
+from ...shared.perf import record
 from ...shared.runtime import Metric
+from ...shared.slots import evolve
+from ...shared.timeit import timeit
 from ...shared.types import ChangeEvent, Context, ExternLSP, ExternPath
 from ..completions import complete
 from ..context import context
@@ -51,9 +53,10 @@ async def comp_func(
     stack: Stack, s: State, change: Optional[ChangeEvent], t0: float, manual: bool
 ) -> None:
     with suppress_and_log():
-        ctx = await context(
-            options=stack.settings.match, state=s, change=change, manual=manual
-        )
+        with timeit("CONTEXT"):
+            ctx = await context(
+                options=stack.settings.match, state=s, change=change, manual=manual
+            )
         should = (
             _should_cont(
                 s,
@@ -78,18 +81,21 @@ async def comp_func(
             )
             s = state()
             if s.change_id == ctx.change_id:
-                vim_comps = tuple(
-                    trans(
-                        stack,
-                        pum_width=s.pum_width,
-                        context=ctx,
-                        metrics=metrics,
+                with timeit("RANK"):
+                    vim_comps = tuple(
+                        trans(
+                            stack,
+                            pum_width=s.pum_width,
+                            context=ctx,
+                            metrics=metrics,
+                        )
                     )
-                )
-                await complete(stack=stack, col=col, comps=vim_comps)
+                with timeit("SEND COMP"):
+                    await complete(stack=stack, col=col, comps=vim_comps)
+
+                delta = monotonic() - t0
+                record("KEYSTROKE", seconds=delta)
                 if DEBUG:
-                    t1 = monotonic()
-                    delta = t1 - t0
                     msg = f"TOTAL >>> {si_prefixed_smol(delta, precision=0)}s".ljust(8)
                     log.info("%s", msg)
         else:
@@ -112,18 +118,18 @@ async def omnifunc(
 
 async def _resolve(stack: Stack, metric: Metric) -> Metric:
     if comp := stack.lru.get(metric.comp.uid):
-        return replace(
+        return evolve(
             metric,
-            comp=replace(metric.comp, secondary_edits=comp.secondary_edits),
+            comp=evolve(metric.comp, secondary_edits=comp.secondary_edits),
         )
     elif not isinstance((extern := metric.comp.extern), ExternLSP) or extern.inline:
         return metric
     elif comp := await with_timeout(
         stack.settings.clients.lsp.resolve_timeout, co=resolve(extern=extern)
     ):
-        return replace(
+        return evolve(
             metric,
-            comp=replace(metric.comp, secondary_edits=comp.secondary_edits),
+            comp=evolve(metric.comp, secondary_edits=comp.secondary_edits),
         )
 
     else:
@@ -0,0 +1,79 @@
+from asyncio import create_task, sleep
+from itertools import chain
+from typing import Iterator, Sequence
+from uuid import uuid4
+
+from pynvim_pp.buffer import Buffer
+from pynvim_pp.float_win import list_floatwins, open_float_win
+from pynvim_pp.lib import display_width
+from pynvim_pp.rpc_types import NvimError
+from std2.asyncio import Cancellation
+from std2.locale import si_prefixed_smol
+
+from ...registry import rpc
+from ...shared.perf import snapshot
+from ..rt_types import Stack
+
+_REFRESH = 1.0
+_QUANTILES = (0.5, 0.95, 0.99)
+_HEADERS = ("", "Count", "P50", "P95", "P99")
+_H_SEP = " | "
+
+_NS = uuid4()
+_die = Cancellation()
+
+
+def _lines() -> Iterator[str]:
+    rows = [
+        (
+            name,
+            str(sketch.count),
+            *(
+                f"{si_prefixed_smol(sketch.quantile(q), precision=0)}s"
+                for q in _QUANTILES
+            ),
+        )
+        for name, sketch in sorted(snapshot().items())
+    ]
+    justs = [
+        max(display_width(cell, tabsize=2) for cell in col)
+        for col in zip(*chain((_HEADERS,), rows))
+    ]
+
+    def cont(row: Sequence[str]) -> str:
+        cells = (cell.ljust(just) for cell, just in zip(row, justs))
+        return _H_SEP.join(cells).rstrip()
+
+    yield cont(_HEADERS)
+    yield "─" * sum(chain(justs, (len(_H_SEP) * (len(justs) - 1),)))
+    yield from map(cont, rows)
+
+
+async def _render(buf: Buffer) -> None:
+    await buf.opts.set("modifiable", val=True)
+    await buf.set_lines([*_lines()])
+    await buf.opts.set("modifiable", val=False)
+
+
+@rpc()
+async def perf(stack: Stack, *_: str) -> None:
+    async for win in list_floatwins(_NS):
+        await win.close()
+    buf = await Buffer.create(
+        listed=False, scratch=True, wipe=True, nofile=True, noswap=True
+    )
+    await _render(buf)
+    await open_float_win(_NS, margin=0, relsize=0.95, buf=buf, border="rounded")
+
+    @_die
+    async def cont() -> None:
+        while True:
+            await sleep(_REFRESH)
+            if not [win async for win in list_floatwins(_NS)]:
+                break
+            try:
+                await _render(buf)
+            except NvimError:
+                break
+
+    create_task(cont())
@@ -1,4 +1,4 @@
-from asyncio import create_task
+from asyncio import create_task, gather
 from contextlib import suppress
 from dataclasses import dataclass, replace
 from functools import lru_cache
@@ -27,7 +27,7 @@ from std2.string import removeprefix
 
 from ...lsp.requests.resolve import resolve
 from ...paths.show import show
-from ...registry import NAMESPACE, autocmd, rpc
+from ...registry import NAMESPACE, autocmd, batch, rpc
 from ...shared.aio import with_timeout
 from ...shared.settings import GhostText, PreviewDisplay
 from ...shared.timeit import timeit
@@ -285,9 +285,10 @@ async def _virt_text(
         supports_vlines = await Nvim.api.has("nvim-0.8")
 
         ns = await Nvim.create_namespace(_NS)
-        win = await Window.get_current()
-        buf = await win.get_buf()
-        row, col = await win.get_cursor()
+        buf, (r, col) = await gather(
+            batch.get_current_buf(Buffer), batch.win_get_cursor(tuple, 0)
+        )
+        row = r - 1
         parsed = await parse(
             buf,
             stack=stack,
@@ -407,8 +408,10 @@ def _escaped() -> Awaitable[str]:
 async def preview_preview(stack: Stack, *_: str) -> str:
     if win := await anext(list_floatwins(_FLOAT_WIN_UUID), None):
         buf = await win.get_buf()
-        syntax = await buf.opts.get(str, "syntax")
-        lines = await buf.get_lines()
+        syntax, lines = await gather(
+            batch.get_option_value(str, "syntax", {"buf": buf.number}),
+            batch.buf_get_lines(tuple, buf, 0, -1, True),
+        )
         await Nvim.exec("stopinsert")
 
         async def cont() -> None:
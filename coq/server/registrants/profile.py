@@ -0,0 +1,64 @@
+from argparse import ArgumentTypeError
+from datetime import datetime
+from math import isfinite
+from typing import Optional, Sequence
+
+from pynvim_pp.nvim import Nvim
+from std2.argparse import ArgparseError, ArgParser
+
+from ...lang import LANG
+from ...registry import rpc
+from ...shared.profiler import Sampler
+from ..rt_types import Stack
+
+_SAMPLER: Optional[Sampler] = None
+
+
+def _rate(arg: str) -> float:
+    rate = float(arg)
+    if isfinite(rate) and rate > 0:
+        return rate
+    else:
+        raise ArgumentTypeError(f"rate must be a positive number of Hz, not {arg}")
+
+
+def _parse_args(args: Sequence[str]) -> Optional[float]:
+    parser = ArgParser()
+    parser.add_argument(
+        "action",
+        nargs="?",
+        choices=("start", "stop"),
+        default="stop" if _SAMPLER else "start",
+    )
+    parser.add_argument("-r", "--rate", type=_rate, default=99.0)
+    ns = parser.parse_args(args)
+    return ns.rate if ns.action == "start" else None
+
+
+@rpc()
+async def profile(stack: Stack, args: Sequence[str]) -> None:
+    global _SAMPLER
+
+    try:
+        rate = _parse_args(args)
+    except ArgparseError as e:
+        await Nvim.write(e, error=True)
+    else:
+        if rate is not None:
+            if _SAMPLER:
+                # restarting would throw away what was sampled so far
+                await Nvim.write(LANG("profile running"), error=True)
+                return
+            _SAMPLER = Sampler(rate=rate)
+            _SAMPLER.start()
+            await Nvim.write(LANG("profile begin", rate=rate))
+        elif sampler := _SAMPLER:
+            _SAMPLER = None
+            folded = sampler.stop()
+
+            profiles = stack.supervisor.vars_dir / "profiles"
+            profiles.mkdir(parents=True, exist_ok=True)
+            name = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+            path = profiles / f"{name}.folded"
+            path.write_text(folded)
+            await Nvim.write(LANG("profile end", path=str(path)))
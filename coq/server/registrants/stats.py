@@ -1,19 +1,25 @@
+from asyncio import gather
 from itertools import chain
 from locale import strxfrm
 from os import linesep
 from string import Template
-from typing import Iterable, Iterator, Mapping, Sequence, Tuple
+from typing import Iterable, Iterator, Mapping, MutableMapping, Sequence, Tuple
 from uuid import uuid4
 
 from pynvim_pp.buffer import Buffer
 from pynvim_pp.float_win import list_floatwins, open_float_win
 from pynvim_pp.lib import display_width
-from std2.locale import si_prefixed_smol
+from std2.locale import si_prefixed, si_prefixed_smol
 
+from ...clients.inline.worker import Worker as InlineWorker
+from ...clients.lsp.worker import Worker as LspWorker
 from ...consts import MD_STATS
 from ...databases.insertions.database import Statistics
 from ...lang import LANG
 from ...registry import rpc
+from ...shared.memory import sizeof
+from ...shared.perf import snapshot
+from ...shared.sketch import Sketch
 from ..rt_types import Stack
 
 _TAB_SIZE = 2
@@ -29,11 +35,26 @@ ${{chart2}}
 
 ${{chart3}}
 
+${{chart4}}
+
+${{chart5}}
+
+${{chart6}}
+
+${{chart7}}
+
 ${{desc}}
 """.lstrip()
 
 _NS = uuid4()
 
+_CONTENTION = (
+    ("LOCK WAIT -- ", "Lock Wait", (0.5, 0.99)),
+    ("LOCK HOLD -- ", "Lock Hold", (0.5, 0.99)),
+    ("QUEUE WAIT -- coq-", "Queue Wait", (0.5, 0.99)),
+    ("QUEUE DEPTH -- coq-", "Queue Depth", (0.99,)),
+)
+
 
 def _table(headers: Sequence[str], rows: Mapping[str, Mapping[str, str]]) -> str:
     s_rows = sorted(rows.keys(), key=strxfrm)
@@ -80,6 +101,7 @@ def _trans(stat: Statistics) -> Iterator[Tuple[str, Mapping[str, str]]]:
     stat.interrupted
     m1 = {
         "Interrupted": str(stat.interrupted),
+        "Over Budget": str(stat.exceeded),
         "Inserted": str(stat.inserted),
     }
     yield stat.source, m1
@@ -94,16 +116,24 @@ def _trans(stat: Statistics) -> Iterator[Tuple[str, Mapping[str, str]]]:
     yield stat.source, m2
 
     m3 = {
+        "Avg CPU": f"{si_prefixed_smol(stat.avg_cpu, precision=0)}s",
+        "Q50 CPU": f"{si_prefixed_smol(stat.q50_cpu, precision=0)}s",
+        "Q95 CPU": f"{si_prefixed_smol(stat.q95_cpu, precision=0)}s",
+        "Q99 CPU": f"{si_prefixed_smol(stat.q99_cpu, precision=0)}s",
+    }
+    yield stat.source, m3
+
+    m4 = {
         "Avg Items": str(round(stat.avg_items)),
         "Q50 Items": str(stat.q50_items),
         "Q99 Items": str(stat.q99_items),
     }
-    yield stat.source, m3
+    yield stat.source, m4
 
 
 def _pprn(stats: Iterable[Statistics]) -> Iterator[str]:
     if not stats:
-        yield from ("", "", "")
+        yield from ("", "", "", "")
     else:
         for acc in zip(*map(_trans, stats)):
             rows = {k: v for k, v in acc}
@@ -112,14 +142,101 @@ def _pprn(stats: Iterable[Statistics]) -> Iterator[str]:
             yield table
 
 
+def _fmt(header: str, sketch: Sketch, q: float) -> str:
+    val = sketch.quantile(q)
+    if header == "Queue Depth":
+        return str(round(val))
+    else:
+        return f"{si_prefixed_smol(val, precision=0)}s"
+
+
+def _contention() -> str:
+    """
+    Per source locks & executor queues, to spot head of line blocking
+    """
+
+    rows: MutableMapping[str, MutableMapping[str, str]] = {}
+    for name, sketch in snapshot().items():
+        for prefix, header, quantiles in _CONTENTION:
+            if name.startswith(prefix):
+                row = rows.setdefault(name[len(prefix) :], {})
+                for q in quantiles:
+                    row[f"Q{round(q * 100)} {header}"] = _fmt(header, sketch, q)
+
+    headers = tuple(
+        f"Q{round(q * 100)} {header}"
+        for _, header, quantiles in _CONTENTION
+        for q in quantiles
+    )
+    return _table(headers, rows=rows) if rows else ""
+
+
+def _bytes(size: int) -> str:
+    return f"{si_prefixed(size, precision=1)}B"
+
+
+async def _memory(stack: Stack) -> str:
+    """
+    SQLite pages & approximate python objects, per source
+    """
+
+    workers = tuple(stack.workers)
+    usages = await gather(*(worker.memory() for worker in workers))
+
+    rows: MutableMapping[str, MutableMapping[str, str]] = {}
+    for worker, usage in zip(workers, usages):
+        budget = worker._options.memory_budget
+        if usage or budget is not None:
+            row = rows.setdefault(worker._options.short_name, {})
+            for kind, size in usage.items():
+                row[kind] = _bytes(size)
+            if budget is not None:
+                row["Budget"] = _bytes(budget)
+
+    rows["(insertions)"] = {"SQLite": _bytes(stack.idb.usage())}
+    rows["(preview)"] = {"Python": _bytes(sizeof(stack.lru))}
+    return _table(("SQLite", "Python", "Budget"), rows=rows)
+
+
+def _caches(stack: Stack) -> str:
+    rows: MutableMapping[str, Mapping[str, str]] = {}
+    for worker in stack.workers:
+        if isinstance(worker, (LspWorker, InlineWorker)):
+            cache = worker.cache_stats()
+            lookups = cache.hits + cache.misses
+            rows[worker._options.short_name] = {
+                "Hits": str(cache.hits),
+                "Misses": str(cache.misses),
+                "Hit Rate": f"{cache.hits / lookups:.0%}" if lookups else "",
+                "Entries": str(cache.entries),
+                "Size": _bytes(cache.size),
+                "Evicted": str(cache.evicted),
+            }
+
+    headers = ("Hits", "Misses", "Hit Rate", "Entries", "Size", "Evicted")
+    return _table(headers, rows=rows) if rows else ""
+
+
 @rpc()
 async def stats(stack: Stack, *_: str) -> None:
     stats = stack.idb.stats()
-    chart1, chart2, chart3 = _pprn(stats)
+    chart1, chart2, chart3, chart4 = _pprn(stats)
+    chart5 = _contention()
+    chart6 = await _memory(stack)
+    chart7 = _caches(stack)
     desc = MD_STATS.read_text()
     lines = (
         Template(_TPL)
-        .substitute(chart1=chart1, chart2=chart2, chart3=chart3, desc=desc)
+        .substitute(
+            chart1=chart1,
+            chart2=chart2,
+            chart3=chart3,
+            chart4=chart4,
+            chart5=chart5,
+            chart6=chart6,
+            chart7=chart7,
+            desc=desc,
+        )
         .splitlines()
     )
     async for win in list_floatwins(_NS):
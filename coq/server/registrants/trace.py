@@ -0,0 +1,56 @@
+from datetime import datetime
+from json import dumps
+from typing import Any, Mapping, Sequence, cast
+
+from pynvim_pp.nvim import Nvim
+from pynvim_pp.types import NoneType
+from std2.argparse import ArgparseError, ArgParser
+
+from ...lang import LANG
+from ...registry import NAMESPACE, rpc
+from ...shared import trace as tracer
+from ..rt_types import Stack
+
+_DRAIN_MARKS = f"""
+local marks = {NAMESPACE}.trace_marks or {{}}
+{NAMESPACE}.trace_marks = nil
+return marks
+"""
+
+
+def _parse_args(args: Sequence[str]) -> bool:
+    parser = ArgParser()
+    parser.add_argument(
+        "action",
+        nargs="?",
+        choices=("start", "stop"),
+        default="stop" if tracer.recording() else "start",
+    )
+    ns = parser.parse_args(args)
+    return ns.action == "start"
+
+
+@rpc()
+async def trace(stack: Stack, args: Sequence[str]) -> None:
+    try:
+        begin = _parse_args(args)
+    except ArgparseError as e:
+        await Nvim.write(e, error=True)
+    else:
+        if begin:
+            tracer.start()
+            await Nvim.api.exec_lua(NoneType, f"{NAMESPACE}.trace_marks = {{}}", ())
+            await Nvim.write(LANG("trace begin"))
+        elif tracer.recording():
+            marks = cast(
+                Sequence[Mapping[str, Any]],
+                await Nvim.api.exec_lua(NoneType, _DRAIN_MARKS, ()),
+            )
+            nvim_pid = await Nvim.fn.getpid(int)
+            events = tracer.stop(nvim_pid, marks=marks)
+
+            traces = stack.supervisor.vars_dir / "traces"
+            traces.mkdir(parents=True, exist_ok=True)
+            path = traces / f"{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.json"
+            path.write_text(dumps(events))
+            await Nvim.write(LANG("trace end", path=str(path)))
@@ -1,20 +1,18 @@
-from asyncio import get_running_loop, run_coroutine_threadsafe, wrap_future
-from collections import Counter
 from dataclasses import dataclass
-from itertools import chain
-from typing import Mapping
-from uuid import UUID, uuid4
-
-from pynvim_pp.lib import display_width
+from pathlib import Path
+from typing import Mapping, Sequence
+from uuid import UUID
 
 from ..databases.insertions.database import IDB
 from ..shared.context import cword_before
 from ..shared.fuzzy import MatchMetrics, metrics
-from ..shared.parse import coalesce, lower
+from ..shared.parse import lower
 from ..shared.runtime import Metric, PReviewer
-from ..shared.settings import BaseClient, Icons, MatchOptions, Weights
+from ..shared.settings import BaseClient, Limits, MatchOptions, Weights
 from ..shared.types import Completion, Context
-from .icons import iconify
+from ..shared.uids import new_uid
+from .proximity import Proximity
+from .recency import Recency
 
 
 @dataclass(frozen=True)
@@ -22,7 +20,7 @@ class ReviewCtx:
     batch: UUID
     context: Context
     proximity: Mapping[str, int]
-    inserted: Mapping[str, int]
+    inserted: Mapping[str, float]
 
     is_lower: bool
 
@@ -59,48 +57,43 @@ def _join(
         recency=ctx.inserted.get(completion.sort_by, 0),
         proximity=ctx.proximity.get(completion.sort_by, 0),
     )
-    label_width = display_width(completion.label, tabsize=ctx.context.tabstop)
-    # !! WARN
-    # Use UTF8 len for icon support
-    # !! WARN
-    kind_width = len(completion.kind)
     metric = Metric(
         instance=instance,
         comp=completion,
         weight_adjust=sigmoid(completion.weight_adjust),
         weight=weight,
-        label_width=label_width,
-        kind_width=kind_width,
     )
     return metric
 
 
 class Reviewer(PReviewer[ReviewCtx]):
-    def __init__(self, options: MatchOptions, icons: Icons, db: IDB) -> None:
-        self._options, self._icons, self._db = options, icons, db
-        self._loop = get_running_loop()
+    def __init__(
+        self, options: MatchOptions, limits: Limits, db: IDB, recency: Path
+    ) -> None:
+        self._options, self._db = options, db
+        self._proximity = Proximity(options.unifying_chars)
+        self._recency = Recency(
+            capacity=limits.recency_words,
+            half_life=limits.recency_half_life,
+            path=recency,
+        )
 
     def s_register(self, assoc: BaseClient) -> None:
-        def cont() -> None:
-            self._db.new_source(assoc.short_name)
-
-        self._loop.call_soon_threadsafe(cont)
+        self._db.new_source(assoc.short_name)
 
     def begin(self, context: Context) -> ReviewCtx:
-        inserted = self._db.insertion_order(n_rows=100)
-        words = chain.from_iterable(
-            coalesce(
-                self._options.unifying_chars,
-                include_syms=True,
-                backwards=None,
-                chars=line,
-            )
-            for line in context.lines
+        inserted = self._recency.scores
+        row, _ = context.position
+        proximity = self._proximity.update(
+            context.buf_id,
+            lo=max(0, row - context.win_size),
+            lines=context.lines,
+            # without a lines event, edits may have gone unseen
+            verify=context.change is None,
         )
-        proximity = Counter(words)
 
         ctx = ReviewCtx(
-            batch=uuid4(),
+            batch=new_uid(),
             context=context,
             proximity=proximity,
             inserted=inserted,
@@ -109,39 +102,51 @@ class Reviewer(PReviewer[ReviewCtx]):
         self._db.new_batch(ctx.batch.bytes)
         return ctx
 
+    def changed(self, buf_id: int, lo: int, hi: int, lines: Sequence[str]) -> None:
+        self._proximity.changed(buf_id, lo=lo, hi=hi, lines=lines)
+
+    def inserted(self, instance: UUID, sort_by: str) -> None:
+        self._recency.inserted(sort_by)
+        self._db.inserted(instance.bytes, sort_by=sort_by)
+
+    def dump(self) -> None:
+        self._recency.dump()
+
     async def s_begin(
         self, token: ReviewCtx, assoc: BaseClient, instance: UUID
     ) -> None:
-        async def cont() -> None:
-            self._db.new_instance(
-                instance.bytes, source=assoc.short_name, batch_id=token.batch.bytes
-            )
-
-        f = run_coroutine_threadsafe(cont(), loop=self._loop)
-        await wrap_future(f)
+        self._db.new_instance(
+            instance.bytes, source=assoc.short_name, batch_id=token.batch.bytes
+        )
 
     def trans(self, token: ReviewCtx, instance: UUID, completion: Completion) -> Metric:
-        new_completion = iconify(self._icons, completion=completion)
         match_metrics = _metric(
             self._options,
             ctx=token,
-            completion=new_completion,
+            completion=completion,
         )
         metric = _join(
             token,
             instance=instance,
-            completion=new_completion,
+            completion=completion,
             match_metrics=match_metrics,
         )
         return metric
 
     async def s_end(
-        self, instance: UUID, interrupted: bool, elapsed: float, items: int
+        self,
+        instance: UUID,
+        interrupted: bool,
+        exceeded: bool,
+        elapsed: float,
+        cpu: float,
+        items: int,
     ) -> None:
-        async def cont() -> None:
-            self._db.new_stat(
-                instance.bytes, interrupted=interrupted, duration=elapsed, items=items
-            )
-
-        f = run_coroutine_threadsafe(cont(), loop=self._loop)
-        await wrap_future(f)
+        self._db.new_stat(
+            instance.bytes,
+            interrupted=interrupted,
+            exceeded=exceeded,
+            duration=elapsed,
+            cpu=cpu,
+            items=items,
+        )
@@ -6,6 +6,7 @@ from ..databases.insertions.database import IDB
 from ..shared.runtime import Metric, Supervisor, Worker
 from ..shared.settings import Settings
 from ..shared.types import Completion
+from .reviewer import Reviewer
 
 
 class ValidationError(Exception): ...
@@ -17,5 +18,6 @@ class Stack:
     lru: MutableMapping[UUID, Completion]
     metrics: MutableMapping[UUID, Metric]
     idb: IDB
+    reviewer: Reviewer
     supervisor: Supervisor
     workers: AbstractSet[Worker]
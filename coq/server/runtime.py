@@ -168,11 +168,12 @@ async def stack(th: ThreadPoolExecutor) -> Stack:
         Path(await Nvim.fn.stdpath(str, "cache")) / "coq" if settings.xdg else VARS
     )
     s = state(cwd=await Nvim.getcwd(), pum_width=pum_width)
-    idb = IDB()
+    idb = IDB(retention=settings.limits.stats_retention)
     reviewer = Reviewer(
-        icons=settings.display.icons,
         options=settings.match,
+        limits=settings.limits,
         db=idb,
+        recency=vars_dir / "recency.json",
     )
     supervisor = Supervisor(
         th=th,
@@ -196,6 +197,7 @@ async def stack(th: ThreadPoolExecutor) -> Stack:
         lru=LRU(size=settings.match.max_results),
         metrics={},
         idb=idb,
+        reviewer=reviewer,
         supervisor=supervisor,
         workers=workers,
     )
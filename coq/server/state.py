@@ -41,8 +41,6 @@ _CELL = RefCell(
         context=EMPTY_CONTEXT,
         last_edit=Metric(
             instance=uuid4(),
-            label_width=0,
-            kind_width=0,
             weight=Weights(
                 prefix_matches=0,
                 edit_distance=0,
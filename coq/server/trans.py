@@ -1,62 +1,207 @@
-from dataclasses import asdict
-from itertools import chain
+from dataclasses import fields
+from heapq import heapify, heappop
+from importlib import import_module
+from itertools import chain, count
 from locale import strxfrm
-from typing import Any, Callable, Iterable, Iterator, MutableSet, Sequence, Tuple
+from types import ModuleType
+from typing import (
+    Iterable,
+    Iterator,
+    MutableMapping,
+    MutableSequence,
+    MutableSet,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from pynvim_pp.lib import display_width
 from std2 import clamp
 
+from ..shared.repeat import materialise
 from ..shared.runtime import Metric
-from ..shared.settings import PumDisplay, Weights
+from ..shared.settings import Icons, PumDisplay, Weights
+from ..shared.slots import evolve
 from ..shared.types import Context, SnippetEdit
 from .completions import VimCompletion
+from .icons import has_kind, iconify
 from .rt_types import Stack
 from .state import state
 
+try:
+    _np: Optional[ModuleType] = import_module("numpy")
+except ImportError:
+    _np = None
 
-def _cum(adjustment: Weights, metrics: Iterable[Metric]) -> Weights:
-    zero = Weights(
-        prefix_matches=0,
-        edit_distance=0,
-        recency=0,
-        proximity=0,
+# Below this, array setup costs more than it saves
+_NP_MIN = 999
+
+_WEIGHTS = tuple(field.name for field in fields(Weights))
+
+
+def _collate(
+    memo: MutableMapping[str, str], is_lower: bool, sort_by: str
+) -> str:
+    """
+    `memo` lives as long as one request, a global cache would thrash on big ones
+    """
+
+    if (collated := memo.get(sort_by)) is None:
+        collated = memo[sort_by] = strxfrm(
+            sort_by.swapcase() if is_lower else sort_by
+        )
+    return collated
+
+
+def _order_py(
+    manual: bool,
+    divisors: Sequence[float],
+    weights: Sequence[Sequence[float]],
+    adjusts: Sequence[float],
+    heads: Sequence[int],
+    secs: Sequence[int],
+    bits: Sequence[int],
+    collation: Sequence[str],
+) -> Iterator[int]:
+    scores = (
+        -round(
+            sum(val / div if div else 0 for val, div in zip(vals, divisors))
+            * adjust
+            * 10000
+        )
+        for vals, adjust in zip(zip(*weights), adjusts)
+    )
+    # trailing index keeps equal keys in input order, same as a stable sort
+    keys = [*zip(heads, scores, secs, bits, collation, count())]
+    if manual:
+        ordered: Iterable[Tuple[int, int, int, int, str, int]] = sorted(keys)
+    else:
+        # auto completion only ever shows the head, pop lazily instead of sorting
+        heapify(keys)
+        ordered = (heappop(keys) for _ in range(len(keys)))
+    return (key[-1] for key in ordered)
+
+
+def _order_np(
+    np: ModuleType,
+    divisors: Sequence[float],
+    weights: Sequence[Sequence[float]],
+    adjusts: Sequence[float],
+    heads: Sequence[int],
+    secs: Sequence[int],
+    bits: Sequence[int],
+    collation: Sequence[str],
+) -> Iterator[int]:
+    tot = np.zeros(len(adjusts), dtype=np.float64)
+    for col, div in zip(weights, divisors):
+        if div:
+            tot = tot + np.array(col, dtype=np.float64) / div
+    scores = -np.rint(tot * np.array(adjusts, dtype=np.float64) * 10000)
+
+    uniq = {key: idx for idx, key in enumerate(sorted({*collation}))}
+    ranks = np.fromiter((uniq[key] for key in collation), dtype=np.int64)
+
+    # lexsort is stable, and treats the last key as primary
+    order = np.lexsort(
+        (
+            ranks,
+            np.array(bits, dtype=np.int64),
+            np.array(secs, dtype=np.int64),
+            scores,
+            np.array(heads, dtype=np.int64),
+        )
     )
-    acc = asdict(zero)
+    return iter(order.tolist())
+
+
+def _rank(
+    manual: bool,
+    is_lower: bool,
+    icons: Icons,
+    adjustment: Weights,
+    metrics: Sequence[Metric],
+) -> Iterator[Metric]:
+    """
+    Columnar pass: gather each weight once, normalize by the column sums
+
+    Order is (preselect, always_on_top) -> score -> secondary_edits
+    -> (extern, kind, doc, alnum) -> collation
+    """
+
+    prefix_matches: MutableSequence[float] = []
+    edit_distance: MutableSequence[float] = []
+    recency: MutableSequence[float] = []
+    proximity: MutableSequence[float] = []
+    adjusts: MutableSequence[float] = []
+    heads: MutableSequence[int] = []
+    secs: MutableSequence[int] = []
+    bits: MutableSequence[int] = []
+    collation: MutableSequence[str] = []
+    collated: MutableMapping[str, str] = {}
+    s_prefix_matches: float = 0
+    s_edit_distance: float = 0
+    s_recency: float = 0
+    s_proximity: float = 0
+
     for metric in metrics:
-        for key, val in asdict(metric.weight).items():
-            acc[key] += val
-    for key, val in asdict(adjustment).items():
-        if val:
-            acc[key] /= val
-        else:
-            acc[key] = 0
-    return Weights(**acc)
-
-
-def _sort_by(is_lower: bool, adjustment: Weights) -> Callable[[Metric], Any]:
-    adjust = asdict(adjustment)
-
-    def key_by(metric: Metric) -> Any:
-        tot = sum(
-            val / adjust[key] if adjust[key] else 0
-            for key, val in asdict(metric.weight).items()
+        weight, comp = metric.weight, metric.comp
+
+        prefix_matches.append(weight.prefix_matches)
+        edit_distance.append(weight.edit_distance)
+        recency.append(weight.recency)
+        proximity.append(weight.proximity)
+        s_prefix_matches += weight.prefix_matches
+        s_edit_distance += weight.edit_distance
+        s_recency += weight.recency
+        s_proximity += weight.proximity
+
+        adjusts.append(metric.weight_adjust)
+        heads.append(-((comp.preselect << 1) | comp.always_on_top))
+        secs.append(-len(comp.secondary_edits))
+        bits.append(
+            -(
+                ((comp.extern is not None) << 3)
+                | (has_kind(icons, completion=comp) << 2)
+                | ((comp.doc is not None) << 1)
+                | comp.sort_by[:1].isalnum()
+            )
         )
-        key = (
-            -(metric.comp.preselect),
-            -(metric.comp.always_on_top),
-            -round(tot * metric.weight_adjust * 10000),
-            -len(metric.comp.secondary_edits),
-            -(metric.comp.extern is not None),
-            -(metric.comp.kind != ""),
-            -(metric.comp.doc is not None),
-            -metric.comp.sort_by[:1].isalnum(),
-            strxfrm(
-                metric.comp.sort_by.swapcase() if is_lower else metric.comp.sort_by
-            ),
+        collation.append(
+            _collate(collated, is_lower=is_lower, sort_by=comp.sort_by)
         )
-        return key
 
-    return key_by
+    sums = (s_prefix_matches, s_edit_distance, s_recency, s_proximity)
+    divisors = tuple(
+        tot / adj if (adj := getattr(adjustment, key)) else 0
+        for key, tot in zip(_WEIGHTS, sums)
+    )
+    weights = (prefix_matches, edit_distance, recency, proximity)
+
+    if _np and len(metrics) >= _NP_MIN:
+        order = _order_np(
+            _np,
+            divisors=divisors,
+            weights=weights,
+            adjusts=adjusts,
+            heads=heads,
+            secs=secs,
+            bits=bits,
+            collation=collation,
+        )
+    else:
+        order = _order_py(
+            manual,
+            divisors=divisors,
+            weights=weights,
+            adjusts=adjusts,
+            heads=heads,
+            secs=secs,
+            bits=bits,
+            collation=collation,
+        )
+
+    for idx in order:
+        yield metrics[idx]
 
 
 def _prune(
@@ -73,16 +218,15 @@ def _prune(
             yield metric
 
 
-def _max_width(metrics: Sequence[Metric]) -> int:
-    max_width = max(
-        chain((0,), (metric.label_width + metric.kind_width for metric in metrics))
-    )
+def _max_width(widths: Iterable[Tuple[int, int]]) -> int:
+    max_width = max(chain((0,), (lw + kw for lw, kw in widths)))
     return max_width
 
 
 def _cmp_to_vcmp(
     pum: PumDisplay,
     label_width: int,
+    kind_width: int,
     kind_dead_width: int,
     ellipsis_width: int,
     truncate: int,
@@ -92,8 +236,7 @@ def _cmp_to_vcmp(
     (kl, kr), (sl, sr) = pum.kind_context, pum.source_context
     kind = f"{kl}{metric.comp.kind}{kr}" if metric.comp.kind else ""
 
-    label_width = metric.label_width
-    kind_width = metric.kind_width + kind_dead_width
+    kind_width = kind_width + kind_dead_width
     tr = truncate - kind_width
 
     if (kind_width + ellipsis_width + pum.x_truncate_len) > truncate:
@@ -130,15 +273,43 @@ def trans(
     ellipsis_width = display_width(display.pum.ellipsis, tabsize=context.tabstop)
     truncate = clamp(pum_width, scr_width - context.scr_col, display.pum.x_max_len)
 
-    w_adjust = _cum(stack.settings.weights, metrics=metrics)
-    sortby = _sort_by(context.is_lower, adjustment=w_adjust)
-    ranked = sorted(metrics, key=sortby)
-    pruned = tuple(_prune(stack, context=context, ranked=ranked))
-    max_width = _max_width(pruned)
-    for metric in pruned:
+    ranked = _rank(
+        context.manual,
+        is_lower=context.is_lower,
+        icons=display.icons,
+        adjustment=stack.settings.weights,
+        metrics=metrics,
+    )
+    pruned = tuple(
+        (
+            metric
+            if (
+                comp := iconify(
+                    display.icons,
+                    completion=materialise(context.cursor, comp=metric.comp),
+                )
+            )
+            is metric.comp
+            else evolve(metric, comp=comp)
+        )
+        for metric in _prune(stack, context=context, ranked=ranked)
+    )
+    # !! WARN
+    # Use UTF8 len for icon support
+    # !! WARN
+    widths = tuple(
+        (
+            display_width(metric.comp.label, tabsize=context.tabstop),
+            len(metric.comp.kind),
+        )
+        for metric in pruned
+    )
+    max_width = _max_width(widths)
+    for metric, (label_width, kind_width) in zip(pruned, widths):
         yield metric, _cmp_to_vcmp(
             display.pum,
-            label_width=metric.label_width,
+            label_width=label_width,
+            kind_width=kind_width,
             ellipsis_width=ellipsis_width,
             kind_dead_width=kind_dead_width,
             truncate=truncate,
@@ -0,0 +1,142 @@
+from asyncio import AbstractEventLoop, Future, Task, create_task, get_running_loop
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import (
+    Any,
+    Awaitable,
+    MutableMapping,
+    MutableSequence,
+    MutableSet,
+    Protocol,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    cast,
+)
+from weakref import WeakKeyDictionary
+
+from pynvim_pp.atomic import Atomic
+from pynvim_pp.rpc_types import NvimError
+from pynvim_pp.types import NoneType
+
+_T = TypeVar("_T")
+
+_ARRAYS = (list, tuple)
+
+
+class _Call(Protocol):
+    def __call__(self, ty: Type[_T], *args: Any) -> Awaitable[_T]: ...
+
+
+@dataclass(frozen=True)
+class _Instruction:
+    method: str
+    args: Sequence[Any]
+    fut: Future
+
+
+@dataclass(frozen=True)
+class _Batch:
+    atomic: Atomic
+    instructions: MutableSequence[_Instruction] = field(default_factory=list)
+
+
+def _fail(instructions: Sequence[_Instruction], e: BaseException) -> None:
+    for instruction in instructions:
+        if not instruction.fut.done():
+            instruction.fut.set_exception(e)
+
+
+async def _isolated(instruction: _Instruction) -> None:
+    atomic = Atomic()
+    getattr(atomic, instruction.method)(*instruction.args)
+    try:
+        ret, *_ = await atomic.commit(NoneType)
+    except NvimError as e:
+        _fail((instruction,), e)
+    else:
+        if not instruction.fut.done():
+            instruction.fut.set_result(ret)
+
+
+async def _replay(instructions: Sequence[_Instruction]) -> None:
+    try:
+        for instruction in instructions:
+            await _isolated(instruction)
+    except BaseException as e:
+        _fail(instructions, e)
+        raise
+
+
+async def _commit(batch: _Batch) -> None:
+    try:
+        rets = await batch.atomic.commit(NoneType)
+    except NvimError:
+        # `nvim_call_atomic` aborts on the first error,
+        # replay individually so that each call gets its own result
+        await _replay(batch.instructions)
+    except BaseException as e:
+        _fail(batch.instructions, e)
+        raise
+    else:
+        for instruction, ret in zip(batch.instructions, rets):
+            if not instruction.fut.done():
+                instruction.fut.set_result(ret)
+
+
+class AutoBatch:
+    """
+    Coalesce independent `nvim_*` calls issued within one event-loop tick
+
+    `await gather(batch.buf_get_name(str, buf), batch.buf_line_count(int, buf))`
+    -> single `nvim_call_atomic`
+
+    Opt in, only calls made through it are coalesced, `Nvim.api` is left as is.
+    Arrays come back as either `list` or `tuple`, asking for one accepts both
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._tasks: MutableSet[Task] = set()
+        self._batches: MutableMapping[AbstractEventLoop, _Batch] = (
+            WeakKeyDictionary()
+        )
+
+    def _flush(self, loop: AbstractEventLoop) -> None:
+        with self._lock:
+            batch = self._batches.pop(loop, None)
+        if batch and batch.instructions:
+            # The loop only holds weak references to tasks
+            task = create_task(_commit(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _submit(self, method: str, args: Tuple[Any, ...]) -> Future:
+        loop = get_running_loop()
+        fut = loop.create_future()
+        with self._lock:
+            if not (batch := self._batches.get(loop)):
+                batch = self._batches[loop] = _Batch(atomic=Atomic())
+                loop.call_soon(self._flush, loop)
+
+            getattr(batch.atomic, method)(*args)
+            batch.instructions.append(
+                _Instruction(method=method, args=args, fut=fut)
+            )
+        return fut
+
+    def __getattr__(self, method: str) -> _Call:
+        if method.startswith("_"):
+            raise AttributeError(method)
+
+        async def cont(ty: Type[_T], *args: Any) -> _T:
+            ret = await self._submit(method, args=args)
+            if isinstance(ret, ty):
+                return ret
+            elif ty in _ARRAYS and isinstance(ret, _ARRAYS):
+                return cast(_T, ty(ret))  # type: ignore
+            else:
+                raise TypeError(method, ty, ret)
+
+        return cast(_Call, cont)
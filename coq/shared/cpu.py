@@ -0,0 +1,44 @@
+from time import thread_time
+from types import coroutine
+from typing import Any, Coroutine, Generator, Optional, TypeVar, cast
+
+_T = TypeVar("_T")
+
+
+class CPUMeter:
+    """
+    CPU time spent in the steps of one coroutine
+
+    Other tasks on the same loop run in between steps, and are not counted,
+    nor are tasks the coroutine spawns
+    """
+
+    def __init__(self) -> None:
+        self._acc = 0.0
+        self._t0: Optional[float] = None
+
+    def elapsed(self) -> float:
+        running = 0.0 if self._t0 is None else thread_time() - self._t0
+        return self._acc + running
+
+    @coroutine
+    def _drive(self, co: Coroutine[Any, Any, _T]) -> Generator[Any, Any, _T]:
+        send: Any = None
+        throw: Optional[BaseException] = None
+        while True:
+            self._t0 = thread_time()
+            try:
+                yielded = co.throw(throw) if throw else co.send(send)
+            except StopIteration as e:
+                return cast(_T, e.value)
+            finally:
+                self._acc += thread_time() - self._t0
+                self._t0 = None
+
+            try:
+                send, throw = (yield yielded), None
+            except BaseException as e:
+                send, throw = None, e
+
+    async def run(self, co: Coroutine[Any, Any, _T]) -> _T:
+        return await self._drive(co)
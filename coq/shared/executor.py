@@ -10,20 +10,29 @@ from asyncio import (
 from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
 from contextlib import suppress
 from functools import lru_cache
+from itertools import count
 from shutil import which
 from subprocess import CalledProcessError
-from threading import Thread
-from typing import Any, Awaitable, Callable, Coroutine, Sequence, TypeVar
+from threading import Lock, Thread
+from time import monotonic
+from typing import Any, Awaitable, Callable, Coroutine, Optional, Sequence, TypeVar
 
 from std2.asyncio.subprocess import call
 
+from .perf import record, tally
+
 _T = TypeVar("_T")
 
 
 class AsyncExecutor:
-    def __init__(self, threadpool: ThreadPoolExecutor) -> None:
+    def __init__(
+        self, threadpool: ThreadPoolExecutor, name: Optional[str] = None
+    ) -> None:
         f: Future = Future()
         self._fut: Future = Future()
+        self._name = name or "anonymous"
+        self._submitted, self._started = count(1), 0
+        self._lock = Lock()
 
         async def cont() -> None:
             loop = get_running_loop()
@@ -33,17 +42,43 @@ class AsyncExecutor:
             main: Coroutine = await wrap_future(self._fut)
             await main
 
-        self._th = Thread(daemon=True, target=lambda: run(cont()))
+        self._th = Thread(daemon=True, name=name, target=lambda: run(cont()))
         self._th.start()
         self.loop: AbstractEventLoop = f.result()
 
     def run(self, main: Awaitable[Any]) -> None:
         self._fut.set_result(main)
 
+    def _enqueue(self) -> Callable[[bool], None]:
+        """
+        Record queue depth now, and the queueing delay once dequeued
+
+        Every job is dequeued exactly once, cancelled ones by their done callback
+        """
+
+        t0 = monotonic()
+        depth = next(self._submitted) - self._started
+        tally(f"QUEUE DEPTH -- {self._name}", n=depth)
+        dequeued = False
+
+        def cont(started: bool) -> None:
+            nonlocal dequeued
+            with self._lock:
+                if dequeued:
+                    return
+                dequeued = True
+                self._started += 1
+            if started:
+                record(f"QUEUE WAIT -- {self._name}", seconds=monotonic() - t0)
+
+        return cont
+
     def fsubmit(self, f: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
         fut: Future = Future()
+        dequeued = self._enqueue()
 
         def cont() -> None:
+            dequeued(True)
             if fut.set_running_or_notify_cancel():
                 try:
                     ret = f(*args, **kwargs)
@@ -57,8 +92,23 @@ class AsyncExecutor:
         self.loop.call_soon_threadsafe(cont)
         return fut
 
+    def csubmit(self, co: Awaitable[_T]) -> Future:
+        """
+        `submit`, but as a `concurrent.futures.Future`
+        """
+
+        dequeued = self._enqueue()
+
+        async def cont() -> _T:
+            dequeued(True)
+            return await co
+
+        fut = run_coroutine_threadsafe(cont(), loop=self.loop)
+        fut.add_done_callback(lambda _: dequeued(False))
+        return fut
+
     def submit(self, co: Awaitable[_T]) -> Awaitable[_T]:
-        f = run_coroutine_threadsafe(co, loop=self.loop)
+        f = self.csubmit(co)
         return wrap_future(f)
 
 
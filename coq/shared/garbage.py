@@ -0,0 +1,73 @@
+from collections import deque
+from gc import callbacks, collect
+from gc import freeze as gc_freeze
+from gc import get_count, get_threshold, set_threshold
+from time import monotonic
+from typing import Any, Deque, Mapping, Optional, Tuple
+
+from .perf import record
+
+# Deferred, automatic collections still kick in at this many times the threshold
+_SLACK = 100
+
+_PAUSES: Deque[Tuple[int, float]] = deque(maxlen=9999)
+_STARTED = 0.0
+_THRESHOLDS = get_threshold()
+_DEFERRED = False
+
+
+def _on_gc(phase: str, info: Mapping[str, Any]) -> None:
+    """
+    Can fire on any allocation, including halfway through `record()`
+
+    Only touches a `deque`, the rest happens in `drain()`
+    """
+
+    global _STARTED
+    if phase == "start":
+        _STARTED = monotonic()
+    else:
+        _PAUSES.append((info["generation"], monotonic() - _STARTED))
+
+
+def drain() -> None:
+    while _PAUSES:
+        generation, pause = _PAUSES.popleft()
+        record(f"GC PAUSE -- gen{generation}", seconds=pause)
+
+
+def settle(
+    thresholds: Optional[Tuple[int, int, int]], on_idle: bool, freeze: bool
+) -> None:
+    """
+    Call once started up, `freeze` moves long lived objects out of the collector's way
+    """
+
+    global _THRESHOLDS, _DEFERRED
+    if thresholds:
+        set_threshold(*thresholds)
+    _THRESHOLDS, _DEFERRED = get_threshold(), on_idle
+    if on_idle:
+        t0, *rest = _THRESHOLDS
+        set_threshold(t0 * _SLACK, *rest)
+
+    if freeze:
+        collect()
+        gc_freeze()
+    if _on_gc not in callbacks:
+        callbacks.append(_on_gc)
+
+
+def catch_up() -> None:
+    """
+    Catch up on collections deferred while typing
+    """
+
+    if _DEFERRED:
+        for generation, (count, threshold) in reversed(
+            tuple(enumerate(zip(get_count(), _THRESHOLDS)))
+        ):
+            if count > threshold:
+                collect(generation)
+                break
+    drain()
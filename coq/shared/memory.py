@@ -0,0 +1,58 @@
+from collections import deque
+from functools import lru_cache
+from sys import getsizeof
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+from typing import Any, Iterator, MutableSequence, MutableSet, Sequence
+
+_LEAVES = {str, bytes, bytearray, int, float, complex, bool, type(None)}
+_OPAQUE = (type, ModuleType, FunctionType, BuiltinFunctionType, MethodType)
+_CONTAINERS = (list, tuple, set, frozenset, deque)
+
+
+@lru_cache(maxsize=None)
+def _slots(cls: type) -> Sequence[str]:
+    def cont() -> Iterator[str]:
+        for klass in cls.__mro__:
+            slots = getattr(klass, "__slots__", ())
+            yield from (slots,) if isinstance(slots, str) else slots
+
+    return tuple(
+        slot for slot in cont() if slot not in {"__dict__", "__weakref__"}
+    )
+
+
+def sizeof(*objs: Any) -> int:
+    """
+    Approximate deep `getsizeof`, anything reachable twice is counted once
+
+    Classes, modules & functions are shared, and not counted
+    """
+
+    seen: MutableSet[int] = set()
+    stack: MutableSequence[Any] = [*objs]
+    acc = 0
+
+    while stack:
+        obj = stack.pop()
+        if (ident := id(obj)) in seen:
+            continue
+        seen.add(ident)
+
+        cls = type(obj)
+        if cls in _LEAVES:
+            acc += getsizeof(obj)
+        elif isinstance(obj, dict):
+            acc += getsizeof(obj)
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, _CONTAINERS):
+            acc += getsizeof(obj)
+            stack.extend(obj)
+        elif not isinstance(obj, _OPAQUE):
+            acc += getsizeof(obj)
+            for slot in _slots(cls):
+                stack.append(getattr(obj, slot, None))
+            if (attrs := getattr(obj, "__dict__", None)) is not None:
+                stack.append(attrs)
+
+    return acc
@@ -0,0 +1,70 @@
+from threading import Lock, Thread, current_thread, local
+from typing import Mapping, MutableMapping
+
+from .sketch import Sketch
+
+_ACCURACY = 0.02
+
+_LOCAL = local()
+_LOCK = Lock()
+_TABLES: MutableMapping[Thread, MutableMapping[str, Sketch]] = {}
+# Folded in from threads that have exited
+_RETIRED: MutableMapping[str, Sketch] = {}
+
+
+def _table() -> MutableMapping[str, Sketch]:
+    try:
+        return _LOCAL.table
+    except AttributeError:
+        table = _LOCAL.table = {}
+        with _LOCK:
+            _TABLES[current_thread()] = table
+        return table
+
+
+def _merge(acc: MutableMapping[str, Sketch], table: Mapping[str, Sketch]) -> None:
+    for name, sketch in table.items():
+        if (merged := acc.get(name)) is None:
+            merged = acc[name] = Sketch(accuracy=_ACCURACY)
+        merged.merge(sketch)
+
+
+def _add(name: str, value: float) -> None:
+    table = _table()
+    if (sketch := table.get(name)) is None:
+        sketch = table[name] = Sketch(accuracy=_ACCURACY)
+    sketch.add(value)
+
+
+def record(name: str, seconds: float) -> None:
+    """
+    Lock free, each thread only ever writes to its own histograms
+    """
+
+    _add(name, value=seconds)
+
+
+def tally(name: str, n: int) -> None:
+    """
+    `record`, for counts
+    """
+
+    _add(name, value=n)
+
+
+def snapshot() -> Mapping[str, Sketch]:
+    """
+    Merged across threads, slightly stale reads are fine
+
+    Tables of exited threads are folded into one, they no longer change
+    """
+
+    with _LOCK:
+        for thread in [thread for thread in _TABLES if not thread.is_alive()]:
+            _merge(_RETIRED, _TABLES.pop(thread))
+        tables = [_RETIRED.copy(), *(table.copy() for table in _TABLES.values())]
+
+    acc: MutableMapping[str, Sketch] = {}
+    for table in tables:
+        _merge(acc, table)
+    return acc
@@ -0,0 +1,56 @@
+from collections import Counter
+from functools import lru_cache
+from pathlib import PurePath
+from sys import _current_frames
+from threading import Event, Thread, get_ident
+from threading import enumerate as threads
+from types import CodeType, FrameType
+from typing import Iterator, Optional
+
+
+# bounded, the cache keeps sampled code objects alive
+@lru_cache(maxsize=999)
+def _label(code: CodeType) -> str:
+    path = PurePath(code.co_filename)
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{'/'.join(path.parts[-2:])}:{name}"
+
+
+def _stack(frame: Optional[FrameType]) -> Iterator[str]:
+    while frame:
+        yield _label(frame.f_code)
+        frame = frame.f_back
+
+
+class Sampler:
+    """
+    Samples every thread's stack, aggregated as folded stacks
+
+    `thread;outer;...;inner <count>`, input for `flamegraph.pl` / speedscope
+    """
+
+    def __init__(self, rate: float) -> None:
+        self._interval = 1 / rate
+        self._stop = Event()
+        self._samples: Counter[str] = Counter()
+        self._th = Thread(daemon=True, name="coq-profiler", target=self._run)
+
+    def _run(self) -> None:
+        me = get_ident()
+        while not self._stop.wait(self._interval):
+            names = {th.ident: th.name for th in threads()}
+            for tid, frame in _current_frames().items():
+                if tid != me:
+                    stack = [*_stack(frame), names.get(tid, str(tid))]
+                    stack.reverse()
+                    self._samples[";".join(stack)] += 1
+
+    def start(self) -> None:
+        self._th.start()
+
+    def stop(self) -> str:
+        self._stop.set()
+        self._th.join()
+        return "".join(
+            f"{stack} {count}\n" for stack, count in sorted(self._samples.items())
+        )
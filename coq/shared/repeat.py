@@ -1,14 +1,15 @@
-from dataclasses import replace
 from typing import Optional, Tuple
 
 from std2.types import never
 
 from ..snippets.parse import requires_snip
+from .slots import evolve
 from .types import (
     UTF8,
     UTF16,
     UTF32,
     BaseRangeEdit,
+    Completion,
     Cursors,
     Edit,
     RangeEdit,
@@ -53,8 +54,13 @@ def _shift(cursor: Cursors, edit: BaseRangeEdit) -> Tuple[WTF8Pos, WTF8Pos]:
     return new_begin, new_end
 
 
-def sanitize(inline_shift: bool, cursor: Cursors, edit: Edit) -> Optional[Edit]:
-    row, *_ = cursor
+def relative(inline_shift: bool, row: int, edit: Edit) -> Optional[Edit]:
+    """
+    `sanitize`, except range edits are left as of their `cursor_pos`
+
+    Those only depend on the cursor's row, `shift` the survivors onto the cursor
+    """
+
     if isinstance(edit, SnippetRangeEdit):
         if row == -1:
             if edit.fallback == edit.new_text:
@@ -68,12 +74,10 @@ def sanitize(inline_shift: bool, cursor: Cursors, edit: Edit) -> Optional[Edit]:
         elif not requires_snip(edit.new_text):
             return Edit(new_text=edit.new_text)
         else:
-            begin, end = _shift(cursor, edit=edit)
-            return replace(edit, begin=begin, end=end)
+            return edit
     elif isinstance(edit, RangeEdit):
         if inline_shift:
-            begin, end = _shift(cursor, edit=edit)
-            return replace(edit, begin=begin, end=end)
+            return edit
         elif fallback := edit.fallback:
             return Edit(new_text=fallback)
         elif not requires_snip(edit.new_text):
@@ -84,3 +88,31 @@ def sanitize(inline_shift: bool, cursor: Cursors, edit: Edit) -> Optional[Edit]:
         return edit
     else:
         return Edit(new_text=edit.new_text)
+
+
+def shift(cursor: Cursors, edit: Edit) -> Edit:
+    if isinstance(edit, BaseRangeEdit):
+        begin, end = _shift(cursor, edit=edit)
+        return evolve(edit, begin=begin, end=end)
+    else:
+        return edit
+
+
+def sanitize(inline_shift: bool, cursor: Cursors, edit: Edit) -> Optional[Edit]:
+    row, *_ = cursor
+    if rel := relative(inline_shift, row=row, edit=edit):
+        return shift(cursor, edit=rel)
+    else:
+        return None
+
+
+def materialise(cursor: Cursors, comp: Completion) -> Completion:
+    """
+    Only for the few `relative` completions that make it onto the menu
+    """
+
+    if comp.relative:
+        edit = shift(cursor, edit=comp.primary_edit)
+        return evolve(comp, primary_edit=edit, relative=False)
+    else:
+        return comp
@@ -8,7 +8,6 @@ from asyncio import (
     as_completed,
     create_task,
     gather,
-    run_coroutine_threadsafe,
     wait,
     wrap_future,
 )
@@ -19,6 +18,7 @@ from concurrent.futures import Future as CFuture
 from concurrent.futures import InvalidStateError, ThreadPoolExecutor
 from contextlib import contextmanager, suppress
 from dataclasses import dataclass
+from inspect import isasyncgen
 from pathlib import Path
 from threading import Lock
 from time import monotonic
@@ -30,20 +30,23 @@ from typing import (
     Deque,
     Generic,
     Iterator,
+    Mapping,
     MutableSequence,
     Optional,
     Protocol,
     Sequence,
     TypeVar,
 )
-from uuid import UUID, uuid4
+from uuid import UUID
 from weakref import WeakSet
 
 from pynvim_pp.logging import suppress_and_log
 from std2.aitertools import aenumerate
 from std2.asyncio import cancel
 
+from .cpu import CPUMeter
 from .executor import AsyncExecutor
+from .perf import record
 from .settings import (
     BaseClient,
     CompleteOptions,
@@ -52,22 +55,23 @@ from .settings import (
     MatchOptions,
     Weights,
 )
+from .slots import slotted
 from .timeit import TracingLocker, timeit
 from .types import Completion, Context, Interruptible
+from .uids import new_uid
 
 _T = TypeVar("_T")
 _T_co = TypeVar("_T_co", contravariant=True)
 _O_co = TypeVar("_O_co", contravariant=True, bound=BaseClient)
 
 
+@slotted
 @dataclass(frozen=True)
 class Metric:
     instance: UUID
     comp: Completion
     weight_adjust: float
     weight: Weights
-    label_width: int
-    kind_width: int
 
 
 class PReviewer(Protocol[_T]):
@@ -80,7 +84,13 @@ class PReviewer(Protocol[_T]):
     def trans(self, token: _T, instance: UUID, completion: Completion) -> Metric: ...
 
     async def s_end(
-        self, instance: UUID, interrupted: bool, elapsed: float, items: int
+        self,
+        instance: UUID,
+        interrupted: bool,
+        exceeded: bool,
+        elapsed: float,
+        cpu: float,
+        items: int,
     ) -> None: ...
 
 
@@ -144,7 +154,8 @@ class Supervisor:
                 async with self._lock:
                     acc: Deque[Metric] = deque()
 
-                    token = self._reviewer.begin(context)
+                    with timeit("REVIEW -- BEGIN"):
+                        token = self._reviewer.begin(context)
                     tasks = {
                         worker.supervised(
                             context, token=token, now=now, timeout=timeout, acc=acc
@@ -175,7 +186,7 @@ class Worker(Interruptible, Generic[_O_co, _T_co]):
     def init(
         cls, supervisor: Supervisor, always_wait: bool, options: _O_co, misc: _T_co
     ) -> Worker[_O_co, _T_co]:
-        ex = AsyncExecutor(supervisor.threadpool)
+        ex = AsyncExecutor(supervisor.threadpool, name=f"coq-{options.short_name}")
         fut = ex.fsubmit(
             lambda: cls(
                 ex,
@@ -227,11 +238,43 @@ class Worker(Interruptible, Generic[_O_co, _T_co]):
     @abstractmethod
     def _work(self, context: Context, timeout: float) -> AsyncIterator[Completion]: ...
 
+    def usage(self) -> Mapping[str, int]:
+        """
+        Approximate bytes held, by kind, only safe to call from `self._ex`
+        """
+
+        return {}
+
+    def evict(self) -> None:
+        """
+        Drop whatever can be rebuilt, once over `memory_budget`
+        """
+
+    async def tidy(self) -> None:
+        """
+        Deferred housekeeping, on idle
+        """
+
+    async def memory(self) -> Mapping[str, int]:
+        async def cont() -> Mapping[str, int]:
+            return self.usage()
+
+        return await self._ex.submit(cont())
+
     async def idle(self) -> None:
         async def cont() -> None:
             async with self._idle:
                 self._idle.notify_all()
 
+            with suppress_and_log():
+                await self.tidy()
+
+            if (budget := self._options.memory_budget) is not None:
+                with suppress_and_log():
+                    if sum(self.usage().values()) > budget:
+                        with timeit(f"EVICT -- {self._options.short_name}"):
+                            self.evict()
+
         await self._ex.submit(cont())
 
     def supervised(
@@ -244,40 +287,52 @@ class Worker(Interruptible, Generic[_O_co, _T_co]):
     ) -> Future:
         prev = self._work_fut
 
+        meter = CPUMeter()
+
         async def cont() -> None:
-            instance, items = uuid4(), 0
-            interrupted = False
+            instance, items = new_uid(), 0
+            interrupted = exceeded = False
+            short_name, budget = self._options.short_name, self._options.cpu_budget
 
-            with timeit(f"CANCEL WORKER -- {self._options.short_name}"):
+            with timeit(f"CANCEL WORKER -- {short_name}"):
                 if prev:
                     await cancel(wrap_future(prev))
 
-            with suppress_and_log(), timeit(f"WORKER -- {self._options.short_name}"):
+            with suppress_and_log(), timeit(f"WORKER -- {short_name}"):
                 await self._supervisor._reviewer.s_begin(
                     token, assoc=self._options, instance=instance
                 )
+                work = self._work(context, timeout=timeout)
                 try:
-                    async for items, completion in aenumerate(
-                        self._work(context, timeout=timeout), start=1
-                    ):
+                    async for items, completion in aenumerate(work, start=1):
                         metric = self._supervisor._reviewer.trans(
                             token, instance=instance, completion=completion
                         )
                         acc.append(metric)
+                        if budget is not None and meter.elapsed() >= budget:
+                            exceeded = True
+                            break
+                    if exceeded and isasyncgen(work):
+                        # release `_work_lock` & co. now, rather than on GC
+                        await work.aclose()
                 except CancelledError:
                     interrupted = True
                     raise
                 finally:
-                    elapsed = monotonic() - now
+                    elapsed, cpu = monotonic() - now, meter.elapsed()
+                    record(f"CPU -- {short_name}", seconds=cpu)
                     await self._supervisor._reviewer.s_end(
                         instance,
                         interrupted=interrupted,
+                        exceeded=exceeded,
                         elapsed=elapsed,
+                        cpu=cpu,
                         items=items,
                     )
 
         self.interrupt()
-        f = run_coroutine_threadsafe(cont(), self._ex.loop)
+        # only this request's own steps, not `_poll`, `tidy` & co. on the same loop
+        f = self._ex.csubmit(meter.run(cont()))
         self._work_fut = f
         fut = wrap_future(f)
         return fut
@@ -5,6 +5,8 @@ from typing import AbstractSet, Literal, Mapping, Optional, Tuple, Union
 
 from pynvim_pp.float_win import Border
 
+from .slots import slotted
+
 
 @dataclass(frozen=True)
 class Limits:
@@ -14,6 +16,14 @@ class Limits:
     completion_manual_timeout: float
     download_retries: int
     download_timeout: float
+    stats_retention: float
+    recency_words: int
+    recency_half_life: float
+    gc_thresholds: Optional[Tuple[int, int, int]]
+    gc_on_idle: bool
+    gc_freeze: bool
+    cache_max_items: int
+    cache_max_bytes: int
 
 
 @dataclass(frozen=True)
@@ -96,6 +106,7 @@ class MatchOptions:
     fuzzy_cutoff: float
 
 
+@slotted
 @dataclass(frozen=True)
 class Weights:
     prefix_matches: float
@@ -138,8 +149,10 @@ class _AlwaysTops:
 @dataclass(frozen=True)
 class BaseClient:
     always_wait: bool
+    cpu_budget: Optional[float]
     enabled: bool
     max_pulls: Optional[int]
+    memory_budget: Optional[int]
     short_name: str
     weight_adjust: float
 
@@ -200,12 +213,17 @@ class SnippetClient(BaseClient, _AlwaysTop):
 
 
 @dataclass(frozen=True)
-class LSPClient(BaseClient, _AlwaysTops):
+class _LSPClient(BaseClient, _AlwaysTops):
     resolve_timeout: float
 
 
 @dataclass(frozen=True)
-class LSPInlineClient(LSPClient):
+class LSPClient(_LSPClient):
+    prefilter: bool
+
+
+@dataclass(frozen=True)
+class LSPInlineClient(_LSPClient):
     live_pulling: bool
 
 
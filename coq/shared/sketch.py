@@ -0,0 +1,92 @@
+from array import array
+from math import ceil, log
+from struct import Struct
+from typing import Iterable, MutableMapping, Tuple
+
+_HEADER = Struct("<qqd")
+
+
+class Sketch:
+    """
+    DDSketch: log bucketed quantiles, within `accuracy` relative error
+
+    Mergeable, constant size w.r.t. number of samples
+    """
+
+    def __init__(self, accuracy: float = 0.01, max_buckets: int = 2048) -> None:
+        self._gamma = (1 + accuracy) / (1 - accuracy)
+        self._ln_gamma = log(self._gamma)
+        self._max_buckets = max_buckets
+        self._buckets: MutableMapping[int, int] = {}
+        self._zeros = 0
+        self.count = 0
+        self.total = 0.0
+
+    def _collapse(self) -> None:
+        lo, nxt, *_ = sorted(self._buckets)
+        self._buckets[nxt] += self._buckets.pop(lo)
+
+    def add(self, x: float, n: int = 1) -> None:
+        self.count += n
+        self.total += x * n
+        if x <= 1e-9:
+            self._zeros += n
+        else:
+            key = ceil(log(x) / self._ln_gamma)
+            self._buckets[key] = self._buckets.get(key, 0) + n
+            if len(self._buckets) > self._max_buckets:
+                self._collapse()
+
+    def _absorb(
+        self, count: int, zeros: int, total: float, buckets: Iterable[Tuple[int, int]]
+    ) -> None:
+        self.count += count
+        self.total += total
+        self._zeros += zeros
+        for key, n in buckets:
+            self._buckets[key] = self._buckets.get(key, 0) + n
+        while len(self._buckets) > self._max_buckets:
+            self._collapse()
+
+    def merge(self, other: "Sketch") -> None:
+        assert self._gamma == other._gamma
+        # snapshot, `other` may still be written to by its owning thread
+        buckets = tuple(other._buckets.items())
+        self._absorb(other.count, other._zeros, other.total, buckets)
+
+    @property
+    def avg(self) -> float:
+        return self.total / self.count if self.count else 0
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0
+
+        rank = q * (self.count - 1)
+        seen = self._zeros
+        if seen > rank:
+            return 0
+
+        key = 0
+        for key in sorted(self._buckets):
+            seen += self._buckets[key]
+            if seen > rank:
+                break
+        return 2 * self._gamma**key / (self._gamma + 1)
+
+    def __bytes__(self) -> bytes:
+        flat = array("q")
+        for key, n in self._buckets.items():
+            flat.extend((key, n))
+        header = _HEADER.pack(self.count, self._zeros, self.total)
+        return header + flat.tobytes()
+
+    def load(self, data: bytes) -> None:
+        """
+        Merge in a `bytes(sketch)` of the same accuracy
+        """
+
+        count, zeros, total = _HEADER.unpack_from(data)
+        flat = array("q")
+        flat.frombytes(data[_HEADER.size :])
+        self._absorb(count, zeros, total, zip(flat[::2], flat[1::2]))
@@ -0,0 +1,98 @@
+from dataclasses import MISSING, fields, replace
+from typing import (
+    AbstractSet,
+    Any,
+    Callable,
+    Dict,
+    MutableMapping,
+    MutableSequence,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+_T = TypeVar("_T")
+
+_Setter = Callable[[Any, Any], None]
+
+_SETTERS: MutableMapping[type, Sequence[Tuple[str, _Setter]]] = {}
+_NAMES: MutableMapping[type, AbstractSet[str]] = {}
+
+
+def _init(cls: type, setters: Sequence[Tuple[str, _Setter]]) -> Callable[..., None]:
+    ns: Dict[str, Any] = {"_MISSING": MISSING}
+    params: MutableSequence[str] = []
+    body: MutableSequence[str] = []
+
+    for idx, (fld, (name, setter)) in enumerate(zip(fields(cls), setters)):
+        assert fld.init and fld.name == name
+        ns[f"_set_{idx}"] = setter
+        if fld.default is not MISSING:
+            ns[f"_dflt_{idx}"] = fld.default
+            params.append(f"{name}=_dflt_{idx}")
+        elif fld.default_factory is not MISSING:
+            ns[f"_fact_{idx}"] = fld.default_factory
+            params.append(f"{name}=_MISSING")
+            body.append(f"  if {name} is _MISSING: {name} = _fact_{idx}()")
+        else:
+            params.append(name)
+        body.append(f"  _set_{idx}(self, {name})")
+
+    src = f"def __init__(self, {', '.join(params)}) -> None:\n" + "\n".join(
+        body or ("  pass",)
+    )
+    exec(src, ns)
+    init = ns["__init__"]
+    init.__qualname__ = f"{cls.__qualname__}.__init__"
+    return init
+
+
+def slotted(cls: Type[_T]) -> Type[_T]:
+    """
+    `@dataclass(frozen=True, slots=True)`, but for python < 3.10 as well
+
+    The frozen `__init__` is regenerated to write through the slot descriptors,
+    instead of `object.__setattr__` per field
+    """
+
+    names = tuple(fld.name for fld in fields(cls))
+    inherited = {
+        slot for base in cls.__mro__[1:] for slot in getattr(base, "__slots__", ())
+    }
+    ns = {
+        key: val
+        for key, val in cls.__dict__.items()
+        if key not in names and key not in {"__dict__", "__weakref__"}
+    }
+    ns["__slots__"] = tuple(name for name in names if name not in inherited)
+
+    new_cls = type(cls)(cls.__name__, cls.__bases__, ns)
+    new_cls.__qualname__ = cls.__qualname__
+
+    setters = tuple((name, getattr(new_cls, name).__set__) for name in names)
+    setattr(new_cls, "__init__", _init(new_cls, setters=setters))
+    _SETTERS[new_cls] = setters
+    _NAMES[new_cls] = frozenset(names)
+    return new_cls
+
+
+def evolve(obj: _T, **changes: Any) -> _T:
+    """
+    `dataclasses.replace`, without the `fields()` walk & `__init__` for `@slotted`
+    """
+
+    cls = type(obj)
+    if setters := _SETTERS.get(cls):
+        if unknown := changes.keys() - _NAMES[cls]:
+            name, *_ = sorted(unknown)
+            raise TypeError(
+                f"{cls.__qualname__}.__init__() "
+                f"got an unexpected keyword argument {name!r}"
+            )
+        new = object.__new__(cls)
+        for name, setter in setters:
+            setter(new, changes[name] if name in changes else getattr(obj, name))
+        return new
+    else:
+        return replace(obj, **changes)
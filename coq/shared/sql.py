@@ -1,17 +1,42 @@
+from contextlib import closing, suppress
 from functools import lru_cache
 from os.path import normcase
 from pathlib import Path
-from sqlite3.dbapi2 import Connection
-from typing import Protocol, cast
+from sqlite3 import DatabaseError
+from sqlite3.dbapi2 import Connection, Cursor
+from threading import Lock
+from time import monotonic
+from typing import (
+    Any,
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    Optional,
+    Protocol,
+    Sequence,
+    cast,
+)
 
 from pynvim_pp.lib import decode
+from pynvim_pp.logging import log
 from std2.pathlib import AnyPath
 from std2.sqlite3 import add_functions, escape
 
+from ..consts import DEBUG, SLOW_SQL_LOG, TOP_LEVEL
 from .fuzzy import quick_ratio
+from .perf import record
 
 BIGGEST_INT = 2**63 - 1
 
+# Statements slower than this are recorded, their plans captured once
+_SLOW = 0.01
+
+_LOCK = Lock()
+_NAMES: MutableMapping[str, str] = {}
+_PLANS: MutableMapping[str, Sequence[str]] = {}
+
 
 class _Loader(Protocol):
     def __call__(self, *paths: AnyPath) -> str: ...
@@ -21,11 +46,136 @@ def loader(base: Path) -> _Loader:
     @lru_cache(maxsize=None)
     def cont(*paths: AnyPath) -> str:
         path = (base / Path(*paths)).with_suffix(".sql")
-        return decode(path.read_bytes())
+        text = decode(path.read_bytes())
+        with _LOCK:
+            _NAMES[text] = path.relative_to(TOP_LEVEL).as_posix()
+        return text
 
     return cast(_Loader, cont)
 
 
+def _shape(params: Any) -> str:
+    """
+    Types & lengths of bound parameters, never their values
+    """
+
+    def cont(val: Any) -> str:
+        name = type(val).__name__
+        return f"{name}[{len(val)}]" if isinstance(val, (str, bytes)) else name
+
+    if isinstance(params, Mapping):
+        return ", ".join(f":{key}={cont(val)}" for key, val in params.items())
+    else:
+        return ", ".join(map(cont, params))
+
+
+def _plan(conn: Connection, sql: str, params: Any) -> Sequence[str]:
+    """
+    `EXPLAIN QUERY PLAN`, indented by depth
+    """
+
+    depths: MutableMapping[int, int] = {0: -1}
+    plan: MutableSequence[str] = []
+    # plain cursor, not to time the `EXPLAIN` itself
+    with suppress(DatabaseError), closing(Cursor(conn)) as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        for node, parent, _, detail in cursor.fetchall():
+            depths[node] = depth = depths.get(parent, -1) + 1
+            plan.append(f"{'  ' * depth}{detail}")
+    return plan
+
+
+def _slow(
+    conn: Optional[Connection], sql: str, params: Any, n: int, elapsed: float
+) -> None:
+    """
+    `conn` is None for scripts, which have no single plan
+    """
+
+    name = _NAMES.get(sql) or " ".join(sql.split())[:99]
+    record(f"SQL SLOW -- {name}", seconds=elapsed)
+
+    if DEBUG:
+        with _LOCK:
+            first = name not in _PLANS
+            if first:
+                _PLANS[name] = ()
+        plan = _plan(conn, sql=sql, params=params) if first and conn else ()
+        if plan:
+            with _LOCK:
+                _PLANS[name] = plan
+
+        header = f"{elapsed * 1000:.1f}ms x{n} {name} ({_shape(params)})"
+        lines = (header, *(f"  {line}" for line in plan))
+        try:
+            with _LOCK, SLOW_SQL_LOG.open("a", encoding="UTF-8") as fd:
+                fd.writelines(f"{line}\n" for line in lines)
+        except OSError as e:
+            log.warning("%s", e)
+
+
+class _Cursor(Cursor):
+    """
+    Times each statement, `SELECT`s only up to their first row
+    """
+
+    def execute(self, sql: str, parameters: Any = ()) -> Cursor:
+        t0 = monotonic()
+        cursor = super().execute(sql, parameters)
+        if (elapsed := monotonic() - t0) >= _SLOW:
+            conn = cast(Connection, self.connection)
+            _slow(conn, sql=sql, params=parameters, n=1, elapsed=elapsed)
+        return cursor
+
+    def executemany(self, sql: str, seq_of_parameters: Iterable[Any]) -> Cursor:
+        first: Any = ()
+        n = 0
+
+        def cont() -> Iterator[Any]:
+            nonlocal first, n
+            for params in seq_of_parameters:
+                if not n:
+                    first = params
+                n += 1
+                yield params
+
+        t0 = monotonic()
+        cursor = super().executemany(sql, cont())
+        if (elapsed := monotonic() - t0) >= _SLOW and n:
+            conn = cast(Connection, self.connection)
+            _slow(conn, sql=sql, params=first, n=n, elapsed=elapsed)
+        return cursor
+
+    def executescript(self, sql_script: str) -> Cursor:
+        t0 = monotonic()
+        cursor = super().executescript(sql_script)
+        if (elapsed := monotonic() - t0) >= _SLOW:
+            _slow(None, sql=sql_script, params=(), n=1, elapsed=elapsed)
+        return cursor
+
+
+class _Connection(Connection):
+    """
+    The `execute*` shortcuts go through `_Cursor` as well
+    """
+
+    def cursor(self, *_: Any, **__: Any) -> Cursor:
+        return super().cursor(_Cursor)
+
+    def execute(self, sql: str, parameters: Any = ()) -> Cursor:
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Iterable[Any]) -> Cursor:
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script: str) -> Cursor:
+        return self.cursor().executescript(sql_script)
+
+
+def connect(database: AnyPath) -> Connection:
+    return _Connection(database, isolation_level=None)
+
+
 @lru_cache
 def like_esc(like: str) -> str:
     escaped = escape(nono={"%", "_", "["}, escape="!", param=like)
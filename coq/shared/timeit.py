@@ -1,6 +1,6 @@
 from asyncio import Lock
 from contextlib import contextmanager, nullcontext
-from time import process_time
+from time import monotonic, process_time
 from types import TracebackType
 from typing import (
     Any,
@@ -17,6 +17,9 @@ from std2.locale import si_prefixed_smol
 from std2.timeit import timeit as _timeit
 
 from ..consts import DEBUG
+from .garbage import drain
+from .perf import record
+from .trace import span
 
 _RECORDS: MutableMapping[str, Tuple[int, float]] = {}
 
@@ -25,31 +28,33 @@ _RECORDS: MutableMapping[str, Tuple[int, float]] = {}
 def timeit(
     name: str, *args: Any, force: bool = False, warn: Optional[float] = None
 ) -> Iterator[None]:
-    if DEBUG or force or warn is not None:
-        with _timeit() as t:
-            yield None
-        delta = t().total_seconds()
-        if DEBUG or force or delta >= (warn or 0):
-            times, cum = _RECORDS.get(name, (0, 0))
-            tt, c = times + 1, cum + delta
-            _RECORDS[name] = tt, c
+    t0 = monotonic()
+    yield None
+    delta = monotonic() - t0
+    record(name, seconds=delta)
+    span(name, begin=t0, duration=delta)
+    drain()
 
-            label = name.ljust(50)
-            time = f"{si_prefixed_smol(delta, precision=0)}s".ljust(8)
-            ttime = f"{si_prefixed_smol(c / tt, precision=0)}s".ljust(8)
-            msg = f"TIME -- {label} :: {time} @ {ttime} {' '.join(map(str, args))}"
-            if force:
-                log.info("%s", msg)
-            else:
-                log.debug("%s", msg)
-    else:
-        yield None
+    if DEBUG or force or (warn is not None and delta >= warn):
+        times, cum = _RECORDS.get(name, (0, 0))
+        tt, c = times + 1, cum + delta
+        _RECORDS[name] = tt, c
+
+        label = name.ljust(50)
+        time = f"{si_prefixed_smol(delta, precision=0)}s".ljust(8)
+        ttime = f"{si_prefixed_smol(c / tt, precision=0)}s".ljust(8)
+        msg = f"TIME -- {label} :: {time} @ {ttime} {' '.join(map(str, args))}"
+        if force:
+            log.info("%s", msg)
+        else:
+            log.debug("%s", msg)
 
 
 class TracingLocker(AsyncContextManager):
     def __init__(self, name: str, force: bool = False) -> None:
         self._lock = Lock()
         self._name, self._force = name, force
+        self._acquired = 0.0
 
     def locked(self) -> bool:
         return self._lock.locked()
@@ -60,8 +65,11 @@ class TracingLocker(AsyncContextManager):
             if self._lock.locked()
             else nullcontext()
         )
+        t0 = monotonic()
         with mgr:
             await self._lock.__aenter__()
+        self._acquired = monotonic()
+        record(f"LOCK WAIT -- {self._name}", seconds=self._acquired - t0)
 
     async def __aexit__(
         self,
@@ -69,6 +77,7 @@ class TracingLocker(AsyncContextManager):
         exc: Optional[BaseException],
         tb: Optional[TracebackType],
     ) -> None:
+        record(f"LOCK HOLD -- {self._name}", seconds=monotonic() - self._acquired)
         await self._lock.__aexit__(exc_type, exc, tb)
 
 
@@ -0,0 +1,53 @@
+from asyncio import sleep
+from itertools import islice
+from time import monotonic
+from typing import AsyncIterator, Callable, Iterable, Sequence, TypeVar
+
+_T = TypeVar("_T")
+
+# Items in the first slice, before there is a per item cost to go by
+_PROBE = 9
+# Weight of the latest slice, in the running per item cost
+_ALPHA = 0.5
+
+
+class TimeSlicer:
+    """
+    Size slices to take about `budget` seconds each, by the running per item cost
+
+    Kept across calls, the cost of a consumer tends to be stable
+    """
+
+    def __init__(self, budget: float, clock: Callable[[], float] = monotonic) -> None:
+        self._budget, self._clock = budget, clock
+        self._per_item = 0.0
+
+    def size(self) -> int:
+        if self._per_item:
+            return max(1, int(self._budget / self._per_item))
+        else:
+            return _PROBE
+
+    def _measure(self, items: int, elapsed: float) -> None:
+        per_item = elapsed / items
+        self._per_item = (
+            _ALPHA * per_item + (1 - _ALPHA) * self._per_item
+            if self._per_item
+            else per_item
+        )
+
+    async def slices(
+        self, items: Iterable[_T], busy: Callable[[], bool]
+    ) -> AsyncIterator[Sequence[_T]]:
+        """
+        Yields to the event loop in between slices
+
+        Stops as soon as `busy()`, rather than hold up the next completion
+        """
+
+        it = iter(items)
+        while not busy() and (chunk := tuple(islice(it, self.size()))):
+            t0 = self._clock()
+            yield chunk
+            self._measure(len(chunk), elapsed=self._clock() - t0)
+            await sleep(0)
@@ -0,0 +1,72 @@
+from collections import deque
+from os import getpid
+from threading import current_thread, get_ident
+from typing import Any, Deque, Iterable, Mapping, MutableMapping, Optional
+
+# Keep the tail of long recordings
+_MAX_EVENTS = 99999
+_PID = getpid()
+
+_EVENTS: Optional[Deque[Mapping[str, Any]]] = None
+_THREADS: MutableMapping[int, str] = {}
+
+
+def recording() -> bool:
+    return _EVENTS is not None
+
+
+def start() -> None:
+    global _EVENTS
+    _THREADS.clear()
+    _EVENTS = deque(maxlen=_MAX_EVENTS)
+
+
+def span(name: str, begin: float, duration: float) -> None:
+    """
+    `begin` is on the `monotonic()` clock, same as `vim.uv.hrtime()` on unix
+    """
+
+    if (events := _EVENTS) is not None:
+        tid = get_ident()
+        if tid not in _THREADS:
+            _THREADS[tid] = current_thread().name
+        event = {
+            "name": name,
+            "ph": "X",
+            "ts": begin * 1e6,
+            "dur": duration * 1e6,
+            "pid": _PID,
+            "tid": tid,
+        }
+        events.append(event)
+
+
+def stop(nvim_pid: int, marks: Iterable[Mapping[str, Any]]) -> Mapping[str, Any]:
+    """
+    Chrome Trace Event format, `marks` from lua are `{name, ts, dur}` in µs
+    """
+
+    global _EVENTS
+    events, _EVENTS = _EVENTS or (), None
+
+    def cont() -> Iterable[Mapping[str, Any]]:
+        for pid, name in ((_PID, "coq"), (nvim_pid, "nvim")):
+            yield {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "args": {"name": name},
+            }
+        for tid, name in _THREADS.items():
+            yield {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": _PID,
+                "tid": tid,
+                "args": {"name": name},
+            }
+        yield from events
+        for mark in marks:
+            yield {**mark, "ph": "X", "pid": nvim_pid, "tid": 0}
+
+    return {"traceEvents": [*cont()], "displayTimeUnit": "ms"}
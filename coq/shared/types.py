@@ -13,7 +13,10 @@ from typing import (
     Tuple,
     Union,
 )
-from uuid import UUID, uuid4
+from uuid import UUID
+
+from .slots import slotted
+from .uids import new_uid
 
 UTF8: Literal["UTF-8"] = "UTF-8"
 UTF16: Literal["UTF-16-LE"] = "UTF-16-LE"
@@ -45,6 +48,7 @@ class ChangeEvent:
 Cursors = Tuple[int, NvimCursor, WTF8Cursor, WTF8Cursor]
 
 
+@slotted
 @dataclass(frozen=True)
 class Context:
     """
@@ -105,11 +109,13 @@ class Context:
     change: Optional[ChangeEvent]
 
 
+@slotted
 @dataclass(frozen=True)
 class Edit:
     new_text: str
 
 
+@slotted
 @dataclass(frozen=True)
 class ContextualEdit(Edit):
     """
@@ -121,6 +127,7 @@ class ContextualEdit(Edit):
     old_suffix: str = ""
 
 
+@slotted
 @dataclass(frozen=True)
 class BaseRangeEdit(Edit):
     """
@@ -133,6 +140,7 @@ class BaseRangeEdit(Edit):
     encoding: Encoding
 
 
+@slotted
 @dataclass(frozen=True)
 class RangeEdit(BaseRangeEdit):
     fallback: Optional[str]
@@ -162,12 +170,14 @@ class Mark:
     text: str
 
 
+@slotted
 @dataclass(frozen=True)
 class Doc:
     text: str
     syntax: str
 
 
+@slotted
 @dataclass(frozen=True)
 class ExternLSP:
     inline: bool
@@ -176,16 +186,19 @@ class ExternLSP:
     command: Optional[Any]
 
 
+@slotted
 @dataclass(frozen=True)
 class ExternLUA(ExternLSP): ...
 
 
+@slotted
 @dataclass(frozen=True)
 class ExternPath:
     is_dir: bool
     path: Path
 
 
+@slotted
 @dataclass(frozen=True)
 class Completion:
     source: str
@@ -197,12 +210,14 @@ class Completion:
     adjust_indent: bool
     icon_match: Optional[str]
 
-    uid: UUID = field(default_factory=uuid4)
+    uid: UUID = field(default_factory=new_uid)
     secondary_edits: Sequence[RangeEdit] = ()
     preselect: bool = False
     kind: str = ""
     doc: Optional[Doc] = None
     extern: Union[ExternLSP, ExternLUA, ExternPath, None] = None
+    # `primary_edit` is as of its `cursor_pos`, until `materialise`d
+    relative: bool = False
 
 
 TextTransform = Callable[[Optional[str]], Union[Sequence[str], str]]
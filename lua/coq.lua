@@ -168,6 +168,15 @@ vim.api.nvim_command [[command! -complete=customlist,coq#complete_now -nargs=* C
 set_coq_call("Stats")
 vim.api.nvim_command [[command! -nargs=* COQstats lua coq.Stats(<f-args>)]]
 
+set_coq_call("Perf")
+vim.api.nvim_command [[command! -nargs=* COQperf lua coq.Perf(<f-args>)]]
+
+set_coq_call("Trace")
+vim.api.nvim_command [[command! -complete=customlist,coq#complete_trace -nargs=* COQtrace lua coq.Trace(<f-args>)]]
+
+set_coq_call("Profile")
+vim.api.nvim_command [[command! -complete=customlist,coq#complete_profile -nargs=* COQprofile lua coq.Profile(<f-args>)]]
+
 set_coq_call("Snips")
 vim.api.nvim_command [[command! -complete=customlist,coq#complete_snips -nargs=* COQsnips lua coq.Snips(<f-args>)]]
 
@@ -1,7 +1,21 @@
 (function(...)
+  local hrtime = (vim.uv or vim.loop).hrtime
+
+  -- `COQ.trace_marks` is only set while `:COQtrace` is recording
+  local mark = function(name, t0)
+    local marks = COQ.trace_marks
+    if marks then
+      local t1 = hrtime()
+      table.insert(marks, {name = name, ts = t0 / 1000, dur = (t1 - t0) / 1000})
+    end
+  end
+
   COQ.send_comp = function(col, items)
+    local t0 = hrtime()
     vim.schedule(
       function()
+        mark("LUA -- SEND COMP (queued)", t0)
+        local t1 = hrtime()
         local legal_modes = {
           ["i"] = true,
           ["ic"] = true,
@@ -22,6 +36,7 @@
             vim.fn.complete(col, items)
           end
         end
+        mark("LUA -- SEND COMP", t1)
       end
     )
   end
@@ -33,6 +33,49 @@
 
   local cids = {}
   local accs = {}
+  local filters = {}
+
+  local plausible = function(prefix, item)
+    local text = item.filterText or item.label
+    if type(text) ~= "string" then
+      return true
+    end
+
+    -- subsequence, case insensitive
+    local lower = string.lower(text)
+    local pos = 1
+    for i = 1, #prefix do
+      pos = string.find(lower, string.sub(prefix, i, i), pos, true)
+      if not pos then
+        return false
+      end
+      pos = pos + 1
+    end
+    return true
+  end
+
+  local prefilter = function(spec, items)
+    if type(spec) ~= "table" or #spec.prefix <= 0 then
+      return {items = items}
+    end
+
+    local head, overflow, rest = {}, {}, {}
+    for _, item in ipairs(items) do
+      if type(item) ~= "table" or plausible(spec.prefix, item) then
+        table.insert(#head < spec.cap and head or overflow, item)
+      else
+        table.insert(rest, item)
+      end
+    end
+
+    local n = #head
+    for _, tail in ipairs {overflow, rest} do
+      for _, item in ipairs(tail) do
+        table.insert(head, item)
+      end
+    end
+    return {items = head, head = n}
+  end
 
   COQ.lsp_pull = function(client, name, uid, lo, hi)
     coq.validate {
@@ -43,10 +86,16 @@
     }
 
     if uid > (cids[name] or -1) then
-      return {}
+      return {{}, false}
+    end
+
+    local acc = (accs[name] or {})[client] or {items = {}}
+    local items = acc.items
+    -- plausible items go out on their own, ahead of the rest
+    if acc.head and lo <= acc.head then
+      hi = math.min(hi, acc.head)
     end
 
-    local items = (accs[name] or {})[client] or {}
     local a = {}
     for i = lo, hi do
       local item = items[i]
@@ -57,7 +106,7 @@
       end
     end
 
-    return a
+    return {a, items[lo + #a] ~= nil}
   end
 
   local lsp_notify = function(payload)
@@ -80,10 +129,10 @@
       if type(reply) == "table" then
         accs[name] = accs[name] or {}
         if type(reply.items) == "table" then
-          accs[name][client] = reply.items
+          accs[name][client] = prefilter(filters[name], reply.items)
           reply.items = {}
         else
-          accs[name][client] = reply
+          accs[name][client] = prefilter(filters[name], reply)
           payload.reply = {}
         end
       end
@@ -354,7 +403,23 @@
       )
     end
 
-    COQ.lsp_comp = function(name, multipart, session_id, client_names, pos)
+    COQ.lsp_comp = function(
+      name,
+      multipart,
+      session_id,
+      client_names,
+      pos,
+      spec)
+      if type(spec) == "table" then
+        coq.validate {
+          prefix = {spec.prefix, "string"},
+          cap = {spec.cap, "number"}
+        }
+        filters[name] = spec
+      else
+        filters[name] = nil
+      end
+
       lsp_comp_base(
         "textDocument/completion",
         nil,
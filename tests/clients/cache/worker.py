@@ -0,0 +1,170 @@
+from dataclasses import replace
+from types import SimpleNamespace
+from typing import Any, Sequence, cast
+from unittest import TestCase
+
+from ....coq.clients.cache.db.database import Database
+from ....coq.clients.cache.worker import CacheWorker
+from ....coq.shared.context import EMPTY_CONTEXT
+from ....coq.shared.repeat import materialise, sanitize
+from ....coq.shared.types import UTF8, Completion, Context, Doc, Edit, RangeEdit
+
+
+def _supervisor(max_items: int, max_bytes: int = 2**32) -> Any:
+    return SimpleNamespace(
+        match=SimpleNamespace(
+            unifying_chars={"_"},
+            look_ahead=2,
+            fuzzy_cutoff=0.6,
+            exact_matches=2,
+            max_results=99,
+        ),
+        comp=SimpleNamespace(smart=True),
+        limits=SimpleNamespace(cache_max_items=max_items, cache_max_bytes=max_bytes),
+    )
+
+
+def _ctx(row: int, words: str) -> Context:
+    col = len(words)
+    return replace(
+        EMPTY_CONTEXT,
+        manual=False,
+        position=(row, col),
+        cursor=(row, col, col, col),
+        line=words,
+        line_before=words,
+        words=words,
+        words_before=words,
+        syms=words,
+        syms_before=words,
+    )
+
+
+def _comps(*words: str) -> Sequence[Completion]:
+    return tuple(
+        Completion(
+            source="",
+            always_on_top=False,
+            weight_adjust=0,
+            label=word,
+            sort_by=word,
+            primary_edit=Edit(new_text=word),
+            adjust_indent=False,
+            icon_match=None,
+        )
+        for word in words
+    )
+
+
+def _get(cache: CacheWorker, ctx: Context) -> Sequence[str]:
+    _, _, comps = cache.apply_cache(ctx, always=True, inline_shift=False)
+    return sorted(comp.sort_by for comp in comps)
+
+
+class Slots(TestCase):
+    def test_1(self) -> None:
+        cache = CacheWorker(cast(Any, _supervisor(max_items=99)))
+
+        self.assertEqual(_get(cache, _ctx(1, "ab")), [])
+        cache.set_cache({None: _comps("abc", "abd")}, skip_db=True)
+        self.assertEqual(_get(cache, _ctx(2, "ab")), [])
+        cache.set_cache({None: _comps("abe")}, skip_db=True)
+
+        self.assertEqual(_get(cache, _ctx(1, "ab")), ["abc", "abd"])
+        self.assertEqual(_get(cache, _ctx(2, "ab")), ["abe"])
+
+        stats = cache.stats()
+        self.assertEqual((stats.hits, stats.misses), (2, 2))
+
+    def test_2(self) -> None:
+        cache = CacheWorker(cast(Any, _supervisor(max_items=3)))
+
+        _get(cache, _ctx(1, "ab"))
+        cache.set_cache({None: _comps("ab1", "ab2")}, skip_db=False)
+        _get(cache, _ctx(2, "ab"))
+        cache.set_cache({None: _comps("ab3", "ab4")}, skip_db=False)
+
+        self.assertEqual(_get(cache, _ctx(1, "ab")), ["ab2"])
+        stats = cache.stats()
+        self.assertEqual((stats.entries, stats.evicted), (3, 1))
+
+    def test_3(self) -> None:
+        cache = CacheWorker(cast(Any, _supervisor(max_items=99)))
+        edit = RangeEdit(
+            new_text="abc",
+            begin=(1, 0),
+            end=(1, 2),
+            cursor_pos=2,
+            encoding=UTF8,
+            fallback=None,
+        )
+        (comp,) = _comps("abc")
+        comp = replace(comp, primary_edit=edit)
+
+        cache.apply_cache(_ctx(1, "ab"), always=True, inline_shift=True)
+        cache.set_cache({None: (comp,)}, skip_db=True)
+
+        ctx = _ctx(1, "abx")
+        hits = [
+            tuple(cache.apply_cache(ctx, always=True, inline_shift=True)[2])
+            for _ in range(2)
+        ]
+        (c1,), (c2,) = hits
+        self.assertIs(c1, c2)
+        self.assertTrue(c1.relative)
+        self.assertEqual(
+            materialise(ctx.cursor, comp=c1).primary_edit,
+            sanitize(True, cursor=ctx.cursor, edit=edit),
+        )
+
+    def test_4(self) -> None:
+        """
+        One large item late in a response still counts against the byte budget
+        """
+
+        cache = CacheWorker(cast(Any, _supervisor(max_items=99, max_bytes=9999)))
+        *small, big = _comps(*(f"ab{i}" for i in range(9)))
+        big = replace(big, doc=Doc(text="x" * 9999, syntax=""))
+
+        _get(cache, _ctx(1, "ab"))
+        cache.set_cache({None: (*small, big)}, skip_db=False)
+
+        stats = cache.stats()
+        self.assertLessEqual(stats.size, 9999)
+        self.assertEqual(stats.entries + stats.evicted, 9)
+        (count,) = cache._db._conn.execute("SELECT COUNT(*) FROM words").fetchone()
+        self.assertEqual(count, stats.entries)
+
+
+class Generations(TestCase):
+    def test_1(self) -> None:
+        db = Database()
+        opts = _supervisor(max_items=99).match
+
+        def words() -> Sequence[str]:
+            rows = db.select((1, 1), opts=opts, word="ab", sym="ab", limitless=False)
+            return [word for _, word in rows]
+
+        db.insert((1, 1), keys=((b"1", "abc"),))
+        db.drop((1, 1))
+        self.assertEqual(words(), [])
+
+        db.insert((1, 1), keys=((b"2", "abd"),))
+        self.assertEqual(words(), ["abd"])
+
+        self.assertEqual(db.prune(limit=99), 1)
+        (count,) = db._conn.execute("SELECT COUNT(*) FROM words").fetchone()
+        self.assertEqual(count, 1)
+
+    def test_2(self) -> None:
+        db = Database()
+
+        keys = tuple((str(i).encode(), f"w{i}") for i in range(5))
+        db.insert((1, 1), keys=keys)
+        db.drop((1, 1))
+
+        self.assertEqual(db.prune(limit=2), 2)
+        self.assertEqual(db.prune(limit=2), 2)
+        self.assertEqual(db.prune(limit=2), 1)
+        self.assertEqual(db.prune(limit=2), 0)
+        self.assertFalse(db._stale)
@@ -0,0 +1,160 @@
+from pathlib import Path
+from random import Random
+from tempfile import TemporaryDirectory
+from typing import Callable, Mapping
+from unittest import TestCase
+
+from ....coq.clients.lsp.mul_bandit import MultiArmedBandit, _Dist
+
+_TIMEOUT = 0.2
+
+
+def _trace(
+    bandit: MultiArmedBandit,
+    filetype: str,
+    latencies: Mapping[str, Callable[[], float]],
+    n: int = 999,
+) -> None:
+    for _ in range(n):
+        elapsed = {client: latency() for client, latency in latencies.items()}
+        bandit.update(
+            filetype,
+            timeout=_TIMEOUT,
+            observed=_TIMEOUT,
+            asked=elapsed.keys(),
+            elapsed=elapsed,
+        )
+
+
+class Dist(TestCase):
+    def test_1(self) -> None:
+        rand = Random(0)
+        xs = [rand.lognormvariate(-4, 0.5) for _ in range(999)]
+        dist = _Dist()
+        for x in xs:
+            dist.update(x)
+
+        xs.sort()
+        for q in (0.5, 0.9, 0.99):
+            actual = xs[round(q * (len(xs) - 1))]
+            self.assertAlmostEqual(dist.quantile(q) / actual, 1, delta=0.25)
+
+
+    def test_2(self) -> None:
+        dist = _Dist()
+        for _ in range(99):
+            dist.update(0.01)
+        self.assertEqual(dist.cdf(0.005), 0)
+        self.assertEqual(dist.cdf(1), 1)
+
+        dist.censor(0.05)
+        self.assertGreater(dist.quantile(0.999), 1)
+
+
+class Bandit(TestCase):
+    def test_1(self) -> None:
+        bandit = MultiArmedBandit()
+        self.assertEqual(bandit.wait("c", timeout=_TIMEOUT), _TIMEOUT)
+
+    def test_2(self) -> None:
+        rand = Random(0)
+        bandit = MultiArmedBandit()
+        _trace(bandit, "c", {"fast": lambda: rand.uniform(0.01, 0.03)})
+
+        wait = bandit.wait("c", timeout=_TIMEOUT)
+        self.assertGreater(wait, 0.02)
+        self.assertLess(wait, 0.05)
+
+    def test_3(self) -> None:
+        """
+        Hearing back from a slower server is worth the wait, within the timeout
+        """
+
+        rand = Random(0)
+        bandit = MultiArmedBandit()
+        _trace(
+            bandit,
+            "ts",
+            {
+                "fast": lambda: rand.uniform(0.01, 0.03),
+                "slow": lambda: rand.uniform(0.1, 0.15),
+            },
+        )
+        _trace(bandit, "c", {"fast": lambda: rand.uniform(0.01, 0.03)})
+
+        self.assertGreater(bandit.wait("ts", timeout=_TIMEOUT), 0.1)
+        self.assertLess(bandit.wait("c", timeout=_TIMEOUT), 0.05)
+
+    def test_4(self) -> None:
+        rand = Random(0)
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "lsp" / "LS.json"
+            bandit = MultiArmedBandit(path)
+            _trace(bandit, "c", {"fast": lambda: rand.uniform(0.01, 0.03)})
+            bandit.dump()
+
+            loaded = MultiArmedBandit(path)
+            self.assertEqual(
+                loaded.wait("c", timeout=_TIMEOUT), bandit.wait("c", timeout=_TIMEOUT)
+            )
+
+            for corrupt in (
+                "{",
+                "[]",
+                '{"dists": []}',
+                '{"dists": {"c": {"fast": [1]}}}',
+                '{"dists": {"c": {"fast": [1]}}, "rewards": {"c": [1, 1, 1, 1, "x"]}}',
+            ):
+                with self.subTest(corrupt=corrupt):
+                    path.write_text(corrupt)
+                    loaded = MultiArmedBandit(path)
+                    self.assertEqual(loaded.wait("c", timeout=_TIMEOUT), _TIMEOUT)
+                    self.assertFalse(loaded._dists)
+
+    def test_5(self) -> None:
+        """
+        A server that stops answering no longer holds up the wait
+        """
+
+        rand = Random(0)
+        bandit = MultiArmedBandit()
+        _trace(
+            bandit,
+            "ts",
+            {
+                "fast": lambda: rand.uniform(0.01, 0.03),
+                "slow": lambda: rand.uniform(0.1, 0.15),
+            },
+        )
+        self.assertGreater(bandit.wait("ts", timeout=_TIMEOUT), 0.1)
+
+        _trace(bandit, "ts", {"fast": lambda: rand.uniform(0.01, 0.03)})
+        self.assertLess(bandit.wait("ts", timeout=_TIMEOUT), 0.05)
+        self.assertEqual(bandit._dists["ts"].keys(), {"fast"})
+
+    def test_6(self) -> None:
+        """
+        A server that keeps missing the wait is still waited for, not forgotten
+        """
+
+        rand = Random(0)
+        bandit = MultiArmedBandit()
+        _trace(bandit, "ts", {"fast": lambda: rand.uniform(0.01, 0.03)})
+        self.assertLess(bandit.wait("ts", timeout=_TIMEOUT), 0.05)
+
+        for _ in range(999):
+            wait = bandit.wait("ts", timeout=_TIMEOUT)
+            latencies = {
+                "fast": rand.uniform(0.01, 0.03),
+                "slow": rand.uniform(0.1, 0.15),
+            }
+            bandit.update(
+                "ts",
+                timeout=_TIMEOUT,
+                observed=wait,
+                asked=latencies.keys(),
+                elapsed={c: t for c, t in latencies.items() if t <= wait},
+            )
+
+        self.assertGreater(bandit.wait("ts", timeout=_TIMEOUT), 0.1)
+        self.assertIn("slow", bandit._dists["ts"])
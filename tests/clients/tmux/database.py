@@ -0,0 +1,40 @@
+from unittest import TestCase
+
+from ....coq.clients.tmux.db.database import TMDB
+from ....coq.tmux.parse import Pane
+
+
+def _pane(uid: str) -> Pane:
+    return Pane(
+        session="s",
+        uid=uid,
+        session_name="s",
+        window_index=0,
+        window_name="w",
+        pane_index=0,
+        pane_title="t",
+    )
+
+
+class Evict(TestCase):
+    def test_1(self) -> None:
+        """
+        Unchanged panes are read back in after an eviction
+        """
+
+        db = TMDB(999, unifying_chars={"_"}, include_syms=False)
+
+        def count() -> int:
+            (n,) = db._conn.execute("SELECT COUNT(*) FROM words").fetchone()
+            return n
+
+        panes = {_pane("%1"): "abc def"}
+        db.periodical(None, panes=panes)
+        self.assertEqual(count(), 2)
+
+        db.evict()
+        self.assertEqual(count(), 0)
+        self.assertFalse(db._cache)
+
+        db.periodical(None, panes=panes)
+        self.assertEqual(count(), 2)
@@ -0,0 +1,184 @@
+from contextlib import closing
+from itertools import count
+from pathlib import Path
+from random import Random
+from sqlite3 import OperationalError, connect
+from tempfile import TemporaryDirectory
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import MagicMock, patch
+
+from ....coq.databases.insertions import database
+from ....coq.databases.insertions.database import IDB
+
+_DAY = 24 * 60 * 60
+_RETENTION = 60 * 60
+_SOURCES = ("buf", "lsp")
+_WORDS = tuple(f"word_{i}" for i in range(50))
+
+_LEGACY = """
+CREATE TABLE sources (
+  name TEXT NOT NULL PRIMARY KEY
+) WITHOUT ROWID;
+CREATE TABLE batches (
+  rowid BLOB NOT NULL PRIMARY KEY
+) WITHOUT rowid;
+CREATE TABLE instances (
+  rowid     BLOB NOT NULL PRIMARY KEY,
+  source_id TEXT NOT NULL REFERENCES sources (name)  ON DELETE CASCADE,
+  batch_id  BLOB NOT NULL REFERENCES batches (rowid) ON DELETE CASCADE
+) WITHOUT rowid;
+CREATE TABLE instance_stats (
+  instance_id BLOB    NOT NULL REFERENCES instances (rowid) ON DELETE CASCADE,
+  interrupted INTEGER NOT NULL,
+  duration    REAL    NOT NULL,
+  items       INTEGER NOT NULL
+);
+CREATE TABLE inserted (
+  rowid       INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+  instance_id BLOB    NOT NULL REFERENCES instances (rowid) ON DELETE CASCADE,
+  sort_by     TEXT    NOT NULL
+);
+CREATE VIEW stats_inserted_view AS SELECT sort_by FROM inserted;
+INSERT INTO sources VALUES ('buf');
+INSERT INTO batches VALUES (x'00');
+INSERT INTO instances VALUES (x'01', 'buf', x'00');
+INSERT INTO instance_stats VALUES (x'01', 0, 0.5, 9);
+INSERT INTO inserted (instance_id, sort_by) VALUES (x'01', 'word');
+"""
+
+
+class Retention(IsolatedAsyncioTestCase):
+    async def test_1(self) -> None:
+        rand = Random(0)
+        now = 0.0
+        db = IDB(retention=_RETENTION, clock=lambda: now)
+        uids = (i.to_bytes(8, "big") for i in count())
+
+        for source in _SOURCES:
+            db.new_source(source)
+
+        keystrokes = 0
+        while now < _DAY:
+            now += rand.expovariate(1 / 5)
+            keystrokes += 1
+
+            batch = next(uids)
+            db.new_batch(batch)
+            for source in _SOURCES:
+                instance = next(uids)
+                db.new_instance(instance, source=source, batch_id=batch)
+                db.new_stat(
+                    instance,
+                    interrupted=rand.random() < 0.1,
+                    exceeded=rand.random() < 0.01,
+                    duration=rand.expovariate(1 / 0.05),
+                    cpu=rand.expovariate(1 / 0.005),
+                    items=rand.randint(0, 99),
+                )
+                if rand.random() < 0.05:
+                    db.inserted(instance, sort_by=rand.choice(_WORDS))
+
+            if keystrokes % 100 == 0:
+                db.compact()
+
+        db.compact()
+
+        with closing(db._conn.cursor()) as cursor:
+            cursor.execute("SELECT COUNT(*), MIN(created) FROM batches")
+            (batches, oldest), *_ = cursor.fetchall()
+            self.assertLess(batches, keystrokes / 10)
+            self.assertGreaterEqual(oldest, now - _RETENTION)
+
+            cursor.execute(
+                """
+                SELECT COUNT(*), COUNT(instance_id)
+                FROM inserted
+                """
+            )
+            (inserted, live), *_ = cursor.fetchall()
+            self.assertGreater(inserted, 0)
+            self.assertEqual(inserted, live)
+
+        for stat in db.stats():
+            self.assertGreater(stat.q50_duration, 0)
+            self.assertGreater(stat.interrupted, 0)
+            self.assertGreater(stat.exceeded, 0)
+            self.assertLess(stat.q50_cpu, stat.q50_duration)
+        self.assertEqual(
+            sum(summary.duration.count for summary in db._summaries.values()),
+            keystrokes * len(_SOURCES),
+        )
+
+
+class Flush(IsolatedAsyncioTestCase):
+    async def test_1(self) -> None:
+        """
+        Rows that can never land, i.e. an old schema, are dropped, not requeued
+        """
+
+        db = IDB(retention=_RETENTION)
+        db.new_source("buf")
+        db._enqueue("INSERT INTO sources (nope) VALUES (:name)", {"name": "lsp"})
+        db.new_source("tmux")
+        db.flush()
+
+        self.assertEqual(db._pending, [])
+        with closing(db._conn.cursor()) as cursor:
+            cursor.execute("SELECT name FROM sources ORDER BY name")
+            self.assertEqual([name for name, in cursor.fetchall()], ["buf", "tmux"])
+
+
+    async def test_2(self) -> None:
+        """
+        While the DB stays locked, the queue is capped, oldest rows first
+        """
+
+        db = IDB(retention=_RETENTION)
+        db._conn = MagicMock()
+        db._conn.__enter__.side_effect = OperationalError("database is locked")
+
+        with patch.object(database, "_MAX_PENDING", 9), patch.object(
+            database.log, "warning"
+        ) as warning:
+            for i in range(99):
+                db.new_batch(bytes((i,)))
+                db.flush()
+
+        self.assertEqual(len(db._pending), 9)
+        _, params = db._pending[0]
+        self.assertEqual(params["rowid"], bytes((90,)))
+        warning.assert_called_once()
+
+
+class Migrate(IsolatedAsyncioTestCase):
+    async def test_1(self) -> None:
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "insertions.sqlite3"
+            with closing(connect(path)) as conn:
+                conn.executescript(_LEGACY)
+
+            with patch.object(database, "INSERT_DB", path):
+                db = IDB(retention=_RETENTION)
+                (stat,) = db.stats()
+                self.assertEqual(stat.q50_items, 9)
+                with closing(db._conn.cursor()) as cursor:
+                    cursor.execute("SELECT DISTINCT sort_by FROM inserted")
+                    self.assertEqual([sort_by for sort_by, in cursor], ["word"])
+
+                db.new_batch(b"\x02")
+                db.new_instance(b"\x03", source="buf", batch_id=b"\x02")
+                db.new_stat(
+                    b"\x03",
+                    interrupted=False,
+                    exceeded=True,
+                    duration=0.1,
+                    cpu=0.01,
+                    items=1,
+                )
+                db.compact()
+                self.assertEqual(db._pending, [])
+                (stat,) = db.stats()
+                self.assertEqual(stat.inserted, 1)
+
+                # once migrated, opening again leaves the schema alone
+                IDB(retention=_RETENTION)
@@ -0,0 +1,83 @@
+from dataclasses import replace
+from unittest import TestCase
+
+from ...coq.lsp.parse import _item_parser, _shallow
+from ...coq.lsp.types import InsertReplaceEdit, MarkupContent, TextEdit
+
+_RANGE = {"start": {"line": 1, "character": 2}, "end": {"line": 1, "character": 4}}
+
+
+class Shallow(TestCase):
+    def test_1(self) -> None:
+        item = {
+            "label": "abc",
+            "kind": 3,
+            "documentation": {"kind": "markdown", "value": "doc"},
+            "textEdit": {"newText": "abc", "range": _RANGE},
+            "additionalTextEdits": [{"newText": "", "range": _RANGE}],
+            "command": {"title": "", "command": "cmd"},
+            "data": {"anything": None},
+        }
+        parsed = _shallow(item)
+        assert parsed
+        self.assertEqual(parsed.label, "abc")
+        self.assertEqual(parsed.kind, 3)
+        self.assertEqual(
+            parsed.documentation, MarkupContent(kind="markdown", value="doc")
+        )
+        self.assertIsInstance(parsed.textEdit, TextEdit)
+        self.assertEqual(len(parsed.additionalTextEdits or ()), 1)
+
+    def test_2(self) -> None:
+        item = {
+            "label": "abc",
+            "textEdit": {"newText": "abc", "insert": _RANGE, "replace": _RANGE},
+        }
+        parsed = _shallow(item)
+        assert parsed
+        self.assertIsInstance(parsed.textEdit, InsertReplaceEdit)
+
+    def test_3(self) -> None:
+        for item in (
+            {"label": 1},
+            {"label": "abc", "kind": "3"},
+            {"label": "abc", "documentation": {"value": "doc"}},
+            {"label": "abc", "textEdit": {"newText": "abc"}},
+            {"label": "abc", "additionalTextEdits": {}},
+            {"label": "abc", "command": "cmd"},
+            {"label": "abc", "command": {"command": "cmd"}},
+        ):
+            with self.subTest(item=item):
+                self.assertIsNone(_shallow(item))
+
+    def test_4(self) -> None:
+        """
+        Same as the full decoder, short of what is left raw
+        """
+
+        for item in (
+            {"label": "abc", "kind": 3, "detail": "d", "filterText": "ab"},
+            {"label": "abc", "labelDetails": {"detail": "()"}, "preselect": True},
+            {"label": "abc", "documentation": "doc", "insertText": "abc()"},
+            {"label": "abc", "insertTextFormat": 2, "insertTextMode": 1},
+            {
+                "label": "abc",
+                "textEdit": {"newText": "abc", "range": _RANGE},
+                "additionalTextEdits": [{"newText": "", "range": _RANGE}],
+                "command": {"title": "", "command": "cmd"},
+                "tags": [1],
+                "data": 1,
+            },
+        ):
+            with self.subTest(item=item):
+                go, full = _item_parser(item)
+                self.assertTrue(go)
+                edits = full.additionalTextEdits
+                expected = replace(
+                    full,
+                    tags=None,
+                    command=None,
+                    data=None,
+                    additionalTextEdits=None if edits is None else tuple(edits),
+                )
+                self.assertEqual(_shallow(item), expected)
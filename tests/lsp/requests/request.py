@@ -0,0 +1,61 @@
+from asyncio import run
+from typing import Any, MutableSequence, Sequence, Tuple
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from ....coq.lsp.requests import request
+from ....coq.lsp.requests.request import _lsp_pull
+
+_Page = Tuple[Sequence[str], bool]
+
+
+def _pull(
+    n: int, pages: Sequence[_Page]
+) -> Tuple[Sequence[Sequence[str]], Sequence[Tuple[int, int]]]:
+    spans: MutableSequence[Tuple[int, int]] = []
+
+    async def exec_lua(_: Any, __: str, args: Sequence[Any]) -> _Page:
+        *_, lo, hi = args
+        spans.append((lo, hi))
+        return pages[len(spans) - 1]
+
+    nvim = MagicMock()
+    nvim.api.exec_lua = exec_lua
+
+    async def cont() -> Sequence[Sequence[str]]:
+        return [part async for part in _lsp_pull(n, name="n", client="c", uid=1)]
+
+    with patch.object(request, "Nvim", nvim):
+        return run(cont()), spans
+
+
+class Pull(TestCase):
+    def test_1(self) -> None:
+        parts, spans = _pull(3, pages=((["a", "b", "c"], False),))
+        self.assertEqual(parts, [["a", "b", "c"]])
+        self.assertEqual(spans, [(1, 3)])
+
+    def test_2(self) -> None:
+        """
+        Short prefiltered head pages, then the rest in full pages
+        """
+
+        pages = (
+            (["a"], True),
+            (["b", "c"], True),
+            (["d", "e", "f"], True),
+            (["g"], False),
+        )
+        parts, spans = _pull(3, pages=pages)
+        self.assertEqual(parts, [list(part) for part, _ in pages])
+        self.assertEqual(spans, [(1, 3), (2, 4), (4, 6), (7, 9)])
+
+    def test_3(self) -> None:
+        """
+        An empty page that claims more ends the pull, instead of spinning on it
+        """
+
+        pages = ((["a"], True), ([], True), (["b"], False))
+        parts, spans = _pull(3, pages=pages)
+        self.assertEqual(parts, [["a"]])
+        self.assertEqual(spans, [(1, 3), (2, 4)])
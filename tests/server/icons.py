@@ -0,0 +1,41 @@
+from itertools import product
+from unittest import TestCase
+
+from ...coq.server.icons import has_kind, iconify
+from ...coq.shared.settings import IconMode, Icons
+from ...coq.shared.types import Completion, Edit
+
+
+class HasKind(TestCase):
+    def test_1(self) -> None:
+        """
+        Ranking breaks ties on `has_kind`, before icons are applied to the menu
+        """
+
+        for mode, spacing, icon_match, kind in product(
+            IconMode,
+            (0, 1, 2),
+            (None, "", "Fn", "Alias", "Empty", "Missing"),
+            ("", "fn"),
+        ):
+            icons = Icons(
+                mode=mode,
+                spacing=spacing,
+                aliases={"Alias": "Fn"},
+                mappings={"Fn": "F", "Empty": ""},
+            )
+            comp = Completion(
+                source="",
+                always_on_top=False,
+                weight_adjust=0,
+                label="",
+                sort_by="",
+                primary_edit=Edit(new_text=""),
+                adjust_indent=False,
+                icon_match=icon_match,
+                kind=kind,
+            )
+            self.assertEqual(
+                has_kind(icons, completion=comp),
+                bool(iconify(icons, completion=comp).kind),
+            )
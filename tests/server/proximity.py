@@ -0,0 +1,76 @@
+from collections import Counter
+from itertools import chain
+from random import choice, randint
+from typing import MutableSequence, Sequence
+from unittest import TestCase
+
+from ...coq.server.proximity import Proximity
+from ...coq.shared.parse import coalesce
+
+_UNIFYING = {"_", "-"}
+_WORDS = ("abc", "def", "a_b", "x-y", "(", "12", "zz")
+
+
+def _line() -> str:
+    return " ".join(choice(_WORDS) for _ in range(randint(0, 6)))
+
+
+def _naive(lines: Sequence[str]) -> Counter:
+    words = chain.from_iterable(
+        coalesce(_UNIFYING, include_syms=True, backwards=None, chars=line)
+        for line in lines
+    )
+    return Counter(words)
+
+
+def _edit(proximity: Proximity, buf_id: int, buf: MutableSequence[str]) -> None:
+    lo = randint(0, len(buf))
+    hi = randint(lo, min(len(buf), lo + 3))
+    lines = [_line() for _ in range(randint(0, 3))]
+    buf[lo:hi] = lines
+    proximity.changed(buf_id, lo=lo, hi=hi, lines=lines)
+
+
+class Incremental(TestCase):
+    def test_1(self) -> None:
+        """
+        Edits as lines events, then the window moves
+        """
+
+        proximity = Proximity(_UNIFYING)
+        bufs = {1: [_line() for _ in range(50)], 2: [_line() for _ in range(50)]}
+        buf_id = 1
+        for _ in range(999):
+            for _ in range(randint(0, 3)):
+                edited = choice(tuple(bufs))
+                _edit(proximity, buf_id=edited, buf=bufs[edited])
+            if randint(0, 9) == 0:
+                buf_id = choice(tuple(bufs))
+
+            buf = bufs[buf_id]
+            lo = randint(0, len(buf))
+            lines = buf[lo : lo + randint(0, 20)]
+            words = proximity.update(buf_id, lo=lo, lines=lines, verify=False)
+            self.assertEqual(dict(words), dict(_naive(lines)))
+
+    def test_2(self) -> None:
+        """
+        Unseen edits are picked up with `verify`
+        """
+
+        proximity = Proximity(_UNIFYING)
+        buf = [_line() for _ in range(50)]
+        for _ in range(999):
+            buf[randint(0, len(buf) - 1)] = _line()
+            lo = randint(0, len(buf))
+            lines = buf[lo : lo + randint(0, 20)]
+            words = proximity.update(1, lo=lo, lines=lines, verify=True)
+            self.assertEqual(dict(words), dict(_naive(lines)))
+
+    def test_3(self) -> None:
+        proximity = Proximity(_UNIFYING)
+        words = proximity.update(1, lo=0, lines=("abc def",), verify=False)
+        proximity.update(1, lo=0, lines=("zz",), verify=True)
+        self.assertEqual(dict(words), {"zz": 1})
+        with self.assertRaises(TypeError):
+            words["zz"] = 2  # type: ignore
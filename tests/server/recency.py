@@ -0,0 +1,66 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Iterable
+from unittest import TestCase
+
+from ...coq.server.recency import Recency
+
+
+def _seed(recency: Recency, words: Iterable[str]) -> None:
+    """
+    Oldest first
+    """
+
+    for word in words:
+        recency.inserted(word)
+
+
+class Decay(TestCase):
+    def test_1(self) -> None:
+        recency = Recency(capacity=10, half_life=1)
+        _seed(recency, ("a", "b"))
+        self.assertAlmostEqual(recency.scores["b"] / recency.scores["a"], 2)
+
+    def test_2(self) -> None:
+        recency = Recency(capacity=10, half_life=5)
+        _seed(recency, ("a", "a", "a", "b"))
+        self.assertGreater(recency.scores["a"], recency.scores["b"])
+        _seed(recency, "b" * 9)
+        self.assertGreater(recency.scores["b"], recency.scores["a"])
+
+    def test_3(self) -> None:
+        recency = Recency(capacity=3, half_life=10)
+        _seed(recency, ("a", "b", "c", "a", "d"))
+        self.assertEqual(recency.scores.keys(), {"a", "c", "d"})
+
+    def test_4(self) -> None:
+        recency = Recency(capacity=3, half_life=0.01)
+        _seed(recency, "ab" * 999)
+        self.assertAlmostEqual(recency.scores["b"] / recency.scores["a"], 2**100)
+
+    def test_5(self) -> None:
+        recency = Recency(capacity=10, half_life=1)
+        _seed(recency, ("a",))
+        scores = recency.scores
+        _seed(recency, ("b",))
+        self.assertEqual(scores.keys(), {"a"})
+
+
+class Persist(TestCase):
+    def test_1(self) -> None:
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "recency.json"
+            recency = Recency(capacity=2, half_life=1, path=path)
+            _seed(recency, ("a", "b", "c"))
+            recency.dump()
+
+            loaded = Recency(capacity=2, half_life=1, path=path)
+            self.assertEqual(loaded.scores.keys(), {"b", "c"})
+            self.assertAlmostEqual(loaded.scores["c"] / loaded.scores["b"], 2)
+
+            _seed(loaded, ("b",))
+            self.assertGreater(loaded.scores["b"], loaded.scores["c"])
+
+            for corrupt in ("{", "[]", '{"a": "x"}'):
+                path.write_text(corrupt)
+                self.assertEqual(Recency(capacity=2, half_life=1, path=path).scores, {})
@@ -0,0 +1,49 @@
+from itertools import islice
+from random import Random
+from typing import Any, Sequence
+from unittest import TestCase, skipUnless
+
+from ...coq.server.trans import _np, _order_np, _order_py
+
+
+def _columns(rand: Random, n: int) -> Any:
+    # few distinct values, to exercise every tie breaker
+    def ints(hi: int) -> Sequence[int]:
+        return [-rand.randint(0, hi) for _ in range(n)]
+
+    weights = [[rand.choice((0.0, 0.5, 1.0, 2.0)) for _ in range(n)] for _ in range(4)]
+    divisors = [sum(col) for col in weights]
+    divisors[rand.randrange(4)] = 0
+    return dict(
+        divisors=divisors,
+        weights=weights,
+        adjusts=[rand.choice((0.5, 1.0)) for _ in range(n)],
+        heads=ints(3),
+        secs=ints(2),
+        bits=ints(15),
+        collation=[rand.choice("aAbB_1") for _ in range(n)],
+    )
+
+
+class Order(TestCase):
+    @skipUnless(_np, "numpy")
+    def test_1(self) -> None:
+        rand = Random(0)
+        for n in (0, 1, 9, 999, 2000):
+            columns = _columns(rand, n=n)
+            py = [*_order_py(True, **columns)]
+            np = [*_order_np(_np, **columns)]
+            self.assertEqual(py, np)
+
+    def test_2(self) -> None:
+        """
+        Auto completion pops the heap lazily, its head must match a full sort
+        """
+
+        rand = Random(1)
+        for n in (0, 1, 9, 999):
+            columns = _columns(rand, n=n)
+            for top in (1, 9, n):
+                lazy = [*islice(_order_py(False, **columns), top)]
+                full = [*islice(_order_py(True, **columns), top)]
+                self.assertEqual(lazy, full)
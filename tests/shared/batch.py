@@ -0,0 +1,103 @@
+from asyncio import gather, run
+from typing import Any, Callable, MutableSequence, Sequence, Tuple
+from unittest import TestCase
+from unittest.mock import patch
+
+from ...coq.shared import batch
+from ...coq.shared.batch import AutoBatch, NvimError
+
+
+class _Atomic:
+    """
+    `nvim_call_atomic`, aborting on the first failed call
+    """
+
+    commits: MutableSequence[Sequence[Tuple[str, Sequence[Any]]]] = []
+    call: Callable[[str, Sequence[Any]], Any] = lambda _, args: args[0]
+
+    def __init__(self) -> None:
+        self._calls: MutableSequence[Tuple[str, Sequence[Any]]] = []
+
+    def __getattr__(self, method: str) -> Callable[..., None]:
+        return lambda *args: self._calls.append((method, args))
+
+    async def commit(self, _: Any) -> Sequence[Any]:
+        self.commits.append(self._calls)
+        return [type(self).call(method, args) for method, args in self._calls]
+
+
+def _run(call: Callable[[str, Sequence[Any]], Any], *coros: Any) -> Sequence[Any]:
+    _Atomic.commits, _Atomic.call = [], call
+
+    async def cont() -> Sequence[Any]:
+        return await gather(*coros, return_exceptions=True)
+
+    with patch.object(batch, "Atomic", _Atomic):
+        return run(cont())
+
+
+class Batch(TestCase):
+    def test_1(self) -> None:
+        b = AutoBatch()
+        rets = _run(
+            lambda _, args: args[0],
+            b.buf_get_name(str, "a"),
+            b.buf_line_count(int, 2),
+        )
+        self.assertEqual(rets, ["a", 2])
+        self.assertEqual(len(_Atomic.commits), 1)
+
+    def test_2(self) -> None:
+        b = AutoBatch()
+        ret, *_ = _run(lambda _, args: args[0], b.buf_get_name(int, "a"))
+        self.assertIsInstance(ret, TypeError)
+
+    def test_3(self) -> None:
+        """
+        A failing call is replayed alone, the others still get their results
+        """
+
+        def call(method: str, args: Sequence[Any]) -> Any:
+            if method == "bad":
+                raise NvimError()
+            else:
+                return args[0]
+
+        b = AutoBatch()
+        rets = _run(call, b.good(int, 1), b.bad(int, 2), b.good(int, 3))
+        self.assertEqual(rets[::2], [1, 3])
+        self.assertIsInstance(rets[1], NvimError)
+
+    def test_4(self) -> None:
+        """
+        Calls left over by a replay that blows up are failed, not left hanging
+        """
+
+        def call(method: str, args: Sequence[Any]) -> Any:
+            if method == "bad":
+                raise NvimError()
+            elif len(_Atomic.commits) > 2:
+                raise ValueError()
+            else:
+                return args[0]
+
+        b = AutoBatch()
+        rets = _run(call, b.good(int, 1), b.bad(int, 2), b.good(int, 3))
+        self.assertEqual(rets[0], 1)
+        self.assertIsInstance(rets[1], NvimError)
+        self.assertIsInstance(rets[2], ValueError)
+
+    def test_5(self) -> None:
+        """
+        Arrays come back as either `list` or `tuple`
+        """
+
+        b = AutoBatch()
+        rets = _run(
+            lambda _, args: args[0],
+            b.win_get_cursor(tuple, [1, 2]),
+            b.buf_get_lines(list, (1, 2)),
+            b.buf_get_lines(tuple, {}),
+        )
+        self.assertEqual(rets[:2], [(1, 2), [1, 2]])
+        self.assertIsInstance(rets[2], TypeError)
@@ -0,0 +1,42 @@
+from asyncio import gather, run, sleep
+from time import thread_time
+from unittest import TestCase
+
+from ...coq.shared.cpu import CPUMeter
+
+
+async def _spin(steps: int) -> int:
+    for _ in range(steps):
+        sum(range(99999))
+        await sleep(0)
+    return steps
+
+
+class Meter(TestCase):
+    def test_1(self) -> None:
+        """
+        Only the metered coroutine's own steps count, not its neighbours'
+        """
+
+        busy, idle = CPUMeter(), CPUMeter()
+
+        async def cont() -> None:
+            t0 = thread_time()
+            ret, _ = await gather(busy.run(_spin(99)), idle.run(_spin(1)))
+            total = thread_time() - t0
+
+            self.assertEqual(ret, 99)
+            self.assertLess(idle.elapsed() * 9, busy.elapsed())
+            self.assertLessEqual(busy.elapsed() + idle.elapsed(), total)
+
+        run(cont())
+
+    def test_2(self) -> None:
+        meter = CPUMeter()
+
+        async def fail() -> None:
+            await sleep(0)
+            raise ValueError()
+
+        with self.assertRaises(ValueError):
+            run(meter.run(fail()))
@@ -0,0 +1,28 @@
+from asyncio import sleep
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from unittest import TestCase
+
+from ...coq.shared.executor import AsyncExecutor
+
+
+class QueueDepth(TestCase):
+    def test_1(self) -> None:
+        """
+        Jobs cancelled before they start still leave the queue
+        """
+
+        with ThreadPoolExecutor() as pool:
+            executor = AsyncExecutor(pool, name="test")
+            blocked = Event()
+            executor.fsubmit(blocked.wait)
+
+            futs = [executor.csubmit(sleep(0)) for _ in range(9)]
+            for fut in futs[::2]:
+                fut.cancel()
+            blocked.set()
+            for fut in futs[1::2]:
+                fut.result()
+
+            executor.fsubmit(lambda: None).result()
+            self.assertEqual(next(executor._submitted) - executor._started, 1)
@@ -0,0 +1,39 @@
+from gc import (
+    callbacks,
+    collect,
+    get_freeze_count,
+    get_threshold,
+    set_threshold,
+    unfreeze,
+)
+from unittest import TestCase
+
+from ...coq.shared import garbage
+from ...coq.shared.perf import snapshot
+
+
+class Collections(TestCase):
+    def setUp(self) -> None:
+        self._thresholds = get_threshold()
+
+    def tearDown(self) -> None:
+        unfreeze()
+        set_threshold(*self._thresholds)
+        callbacks.remove(garbage._on_gc)
+        garbage._DEFERRED = False
+
+    def test_1(self) -> None:
+        garbage.settle(None, on_idle=True, freeze=False)
+        t0, *_ = self._thresholds
+        self.assertEqual(get_threshold(), (t0 * 100, *self._thresholds[1:]))
+
+        collect()
+        garbage.drain()
+        self.assertIn("GC PAUSE -- gen2", snapshot())
+
+    def test_2(self) -> None:
+        garbage.settle(None, on_idle=False, freeze=False)
+        self.assertEqual(get_freeze_count(), 0)
+
+        garbage.settle(None, on_idle=False, freeze=True)
+        self.assertGreater(get_freeze_count(), 0)
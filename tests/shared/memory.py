@@ -0,0 +1,37 @@
+from dataclasses import dataclass
+from sys import getsizeof
+from unittest import TestCase
+
+from ...coq.shared.memory import sizeof
+from ...coq.shared.slots import slotted
+
+
+@slotted
+@dataclass(frozen=True)
+class _Slotted:
+    text: str
+
+
+@dataclass(frozen=True)
+class _Plain:
+    text: str
+
+
+class SizeOf(TestCase):
+    def test_1(self) -> None:
+        text = "x" * 9999
+        for cls in (_Slotted, _Plain):
+            with self.subTest(cls=cls):
+                self.assertGreater(sizeof(cls(text)), getsizeof(text))
+
+    def test_2(self) -> None:
+        text = "x" * 9999
+        shared = [_Slotted(text) for _ in range(10)]
+        owned = [_Slotted(str(i) * 9999) for i in range(10)]
+        self.assertLess(sizeof(shared), getsizeof(text) * 2)
+        self.assertGreater(sizeof(owned), getsizeof(text) * 10)
+
+    def test_3(self) -> None:
+        cyclic: dict = {}
+        cyclic["self"] = cyclic
+        self.assertEqual(sizeof(cyclic), getsizeof(cyclic) + getsizeof("self"))
@@ -0,0 +1,37 @@
+from threading import Thread
+from unittest import TestCase
+
+from ...coq.shared import perf
+from ...coq.shared.perf import record, snapshot
+
+
+class Counters(TestCase):
+    def test_1(self) -> None:
+        def cont() -> None:
+            for i in range(1, 1001):
+                record("TEST -- PERF", seconds=i / 1000)
+
+        threads = [Thread(target=cont) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        sketch = snapshot()["TEST -- PERF"]
+        self.assertEqual(sketch.count, 4000)
+        self.assertAlmostEqual(sketch.quantile(0.5), 0.5, delta=0.5 * 0.021)
+        self.assertAlmostEqual(sketch.quantile(0.99), 0.99, delta=0.99 * 0.021)
+
+    def test_2(self) -> None:
+        """
+        Exited threads leave their counts behind, not their tables
+        """
+
+        before = snapshot().get("TEST -- EXITED")
+        thread = Thread(target=record, args=("TEST -- EXITED", 1.0))
+        thread.start()
+        thread.join()
+
+        sketch = snapshot()["TEST -- EXITED"]
+        self.assertEqual(sketch.count, (before.count if before else 0) + 1)
+        self.assertNotIn(thread, perf._TABLES)
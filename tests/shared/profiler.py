@@ -0,0 +1,30 @@
+from threading import Event, Thread
+from time import sleep
+from unittest import TestCase
+
+from ...coq.shared.profiler import Sampler
+
+
+def _spin(done: Event) -> None:
+    while not done.is_set():
+        sum(range(999))
+
+
+class Folded(TestCase):
+    def test_1(self) -> None:
+        done = Event()
+        thread = Thread(name="coq-busy", target=_spin, args=(done,))
+        sampler = Sampler(rate=999)
+        thread.start()
+        sampler.start()
+        sleep(0.1)
+        folded = sampler.stop()
+        done.set()
+        thread.join()
+
+        lines = [line for line in folded.splitlines() if line.startswith("coq-busy;")]
+        self.assertTrue(lines)
+        for line in lines:
+            stack, _, count = line.rpartition(" ")
+            self.assertIn("profiler.py:_spin", stack)
+            self.assertGreater(int(count), 0)
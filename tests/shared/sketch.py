@@ -0,0 +1,48 @@
+from random import lognormvariate, randint, shuffle
+from unittest import TestCase
+
+from ...coq.shared.sketch import Sketch
+
+
+class Quantiles(TestCase):
+    def test_1(self) -> None:
+        sketch = Sketch()
+        self.assertEqual(sketch.quantile(0.5), 0)
+        self.assertEqual(sketch.avg, 0)
+
+    def test_2(self) -> None:
+        xs = [lognormvariate(-4, 1.5) for _ in range(9999)]
+        sketch = Sketch(accuracy=0.01)
+        for x in xs:
+            sketch.add(x)
+
+        xs.sort()
+        for q in (0.1, 0.5, 0.95, 0.99):
+            actual = xs[round(q * (len(xs) - 1))]
+            self.assertAlmostEqual(sketch.quantile(q) / actual, 1, delta=0.011)
+        self.assertAlmostEqual(sketch.avg, sum(xs) / len(xs))
+
+    def test_3(self) -> None:
+        xs = [randint(0, 99) for _ in range(999)]
+        whole, a, b = Sketch(), Sketch(), Sketch()
+        for x in xs:
+            whole.add(x)
+        shuffle(xs)
+        for x in xs[:500]:
+            a.add(x)
+        for x in xs[500:]:
+            b.add(x)
+
+        a.merge(b)
+        restored = Sketch()
+        restored.load(bytes(a))
+        for q in (0, 0.1, 0.5, 0.99, 1):
+            self.assertEqual(restored.quantile(q), whole.quantile(q))
+        self.assertEqual(restored.count, whole.count)
+
+    def test_4(self) -> None:
+        sketch = Sketch(max_buckets=8)
+        for x in range(1, 999):
+            sketch.add(x)
+        self.assertEqual(sketch.count, 998)
+        self.assertAlmostEqual(sketch.quantile(1) / 998, 1, delta=0.011)
@@ -0,0 +1,59 @@
+from dataclasses import FrozenInstanceError, dataclass, field, replace
+from typing import Sequence
+from unittest import TestCase
+
+from ...coq.shared.slots import evolve, slotted
+
+
+@slotted
+@dataclass(frozen=True)
+class _Base:
+    a: int
+    b: Sequence[int] = ()
+    c: Sequence[int] = field(default_factory=list)
+
+
+@slotted
+@dataclass(frozen=True)
+class _Child(_Base):
+    d: str = ""
+
+
+@dataclass(frozen=True)
+class _Plain:
+    a: int
+
+
+class Slotted(TestCase):
+    def test_1(self) -> None:
+        thing = _Child(1, d="d")
+        self.assertFalse(hasattr(thing, "__dict__"))
+        self.assertEqual(thing, _Child(a=1, b=(), c=[], d="d"))
+
+    def test_2(self) -> None:
+        thing = _Base(1)
+        with self.assertRaises(FrozenInstanceError):
+            setattr(thing, "a", 2)
+
+    def test_3(self) -> None:
+        lhs, rhs = _Base(1), _Base(1)
+        self.assertIsNot(lhs.c, rhs.c)
+
+
+class Evolve(TestCase):
+    def test_1(self) -> None:
+        thing = _Child(1, b=(2,), d="d")
+        self.assertEqual(evolve(thing, d="e"), replace(thing, d="e"))
+
+    def test_2(self) -> None:
+        thing = _Plain(1)
+        self.assertEqual(evolve(thing, a=2), _Plain(2))
+
+    def test_3(self) -> None:
+        """
+        Misspelt fields raise, same as `dataclasses.replace`
+        """
+
+        for thing in (_Child(1, b=(2,), d="d"), _Plain(1)):
+            with self.subTest(thing=thing), self.assertRaises(TypeError):
+                evolve(thing, e=1)
@@ -0,0 +1,47 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from ...coq.shared import sql
+from ...coq.shared.perf import snapshot
+
+
+class SlowQueries(TestCase):
+    def test_1(self) -> None:
+        conn = sql.connect(":memory:")
+        conn.execute("CREATE TABLE t (a TEXT NOT NULL)")
+        stmt = "SELECT COUNT(*) FROM t WHERE a = :a"
+
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "sql.log"
+            with patch.object(sql, "_SLOW", 0), patch.object(sql, "DEBUG", True):
+                with patch.object(sql, "SLOW_SQL_LOG", path):
+                    conn.cursor().executemany(
+                        "INSERT INTO t (a) VALUES (?)", ((str(i),) for i in range(9))
+                    )
+                    conn.cursor().execute(stmt, {"a": "1"})
+            log = path.read_text()
+
+        self.assertEqual(sql._shape({"a": "1", "b": 2}), ":a=str[1], :b=int")
+        plan, *_ = sql._PLANS[stmt]
+        self.assertTrue(plan.startswith("SCAN"))
+        self.assertIn(f"  {plan}", log)
+        self.assertIn(f"SQL SLOW -- {stmt}", snapshot())
+
+    def test_2(self) -> None:
+        """
+        Plans are only captured for the debug log, shortcuts are timed too
+        """
+
+        conn = sql.connect(":memory:")
+        stmt = "SELECT 2 WHERE :a"
+        script = "CREATE TABLE s (b INTEGER);"
+
+        with patch.object(sql, "_SLOW", 0), patch.object(sql, "DEBUG", False):
+            conn.execute(stmt, {"a": 1})
+            conn.executescript(script)
+
+        self.assertNotIn(stmt, sql._PLANS)
+        self.assertIn(f"SQL SLOW -- {stmt}", snapshot())
+        self.assertIn(f"SQL SLOW -- {script}", snapshot())
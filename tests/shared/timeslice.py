@@ -0,0 +1,56 @@
+from asyncio import run
+from typing import Callable, MutableSequence, Sequence, Tuple
+from unittest import TestCase
+
+from ...coq.shared.timeslice import TimeSlicer
+
+_COST = 10 / (10**6)
+
+
+def _fill(
+    budget: float,
+    items: int,
+    busy: Callable[[Sequence[float]], bool] = lambda _: False,
+) -> Tuple[Sequence[int], Sequence[float]]:
+    """
+    -> items consumed, time spent per slice
+    """
+
+    now = 0.0
+    slicer = TimeSlicer(budget, clock=lambda: now)
+    consumed: MutableSequence[int] = []
+    spent: MutableSequence[float] = []
+
+    async def cont() -> None:
+        nonlocal now
+        async for chunk in slicer.slices(range(items), busy=lambda: busy(spent)):
+            consumed.extend(chunk)
+            spent.append(len(chunk) * _COST)
+            now += len(chunk) * _COST
+
+    run(cont())
+    return consumed, spent
+
+
+class Slices(TestCase):
+    def test_1(self) -> None:
+        consumed, spent = _fill(1 / (10**3), items=9999)
+        self.assertEqual(consumed, list(range(9999)))
+        for elapsed in spent[1:-1]:
+            self.assertAlmostEqual(elapsed, 1 / (10**3), delta=2 * _COST)
+
+    def test_2(self) -> None:
+        """
+        Bigger budgets yield less often, at the cost of longer slices
+        """
+
+        fills = [_fill(budget / (10**3), items=99999) for budget in (1, 3, 9)]
+        yields = [len(spent) for _, spent in fills]
+        latency = [max(spent) for _, spent in fills]
+        self.assertEqual(yields, sorted(yields, reverse=True))
+        self.assertEqual(latency, sorted(latency))
+        self.assertLess(yields[-1] * 5, yields[0])
+
+    def test_3(self) -> None:
+        _, spent = _fill(1, items=9999, busy=bool)
+        self.assertEqual(len(spent), 1)
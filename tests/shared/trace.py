@@ -0,0 +1,34 @@
+from json import dumps
+from threading import Thread
+from unittest import TestCase
+
+from ...coq.shared import trace
+
+
+class Spans(TestCase):
+    def test_1(self) -> None:
+        trace.span("NOT RECORDING", begin=0, duration=1)
+        trace.start()
+        threads = [
+            Thread(
+                target=trace.span,
+                args=(f"SPAN {i}",),
+                kwargs={"begin": i, "duration": 0.5},
+            )
+            for i in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        marks = ({"name": "LUA", "ts": 1.0, "dur": 2.0},)
+        events = trace.stop(1, marks=marks)["traceEvents"]
+        dumps(events)
+
+        self.assertFalse(trace.recording())
+        spans = {event["name"]: event for event in events if event["ph"] == "X"}
+        self.assertEqual(spans.keys(), {"SPAN 0", "SPAN 1", "SPAN 2", "LUA"})
+        self.assertEqual(spans["SPAN 2"]["ts"], 2e6)
+        self.assertEqual(spans["SPAN 2"]["dur"], 0.5e6)
+        self.assertEqual(spans["LUA"]["pid"], 1)
@@ -0,0 +1,20 @@
+from unittest import TestCase
+from uuid import UUID
+
+from ...coq.shared.uids import new_uid
+
+
+class NewUid(TestCase):
+    def test_1(self) -> None:
+        uids = tuple(new_uid() for _ in range(1000))
+        self.assertEqual(len({*uids}), len(uids))
+
+    def test_2(self) -> None:
+        lhs, rhs = new_uid(), new_uid()
+        self.assertLess(lhs.int, rhs.int)
+        self.assertEqual(lhs.int >> 64, rhs.int >> 64)
+
+    def test_3(self) -> None:
+        uid = new_uid()
+        self.assertEqual(UUID(str(uid)), uid)
+        self.assertEqual(UUID(bytes=uid.bytes), uid)